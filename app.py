@@ -8,8 +8,9 @@ import logging
 from pathlib import Path
 from modules import ExcelParser, LOIGenerator, BailGenerator, BailWordGenerator
 from modules.placeholder_extractor import extract_all_placeholders, categorize_placeholders
+from modules.bail_rules import get_regles_bail
+from modules.template_cache import get_template_cache
 import traceback
-import hashlib
 
 # Configuration du logging
 logging.basicConfig(
@@ -22,26 +23,21 @@ logger = logging.getLogger(__name__)
 @st.cache_data(show_spinner=False)
 def parse_excel_cached(file_content: bytes, file_name: str, config_path: str):
     """Parse le fichier Excel et cache le résultat pour éviter les rechargements."""
-    # Créer un hash du contenu pour identifier le fichier de manière unique
-    file_hash = hashlib.md5(file_content).hexdigest()
+    # Parser directement le contenu uploadé (aucun fichier temporaire sur le disque)
+    parser = ExcelParser(file_content, config_path)
+    # Enrichissement INPI en arrière-plan pendant le travail local
+    variables = parser.extract_variables(wait_for_inpi=False)
+    societes_info = parser.extract_societe_info()
+    output_filename_loi = parser.get_output_filename(variables)
 
-    # Sauvegarder temporairement
-    temp_path = Path(f"temp_{file_hash}.xlsx")
-    with open(temp_path, "wb") as f:
-        f.write(file_content)
+    # Templates et règles BAIL chargés pendant l'attente du réseau (en cache ensuite)
+    get_template_cache().get(template_loi_path)
+    get_template_cache().get(template_bail_path)
+    get_regles_bail(str(config_bail_path))
 
-    try:
-        # Parser le fichier
-        parser = ExcelParser(str(temp_path), config_path)
-        variables = parser.extract_variables()
-        societes_info = parser.extract_societe_info()
-        output_filename_loi = parser.get_output_filename(variables)
-
-        return variables, societes_info, output_filename_loi
-    finally:
-        # Nettoyer le fichier temporaire
-        if temp_path.exists():
-            temp_path.unlink()
+    parser.join_inpi_enrichment(variables)
+
+    return variables, societes_info, output_filename_loi
 
 # Configuration de la page
 st.set_page_config(
@@ -0,0 +1,159 @@
+"""
+Benchmark de la génération BAIL sur une feuille "Rédaction BAIL" synthétique.
+
+Construit un classeur de règles de plus de 5000 lignes (les règles réelles
+précédées de sections factices) puis compare, à opération identique :
+- la recherche des lignes de chaque article: parcours linéaire de regles_df
+  (iterrows, ancienne recherche) contre l'index pré-compilé
+- la génération complète du BAIL avec l'une puis l'autre recherche
+"""
+
+import logging
+import tempfile
+import time
+from pathlib import Path
+
+import openpyxl
+import pandas as pd
+
+from modules.bail_generator import BailGenerator
+from modules.bail_rules import RegleBail
+
+logging.disable(logging.WARNING)
+
+NB_SECTIONS_FACTICES = 1300  # 4 lignes par section -> 5200 lignes
+NB_ITERATIONS = 5
+
+donnees_test = {
+    "Nom Preneur": "Jean DUPONT",
+    "Type Preneur": "SAS",
+    "Société Bailleur": "SCI FORGEOT PROPERTY",
+    "Ville ou arrondissement": "PARIS (75017)",
+    "Numéro et rue": "267 boulevard Pereire",
+    "Durée Bail": 9,
+    "Durée ferme Bail": 3,
+    "Date prise d'effet": "01/01/2025",
+    "Condition suspensive 1": "Financement",
+    "Condition suspensive 2": "Extraction",
+    "Montant du loyer": 120000,
+    "Loyer année 1": 100000,
+    "Actualisation": "Oui",
+    "Paiement": "Virement",
+    "Durée DG": 3,
+}
+
+
+def creer_classeur_synthetique(source: str, destination: Path) -> int:
+    """Copie les règles réelles en les faisant précéder de sections factices."""
+    wb_source = openpyxl.load_workbook(source, data_only=True)
+    ws_source = wb_source["Rédaction BAIL"]
+    lignes_reelles = list(ws_source.iter_rows(values_only=True))
+
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "Rédaction BAIL"
+    ws.append(lignes_reelles[0])
+
+    for i in range(NB_SECTIONS_FACTICES):
+        ws.append([f"Article factice {i}", f"Section {i}", None, None, None,
+                   f"Si [Variable {i}] = {i}", f"Texte {i} [Nom Preneur]"])
+        for j in range(3):
+            ws.append([None, None, None, None, None,
+                       f"Si [Variable {i}.{j}] non vide", f"Suite {i}.{j}"])
+
+    for ligne in lignes_reelles[1:]:
+        ws.append(ligne)
+
+    ws_donnees = wb.create_sheet("Liste données BAIL")
+    for ligne in wb_source["Liste données BAIL"].iter_rows(values_only=True):
+        ws_donnees.append(ligne)
+
+    wb.save(destination)
+    return ws.max_row - 1
+
+
+def lignes_par_parcours(regles_df: pd.DataFrame, article_name: str, designation):
+    """Ancienne recherche: parcours complet de regles_df pour un article."""
+    lignes = []
+    found_start = False
+    for _, row in regles_df.iterrows():
+        article_val = row['Article']
+        if pd.notna(article_val):
+            if found_start and article_val != article_name:
+                break
+            if article_val == article_name:
+                if designation is None or row['Désignation'] == designation:
+                    found_start = True
+                    lignes.append(row)
+                elif found_start:
+                    break
+            else:
+                found_start = False
+        elif found_start:
+            lignes.append(row)
+    return lignes
+
+
+class IndexParParcours:
+    """Remplace l'index de BailGenerator par l'ancienne recherche linéaire (même interface get)."""
+
+    def __init__(self, regles_df: pd.DataFrame):
+        self.regles_df = regles_df
+
+    def get(self, cle, defaut=()):
+        lignes = lignes_par_parcours(self.regles_df, *cle)
+        return tuple(RegleBail.depuis_ligne(row.to_dict()) for row in lignes) or defaut
+
+
+def chronometre(fonction, *args) -> float:
+    """Durée moyenne d'un appel en millisecondes."""
+    debut = time.perf_counter()
+    for _ in range(NB_ITERATIONS):
+        fonction(*args)
+    return (time.perf_counter() - debut) / NB_ITERATIONS * 1000
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        chemin = Path(tmp) / "Redaction BAIL synthetique.xlsx"
+        nb_lignes = creer_classeur_synthetique("Redaction BAIL.xlsx", chemin)
+
+        print(f"Feuille synthétique: {nb_lignes} lignes de règles\n")
+        print("=" * 60)
+
+        debut = time.perf_counter()
+        generator = BailGenerator(str(chemin))
+        print(f"Chargement + compilation de l'index: {time.perf_counter() - debut:.3f} s")
+
+        articles_bail = [
+            cle for cle in generator.index_regles
+            if cle[1] is None and not str(cle[0]).startswith("Article factice")
+        ]
+        index = generator.index_regles
+        parcours = IndexParParcours(generator.regles_df)
+
+        def recherches(source):
+            for cle in articles_bail:
+                source.get(cle, ())
+
+        duree_parcours = chronometre(recherches, parcours)
+        duree_index = chronometre(recherches, index)
+        recherche = f"Recherche de {len(articles_bail)} articles"
+        print(f"{recherche + ', parcours (iterrows):':<45}{duree_parcours:10.3f} ms")
+        print(f"{recherche + ', index:':<45}{duree_index:10.3f} ms")
+
+        generator.index_regles = parcours
+        articles_parcours = generator.generer_bail(donnees_test)
+        duree_parcours = chronometre(generator.generer_bail, donnees_test)
+        generator.index_regles = index
+        articles_index = generator.generer_bail(donnees_test)
+        duree_index = chronometre(generator.generer_bail, donnees_test)
+        print(f"{'Génération complète, parcours (iterrows):':<45}{duree_parcours:10.3f} ms")
+        print(f"{'Génération complète, index:':<45}{duree_index:10.3f} ms")
+        print(f"{len(articles_index)} articles générés, identiques: "
+              f"{'oui' if articles_index == articles_parcours else 'NON'}")
+        print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Micro-benchmark de la lecture des cellules référencées d'une fiche de décision.
+
+Génère une fiche volumineuse (plusieurs onglets, milliers de lignes, chaînes
+partagées nombreuses) et compare, pour les mêmes cellules référencées :
+- openpyxl read-only (balayage iter_rows des onglets référencés, ancienne lecture)
+- la lecture directe des parties XML (XlsxReader.read_cells, lecture actuelle)
+"""
+
+import datetime
+import io
+import logging
+import time
+
+import openpyxl
+
+from modules.cell_references import _fetch_sheets
+
+logging.disable(logging.WARNING)
+
+NB_ONGLETS = 6
+NB_LIGNES = 4000
+NB_COLONNES = 30
+NB_ITERATIONS = 5
+
+# Cellules référencées: un bloc en tête de deux onglets, comme la configuration LOI
+CELLULES = {
+    "Onglet 1": {(row, col) for row in range(2, 60) for col in (2, 3, 5)},
+    "Onglet 3": {(row, 2) for row in range(20, 45)} | {(120, 4)},
+}
+
+
+def generer_fiche() -> bytes:
+    """Fiche de test: NB_ONGLETS onglets de NB_LIGNES x NB_COLONNES cellules."""
+    workbook = openpyxl.Workbook()
+    workbook.remove(workbook.active)
+    for index in range(1, NB_ONGLETS + 1):
+        sheet = workbook.create_sheet(f"Onglet {index}")
+        for row in range(1, NB_LIGNES + 1):
+            sheet.append([
+                f"Libellé {index}-{row}-{col}" if col % 3 == 0
+                else datetime.datetime(2024, 1, 1) + datetime.timedelta(days=row) if col == 5
+                else row * col * 1.5
+                for col in range(1, NB_COLONNES + 1)
+            ])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+def lecture_openpyxl(content: bytes, cells_by_sheet) -> dict:
+    """Ancienne lecture: openpyxl read-only, iter_rows borné aux cellules référencées."""
+    workbook = openpyxl.load_workbook(io.BytesIO(content), read_only=True, data_only=True)
+    try:
+        values = {}
+        for sheet_name, cells in cells_by_sheet.items():
+            rows = {}
+            for row, col in cells:
+                rows.setdefault(row, []).append(col)
+            min_row, max_row = min(rows), max(rows)
+            min_col = min(col for _, col in cells)
+            max_col = max(col for _, col in cells)
+
+            sheet_values = {cell: None for cell in cells}
+            for row, row_values in enumerate(
+                workbook[sheet_name].iter_rows(min_row=min_row, max_row=max_row,
+                                               min_col=min_col, max_col=max_col, values_only=True),
+                start=min_row
+            ):
+                for col in rows.get(row, ()):
+                    if col - min_col < len(row_values):
+                        sheet_values[(row, col)] = row_values[col - min_col]
+            values[sheet_name] = sheet_values
+        return values
+    finally:
+        workbook.close()
+
+
+def lecture_directe(content: bytes, cells_by_sheet) -> dict:
+    """Lecture actuelle: parties XML des seuls onglets référencés."""
+    return _fetch_sheets(content, cells_by_sheet)[1]
+
+
+def chronometre(fonction, *args) -> float:
+    """Durée moyenne d'un appel en millisecondes."""
+    debut = time.perf_counter()
+    for _ in range(NB_ITERATIONS):
+        fonction(*args)
+    return (time.perf_counter() - debut) / NB_ITERATIONS * 1000
+
+
+def main():
+    content = generer_fiche()
+    nb_cellules = sum(len(cells) for cells in CELLULES.values())
+    print(f"Fiche: {NB_ONGLETS} onglets de {NB_LIGNES} x {NB_COLONNES} cellules "
+          f"({len(content) // 1024} Ko), {nb_cellules} cellules référencées, {NB_ITERATIONS} itérations\n")
+    print("=" * 60)
+
+    ancienne = chronometre(lecture_openpyxl, content, CELLULES)
+    actuelle = chronometre(lecture_directe, content, CELLULES)
+    print(f"{'openpyxl read-only (ancienne):':<40}{ancienne:8.1f} ms")
+    print(f"{'Lecture XML directe (actuelle):':<40}{actuelle:8.1f} ms")
+    print("=" * 60)
+
+    identiques = lecture_openpyxl(content, CELLULES) == lecture_directe(content, CELLULES)
+    print(f"Valeurs identiques: {'oui' if identiques else 'NON'}")
+
+
+if __name__ == "__main__":
+    main()
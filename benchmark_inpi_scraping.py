@@ -0,0 +1,70 @@
+"""
+Micro-benchmark de l'extraction des champs d'une fiche data.inpi.fr (inpi_page.html).
+
+Compare :
+- l'ancienne extraction (html.parser, un find_all(string=...) sur tout l'arbre par libellé)
+- l'extraction actuelle (lxml, un seul parcours indexant titre, libellés et représentants)
+"""
+
+import logging
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from modules.inpi_client import INPIClient
+
+logging.disable(logging.WARNING)
+
+PAGE = Path(__file__).parent / "inpi_page.html"
+LIBELLES = ("Forme juridique", "Capital social", "Adresse du siège")
+NB_ITERATIONS = 20
+
+
+def extraction_par_libelle(content: bytes) -> dict:
+    """Ancienne extraction: parcours complet de l'arbre pour chaque libellé."""
+    soup = BeautifulSoup(content, 'html.parser')
+    valeurs = {}
+    h1 = soup.find('h1')
+    if h1:
+        valeurs["h1"] = h1.get_text().strip()
+    for libelle in LIBELLES:
+        elements = soup.find_all(string=lambda s: s and libelle in s)
+        if elements:
+            sibling = elements[0].parent.find_next_sibling()
+            if sibling:
+                valeurs[libelle] = sibling.get_text(strip=True)
+    soup.find('h3', id='representants')
+    return valeurs
+
+
+def chronometre(fonction, *args) -> float:
+    """Durée moyenne d'un appel en millisecondes."""
+    debut = time.perf_counter()
+    for _ in range(NB_ITERATIONS):
+        fonction(*args)
+    return (time.perf_counter() - debut) / NB_ITERATIONS * 1000
+
+
+def main():
+    content = PAGE.read_bytes()
+    print(f"Page: {PAGE.name} ({len(content) // 1024} Ko), {NB_ITERATIONS} itérations\n")
+    print("=" * 60)
+
+    parse_html_parser = chronometre(BeautifulSoup, content, 'html.parser')
+    parse_lxml = chronometre(BeautifulSoup, content, 'lxml')
+    print(f"{'Parsing html.parser:':<40}{parse_html_parser:7.1f} ms")
+    print(f"{'Parsing lxml:':<40}{parse_lxml:7.1f} ms")
+
+    ancienne = chronometre(extraction_par_libelle, content)
+    actuelle = chronometre(INPIClient._parse_inpi_page, content)
+    print(f"{'Extraction par libellé (ancienne):':<40}{ancienne:7.1f} ms")
+    print(f"{'Extraction en un parcours (actuelle):':<40}{actuelle:7.1f} ms")
+    print("=" * 60)
+
+    for champ, valeur in INPIClient._parse_inpi_page(content).items():
+        print(f"  {champ}: {' '.join(valeur.split())}")
+
+
+if __name__ == "__main__":
+    main()
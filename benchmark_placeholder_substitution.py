@@ -0,0 +1,112 @@
+"""
+Micro-benchmark du remplacement des placeholders [Variable] d'un paragraphe BAIL.
+
+Paragraphe synthétique de 50 placeholders répartis sur plusieurs runs (dont
+certains fragmentés sur deux runs), comparant :
+- l'ancien découpage par run (recherche de chaque placeholder avec find)
+- le découpage en une passe par l'alternance compilée des placeholders
+- le remplacement complet via BailWordGenerator._replace_variable_placeholders
+"""
+
+import copy
+import logging
+import re
+import time
+
+from docx import Document
+
+from modules.bail_word_generator import BailWordGenerator, _compile_placeholder_alternation
+
+logging.disable(logging.WARNING)
+
+NB_PLACEHOLDERS = 50
+PLACEHOLDERS_PAR_RUN = 5
+NB_ITERATIONS = 200
+
+
+def creer_paragraphe():
+    """Paragraphe de NB_PLACEHOLDERS placeholders, un sur dix fragmenté entre deux runs."""
+    doc = Document()
+    paragraph = doc.add_paragraph()
+    texte = ""
+    for i in range(NB_PLACEHOLDERS):
+        if i % 10 == 9:
+            # Placeholder fragmenté: "[Variable " en fin de run, "i] ..." au début du suivant
+            paragraph.add_run(texte + "[Variable ")
+            texte = f"{i}] clause de texte ordinaire, "
+        else:
+            texte += f"clause [Variable {i}] de texte ordinaire, "
+        if i % PLACEHOLDERS_PAR_RUN == PLACEHOLDERS_PAR_RUN - 1:
+            run = paragraph.add_run(texte)
+            run.font.bold = i % 2 == 0
+            texte = ""
+    paragraph.add_run(texte + "fin.")
+    return paragraph
+
+
+def segments_par_find(run_text: str, mapping: dict) -> list:
+    """Ancien découpage: à chaque étape, find de tous les placeholders sur le reste du run."""
+    segments = []
+    remaining = run_text
+    while remaining:
+        first_pos = len(remaining)
+        first_placeholder = None
+        for ph_key in mapping:
+            pos = remaining.find(ph_key)
+            if pos != -1 and pos < first_pos:
+                first_pos = pos
+                first_placeholder = ph_key
+        if first_placeholder:
+            if first_pos > 0:
+                segments.append((remaining[:first_pos], None))
+            segments.append(mapping[first_placeholder])
+            remaining = remaining[first_pos + len(first_placeholder):]
+        else:
+            segments.append((remaining, None))
+            break
+    return segments
+
+
+def main():
+    paragraph = creer_paragraphe()
+    donnees = {f"Variable {i}": f"valeur {i}" for i in range(0, NB_PLACEHOLDERS, 2)}
+    mapping = {
+        f"[{p}]": (donnees.get(p) or f"[{p}]", p not in donnees)
+        for p in re.findall(r'\[([^\]]+)\]', paragraph.text)
+    }
+    run_texts = [run.text for run in paragraph.runs]
+
+    print(f"Paragraphe: {len(paragraph.text)} caractères, {len(run_texts)} runs, "
+          f"{len(mapping)} placeholders\n")
+    print("=" * 60)
+
+    debut = time.perf_counter()
+    for _ in range(NB_ITERATIONS):
+        segments_find = [segments_par_find(text, mapping) for text in run_texts]
+    duree_find = (time.perf_counter() - debut) / NB_ITERATIONS
+    remplaces_find = sum(1 for segments in segments_find for _, is_red in segments if is_red is not None)
+
+    debut = time.perf_counter()
+    for _ in range(NB_ITERATIONS):
+        pattern = _compile_placeholder_alternation(tuple(mapping))
+        matches = list(pattern.finditer("".join(run_texts)))
+    duree_alternance = (time.perf_counter() - debut) / NB_ITERATIONS
+
+    print(f"Découpage par find (par run):      {duree_find * 1000:.3f} ms "
+          f"({remplaces_find} placeholders trouvés)")
+    print(f"Découpage par alternance compilée: {duree_alternance * 1000:.3f} ms "
+          f"({len(matches)} placeholders trouvés)")
+
+    generator = BailWordGenerator.__new__(BailWordGenerator)
+    copies = [copy.deepcopy(paragraph._p) for _ in range(NB_ITERATIONS)]
+    debut = time.perf_counter()
+    for p in copies:
+        paragraph._p.addnext(p)
+        generator._replace_variable_placeholders(type(paragraph)(p, paragraph._parent), donnees)
+    duree_complete = (time.perf_counter() - debut) / NB_ITERATIONS
+    print(f"Remplacement complet du paragraphe: {duree_complete * 1000:.3f} ms")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,7 +9,7 @@ siren = "532321916"
 print(f"Exploration pour KARAVEL (SIREN: {siren})\n")
 
 # Récupérer les données brutes
-company_data = client._search_by_siren(siren)
+company_data = client._fetch_company(siren)
 
 if company_data:
     # Sauvegarder
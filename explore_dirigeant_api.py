@@ -9,7 +9,7 @@ siren = "481283901"  # Fleux
 print(f"Exploration pour SIREN: {siren}\n")
 
 # Récupérer les données brutes
-company_data = client._search_by_siren(siren)
+company_data = client._fetch_company(siren)
 
 if company_data:
     # Sauvegarder
@@ -0,0 +1,40 @@
+"""
+Importe un export d'entreprises (SIRENE / RNE, CSV ou Parquet) dans le registre local.
+
+Usage:
+    python import_registre.py Exemples/registre_entreprises_exemple.csv [--db chemin.sqlite]
+
+Une fois importé, le registre est consulté avant le cache et l'API INPI
+(génération en lot sans appel réseau pour les SIREN qu'il contient).
+"""
+
+import argparse
+import logging
+import sys
+from typing import List, Optional
+
+from modules.config import Config
+from modules.offline_registry import import_registry
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Importe un export d'entreprises (CSV ou Parquet) dans le registre local."
+    )
+    parser.add_argument("source", help="Export à importer (.csv ou .parquet)")
+    parser.add_argument("--db", default=Config.INPI_REGISTRY_PATH,
+                        help=f"Base SQLite du registre (défaut: {Config.INPI_REGISTRY_PATH})")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    count = import_registry(args.source, args.db)
+    print(f"{count} entreprises importées dans {args.db}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
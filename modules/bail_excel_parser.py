@@ -4,25 +4,29 @@ Module pour parser les fichiers Excel BAIL.
 Format attendu: onglet "Liste données BAIL" avec mapping des variables
 """
 
+import io
 import pandas as pd
 import logging
 from typing import Dict, Any
 
+from .cell_references import WorkbookSource, source_name, workbook_source
+
 logger = logging.getLogger(__name__)
 
 
 class BailExcelParser:
     """Parser pour extraire les données BAIL depuis Excel."""
 
-    def __init__(self, excel_path: str, config_path: str = "Redaction BAIL.xlsx"):
+    def __init__(self, excel_path: WorkbookSource, config_path: str = "Redaction BAIL.xlsx"):
         """
         Initialise le parser BAIL.
 
         Args:
-            excel_path: Chemin vers le fichier Excel avec les données
+            excel_path: Fichier Excel avec les données: chemin, contenu binaire ou fichier ouvert (upload)
             config_path: Chemin vers le fichier de configuration BAIL
         """
-        self.excel_path = excel_path
+        self.excel_name = source_name(excel_path)
+        self.excel_path = workbook_source(excel_path)
         self.config_path = config_path
 
     def extract_variables(self) -> Dict[str, Any]:
@@ -44,7 +48,8 @@ class BailExcelParser:
 
             # Charger le fichier Excel source
             # On va essayer différents onglets
-            xl_file = pd.ExcelFile(self.excel_path)
+            source = io.BytesIO(self.excel_path) if isinstance(self.excel_path, bytes) else self.excel_path
+            xl_file = pd.ExcelFile(source)
 
             # Priorité: "Validation", "Last Forecast", premier onglet
             sheet_name = None
@@ -55,33 +60,27 @@ class BailExcelParser:
             if not sheet_name:
                 sheet_name = xl_file.sheet_names[0]
 
-            logger.info(f"Lecture de l'onglet '{sheet_name}' depuis {self.excel_path}")
-            data_df = pd.read_excel(self.excel_path, sheet_name=sheet_name)
+            logger.info(f"Lecture de l'onglet '{sheet_name}' depuis {self.excel_name}")
+            data_df = xl_file.parse(sheet_name)
+
+            # Index de la première colonne (une seule passe): libellé -> valeur de la 2e colonne
+            # (première occurrence d'un libellé, comme l'ancien parcours ligne à ligne)
+            valeurs_par_libelle = {}
+            if data_df.shape[1] > 1:
+                libelles = data_df.iloc[:, 0].astype(str).str.strip()
+                premiers = ~libelles.duplicated()
+                valeurs_par_libelle = dict(zip(libelles[premiers], data_df.iloc[:, 1][premiers]))
 
-            # Extraire les variables selon le mapping
+            # Extraire les variables selon le mapping (lignes dont la source est l'onglet lu)
             variables = {}
 
-            for _, row in config_df.iterrows():
-                var_name = row.get("Variable")
-                source_sheet = row.get("Source")
-                cell_or_desc = row.get("Cellule / Description")
-
-                if pd.isna(var_name):
-                    continue
-
-                # Si la source correspond à l'onglet qu'on lit
-                if pd.notna(source_sheet) and source_sheet == sheet_name:
-                    # Essayer de trouver la variable
-                    # Méthode 1: Chercher var_name dans la première colonne
-                    for idx, data_row in data_df.iterrows():
-                        if str(data_row.iloc[0]).strip() == str(var_name).strip():
-                            # Prendre la valeur dans la 2e colonne
-                            if len(data_row) > 1:
-                                value = data_row.iloc[1]
-                                if pd.notna(value):
-                                    variables[var_name] = value
-                                    logger.debug(f"Variable trouvée: {var_name} = {value}")
-                            break
+            if "Variable" in config_df.columns and "Source" in config_df.columns:
+                lignes = config_df[config_df["Variable"].notna() & (config_df["Source"] == sheet_name)]
+                for var_name in lignes["Variable"]:
+                    value = valeurs_par_libelle.get(str(var_name).strip())
+                    if pd.notna(value):
+                        variables[var_name] = value
+                        logger.debug(f"Variable trouvée: {var_name} = {value}")
 
             logger.info(f"Variables BAIL extraites: {len(variables)}")
             return variables
@@ -90,7 +89,8 @@ class BailExcelParser:
             logger.error(f"Erreur lors de l'extraction des variables BAIL: {e}")
             raise
 
-    def get_output_filename(self, variables: Dict[str, Any]) -> str:
+    @staticmethod
+    def get_output_filename(variables: Dict[str, Any]) -> str:
         """
         Génère le nom du fichier de sortie.
 
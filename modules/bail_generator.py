@@ -13,6 +13,14 @@ import re
 from datetime import datetime, timedelta
 from typing import Dict, Optional, List, Any
 import logging
+from .cell_references import CellValues, ReferencePlan, WorkbookSource, parse_reference, workbook_source
+from .bail_rules import (
+    NOMS_VARIABLES_ALIAS,
+    ReglesBail,
+    RegleBail,
+    compiler_condition,
+    get_regles_bail,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -20,62 +28,62 @@ logger = logging.getLogger(__name__)
 class BailGenerator:
     """Générateur de documents BAIL avec logique conditionnelle."""
 
-    def __init__(self, excel_path: str = "Redaction BAIL.xlsx", source_file: Optional[str] = None):
+    def __init__(
+        self,
+        excel_path: str = "Redaction BAIL.xlsx",
+        source_file: Optional[WorkbookSource] = None,
+        regles: Optional[ReglesBail] = None
+    ):
         """
         Initialise le générateur avec les règles depuis Excel.
 
         Args:
             excel_path: Chemin vers le fichier Excel contenant les règles
-            source_file: Chemin vers le fichier source (Fiche de décision) pour résoudre les formules
+            source_file: Fiche de décision (chemin, contenu binaire ou fichier ouvert) pour résoudre les formules
+            regles: Règles déjà compilées (par défaut: registre partagé du processus)
         """
         self.excel_path = excel_path
-        self.source_file = source_file
-        self.source_workbook = None
-        self.regles_df = None
-        self.donnees_df = None
+        self.source_file = workbook_source(source_file) if source_file else None
+        self.source_values: Optional[CellValues] = None
+        self.regles = regles
+        self.index_regles = {}
+        self._regles_df = None
+        self._donnees_df = None
         self._load_rules()
 
-        # Charger le fichier source si fourni
-        if source_file:
-            import openpyxl
-            self.source_workbook = openpyxl.load_workbook(source_file, data_only=True)
+        # Lire en une passe les cellules du fichier source référencées par les règles
+        if self.source_file:
+            plan = ReferencePlan(
+                regle.donnee_source for regle in self.regles.lignes
+                if isinstance(regle.donnee_source, str) and regle.donnee_source.startswith('=')
+            )
+            self.source_values = plan.fetch(self.source_file)
 
     def _load_rules(self):
-        """Charge les règles depuis le fichier Excel."""
+        """Récupère les règles compilées depuis le registre partagé (chargement unique par version du fichier)."""
         try:
-            import openpyxl
-
-            # Charger avec openpyxl pour lire TOUTES les lignes (même celles avec Article vide)
-            wb = openpyxl.load_workbook(self.excel_path, data_only=True)
-            ws_bail = wb["Rédaction BAIL"]
-
-            # Lire toutes les lignes dans une liste de dict
-            regles_list = []
-            headers = [cell.value for cell in ws_bail[1]]  # Row 1 = headers
-
-            for row_idx in range(2, ws_bail.max_row + 1):
-                row_data = {}
-                for col_idx, header in enumerate(headers, start=1):
-                    if header:  # Skip empty headers
-                        cell_value = ws_bail.cell(row_idx, col_idx).value
-                        row_data[header] = cell_value
-
-                # Ajouter la ligne même si Article est None
-                regles_list.append(row_data)
-
-            self.regles_df = pd.DataFrame(regles_list)
-
-            # Charger l'onglet Liste données BAIL
-            self.donnees_df = pd.read_excel(
-                self.excel_path,
-                sheet_name="Liste données BAIL"
-            )
-
-            logger.info(f"Règles BAIL chargées: {len(self.regles_df)} lignes")
+            if self.regles is None:
+                self.regles = get_regles_bail(self.excel_path)
+            self.index_regles = self.regles.index
+            logger.debug(f"Règles BAIL: {len(self.regles.lignes)} lignes (sha256 {self.regles.sha256[:12]})")
         except Exception as e:
             logger.error(f"Erreur lors du chargement des règles BAIL: {e}")
             raise
 
+    @property
+    def regles_df(self) -> pd.DataFrame:
+        """Onglet "Rédaction BAIL" en DataFrame (construit à la demande)."""
+        if self._regles_df is None:
+            self._regles_df = self.regles.regles_dataframe()
+        return self._regles_df
+
+    @property
+    def donnees_df(self) -> pd.DataFrame:
+        """Onglet "Liste données BAIL" en DataFrame (construit à la demande)."""
+        if self._donnees_df is None:
+            self._donnees_df = self.regles.donnees_dataframe()
+        return self._donnees_df
+
     def _resolve_formula(self, formula: str) -> Any:
         """
         Résout une formule Excel en lisant la valeur depuis le fichier source.
@@ -86,52 +94,31 @@ class BailGenerator:
         Returns:
             Valeur lue depuis le fichier source, ou liste de valeurs pour les plages
         """
-        if not self.source_workbook or not formula:
+        if not self.source_values or not formula:
             return None
 
-        # Retirer le signe =
-        formula = str(formula).strip()
-        if formula.startswith("="):
-            formula = formula[1:]
-
-        # Parser la formule: 'Sheet Name'!CellRef ou Sheet!CellRange
-        if "!" not in formula:
+        # Parser la formule: 'Sheet Name'!CellRef ou Sheet!CellRange (parse mis en cache)
+        reference = parse_reference(str(formula))
+        if reference is None:
             return None
 
         try:
-            parts = formula.split("!")
-            sheet_name = parts[0].strip("'")
-            cell_ref = parts[1].strip()
-
-            if sheet_name not in self.source_workbook.sheetnames:
-                logger.warning(f"Onglet '{sheet_name}' introuvable dans le fichier source")
+            if not self.source_values.has_sheet(reference.sheet):
+                logger.warning(f"Onglet '{reference.sheet}' introuvable dans le fichier source")
                 return None
 
-            sheet = self.source_workbook[sheet_name]
-
-            # Gérer les plages de cellules (ex: E38:E41)
-            if ":" in cell_ref:
-                start_cell, end_cell = cell_ref.split(":")
-
-                # Extraire les coordonnées
-                from openpyxl.utils import column_index_from_string
-
-                start_col = ''.join([c for c in start_cell if c.isalpha()])
-                start_row = int(''.join([c for c in start_cell if c.isdigit()]))
-                end_col = ''.join([c for c in end_cell if c.isalpha()])
-                end_row = int(''.join([c for c in end_cell if c.isdigit()]))
-
-                # Lire toutes les valeurs de la plage
+            # Gérer les plages de cellules (ex: E38:E41): première colonne de la plage
+            if reference.is_range:
                 values = []
-                for row in range(start_row, end_row + 1):
-                    value = sheet[f"{start_col}{row}"].value
+                for row in range(reference.min_row, reference.max_row + 1):
+                    value = self.source_values.get(reference.sheet, row, reference.min_col)
                     if value:  # Ajouter seulement les valeurs non-vides
                         values.append(str(value).strip())
 
                 return values if values else None
             else:
                 # Cellule unique
-                value = sheet[cell_ref].value
+                value = self.source_values.resolve(reference)
                 if value is None:
                     return None
                 elif isinstance(value, datetime):
@@ -155,23 +142,7 @@ class BailGenerator:
         Returns:
             Nom normalisé
         """
-        # Mapping des variations de noms
-        mappings = {
-            "Durée du Bail": "Durée Bail",
-            "Durée du DG": "Durée DG",
-            "Montant Palier 1": "Montant du palier 1",
-            "Montant Palier 2": "Montant du palier 2",
-            "Montant Palier 3": "Montant du palier 3",
-            "Montant du Palier 1": "Montant du palier 1",
-            "Montant du Palier 2": "Montant du palier 2",
-            "Montant du Palier 3": "Montant du palier 3",
-            "Date prise d'effet": "Date de prise d'effet",
-            "Date de prise d'effet du bail": "Date de prise d'effet",
-            "Date début bail": "Date de prise d'effet",
-            "Date de Prise d'effet + 9 ans": "Date de prise d'effet + 9 ans",
-        }
-
-        return mappings.get(nom, nom)
+        return NOMS_VARIABLES_ALIAS.get(nom, nom)
 
     def calculer_variables_derivees(self, donnees: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -320,67 +291,7 @@ class BailGenerator:
         if pd.isna(condition_str) or not condition_str:
             return True
 
-        condition = str(condition_str).strip()
-
-        # Cas spécial: "Si plusieurs conditions suspensives"
-        if "plusieurs conditions suspensives" in condition.lower():
-            count = sum(1 for i in range(1, 5)
-                       if donnees.get(f"Condition suspensive {i}"))
-            return count > 1
-
-        # Nettoyer les guillemets typographiques
-        condition = condition.replace('"', '"').replace('"', '"').replace(''', "'").replace(''', "'")
-
-        # Parser les conditions avec pattern "Si [Variable] opérateur valeur"
-        # Pattern: Si [Variable] (=|>|<|>=|<=|!=|supérieur à) valeur
-        match_comparison = re.search(
-            r'Si\s+"?([^"\[\]]+|[\[][^\]]+[\]])"?\s*(=|>|<|>=|<=|!=|supérieur à|supérieure à)\s*["\']?([^"\']+)["\']?',
-            condition,
-            re.IGNORECASE
-        )
-
-        if match_comparison:
-            var_name = match_comparison.group(1).strip().replace('[', '').replace(']', '')
-            var_name = self._normaliser_nom_variable(var_name)
-            operator = match_comparison.group(2).strip().lower()
-            expected_value = match_comparison.group(3).strip()
-
-            actual_value = donnees.get(var_name)
-
-            # Gérer les comparaisons
-            try:
-                if operator == "=":
-                    return str(actual_value).strip() == expected_value
-                elif operator == "!=":
-                    return str(actual_value).strip() != expected_value
-                elif operator in [">", "supérieur à", "supérieure à"]:
-                    return float(actual_value) > float(expected_value)
-                elif operator == ">=":
-                    return float(actual_value) >= float(expected_value)
-                elif operator == "<":
-                    return float(actual_value) < float(expected_value)
-                elif operator == "<=":
-                    return float(actual_value) <= float(expected_value)
-            except (ValueError, TypeError):
-                logger.warning(f"Impossible de comparer {actual_value} avec {expected_value}")
-                return False
-
-        # Pattern: Si [Variable] non vide / non nul
-        match_nonempty = re.search(
-            r'Si\s+\[([^\]]+)\]\s+non\s+(vide|nul)',
-            condition,
-            re.IGNORECASE
-        )
-
-        if match_nonempty:
-            var_name = match_nonempty.group(1).strip()
-            value = donnees.get(var_name)
-            # Considérer comme non vide si value existe et n'est pas None, "", 0, False
-            return bool(value) and value != 0
-
-        # Si on ne peut pas parser, logger un warning
-        logger.warning(f"Condition non reconnue: {condition}")
-        return False
+        return compiler_condition(str(condition_str)).evaluer(donnees)
 
     def obtenir_texte_article(
         self,
@@ -399,38 +310,8 @@ class BailGenerator:
         Returns:
             Texte de l'article ou None si non trouvé
         """
-        # NOUVELLE LOGIQUE: Chercher d'abord la ligne avec Article + Désignation
-        # puis inclure toutes les lignes suivantes jusqu'au prochain Article non-null
-
-        lignes_candidates = []
-        found_start = False
-        current_designation = None
-
-        for idx, row in self.regles_df.iterrows():
-            article_val = row['Article']
-            designation_val = row['Désignation']
-
-            # Nouvelle section d'article
-            if pd.notna(article_val):
-                # Si on était déjà dans notre section, on s'arrête
-                if found_start and article_val != article_name:
-                    break
-
-                # Vérifier si c'est le début de notre article
-                if article_val == article_name:
-                    if designation is None or designation_val == designation:
-                        found_start = True
-                        current_designation = designation_val
-                        lignes_candidates.append(row)
-                    elif found_start:
-                        # Nouvelle désignation du même article, on s'arrête
-                        break
-                else:
-                    found_start = False
-
-            # Ligne de continuation (Article = None)
-            elif found_start:
-                lignes_candidates.append(row)
+        # Section pré-compilée: ligne Article + Désignation suivie de ses lignes de continuation
+        lignes_candidates = self.index_regles.get((article_name, designation), ())
 
         if not lignes_candidates:
             logger.warning(f"Aucune règle trouvée pour l'article '{article_name}'")
@@ -442,8 +323,8 @@ class BailGenerator:
         # Parcourir les lignes candidates et évaluer les conditions
         for ligne in lignes_candidates:
             # Vérifier si la donnée source correspond (pour les lookup tables)
-            donnee_source = ligne.get('Donnée source')
-            nom_source = ligne.get('Nom Source')
+            donnee_source = ligne.donnee_source
+            nom_source = ligne.nom_source
 
             if pd.notna(donnee_source) and pd.notna(nom_source):
                 # Résoudre la formule si nécessaire
@@ -517,13 +398,13 @@ class BailGenerator:
                     continue  # Passer à la ligne suivante
 
             # Évaluer Condition Option 1
-            condition1 = ligne.get('Condition')
+            condition1 = ligne.condition
             if self.evaluer_condition(condition1, donnees):
-                texte = ligne.get('Entrée correspondante - Option 1')
+                texte = ligne.option_1
                 if pd.notna(texte):
                     # CAS SPÉCIAL: Article préliminaire avec conditions suspensives
                     # Détecter via le Nom Source qui contient "Condition" et "suspensive"
-                    nom_source_check = ligne.get('Nom Source')
+                    nom_source_check = ligne.nom_source
                     if article_name == "Article préliminaire" and nom_source_check and "Condition" in str(nom_source_check) and "suspensive" in str(nom_source_check).lower():
                         return self._generer_conditions_suspensives(donnees, ligne)
                     # Ajouter le texte à la liste
@@ -531,13 +412,13 @@ class BailGenerator:
                     continue  # Continuer pour chercher d'autres lignes qui matchent
 
             # Évaluer Condition Option 2
-            condition2 = ligne.get('Condition Option 2')
+            condition2 = ligne.condition_2
             if self.evaluer_condition(condition2, donnees):
-                texte = ligne.get('Entrée correspondante - Option 2')
+                texte = ligne.option_2
                 if pd.notna(texte):
                     # CAS SPÉCIAL: Article préliminaire avec conditions suspensives
                     # Détecter via le Nom Source qui contient "Condition" et "suspensive"
-                    nom_source_check = ligne.get('Nom Source')
+                    nom_source_check = ligne.nom_source
                     if article_name == "Article préliminaire" and nom_source_check and "Condition" in str(nom_source_check) and "suspensive" in str(nom_source_check).lower():
                         return self._generer_conditions_suspensives(donnees, ligne)
                     # Ajouter le texte à la liste
@@ -551,7 +432,7 @@ class BailGenerator:
         logger.warning(f"Aucune condition satisfaite pour l'article '{article_name}'")
         return None
 
-    def _generer_conditions_suspensives(self, donnees: Dict[str, Any], ligne: pd.Series) -> str:
+    def _generer_conditions_suspensives(self, donnees: Dict[str, Any], ligne: RegleBail) -> str:
         """
         Génère le texte pour les conditions suspensives.
         Si 1 seule condition → utilise colonne G (Option 1) directement (sans modification)
@@ -576,7 +457,7 @@ class BailGenerator:
 
         # Si plusieurs conditions → colonne J avec liste
         if len(conditions) > 1:
-            template = ligne.get('Entrée correspondante - Option 2')
+            template = ligne.option_2
             if not pd.notna(template):
                 return ""
 
@@ -614,7 +495,7 @@ class BailGenerator:
 
         # Si 1 seule condition → colonne G (retourner tel quel sans modification)
         elif len(conditions) == 1:
-            texte = ligne.get('Entrée correspondante - Option 1')
+            texte = ligne.option_1
             return str(texte) if pd.notna(texte) else ""
 
         # Aucune condition
@@ -0,0 +1,367 @@
+"""
+Règles de rédaction du BAIL compilées depuis "Redaction BAIL.xlsx".
+
+Ce module charge et compile une seule fois par version du classeur :
+- les lignes de l'onglet "Rédaction BAIL" indexées par (Article, Désignation)
+- les conditions textuelles en prédicats
+- l'onglet "Liste données BAIL"
+
+Les règles sont partagées entre générateurs via un registre thread-safe qui
+recharge le classeur lorsqu'il change sur disque.
+"""
+
+import hashlib
+import io
+import logging
+import os
+import re
+import threading
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+import openpyxl
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Mapping des variations de noms de variables
+NOMS_VARIABLES_ALIAS = {
+    "Durée du Bail": "Durée Bail",
+    "Durée du DG": "Durée DG",
+    "Montant Palier 1": "Montant du palier 1",
+    "Montant Palier 2": "Montant du palier 2",
+    "Montant Palier 3": "Montant du palier 3",
+    "Montant du Palier 1": "Montant du palier 1",
+    "Montant du Palier 2": "Montant du palier 2",
+    "Montant du Palier 3": "Montant du palier 3",
+    "Date prise d'effet": "Date de prise d'effet",
+    "Date de prise d'effet du bail": "Date de prise d'effet",
+    "Date début bail": "Date de prise d'effet",
+    "Date de Prise d'effet + 9 ans": "Date de prise d'effet + 9 ans",
+}
+
+# Pattern: Si [Variable] (=|>|<|>=|<=|!=|supérieur à) valeur
+CONDITION_COMPARAISON_PATTERN = re.compile(
+    r'Si\s+"?([^"\[\]]+|[\[][^\]]+[\]])"?\s*(=|>|<|>=|<=|!=|supérieur à|supérieure à)\s*["\']?([^"\']+)["\']?',
+    re.IGNORECASE
+)
+
+# Pattern: Si [Variable] non vide / non nul
+CONDITION_NON_VIDE_PATTERN = re.compile(r'Si\s+\[([^\]]+)\]\s+non\s+(vide|nul)', re.IGNORECASE)
+
+# Guillemets typographiques → guillemets droits
+GUILLEMETS_TYPOGRAPHIQUES = str.maketrans({"“": '"', "”": '"', "‘": "'", "’": "'"})
+
+
+class RegleBail(NamedTuple):
+    """Ligne de règle de l'onglet "Rédaction BAIL" (cellules vides = None)."""
+
+    article: Optional[str]
+    designation: Optional[str]
+    nom_source: Any
+    source: Any
+    donnee_source: Any
+    condition: Any
+    option_1: Any
+    condition_2: Any
+    option_2: Any
+
+    @classmethod
+    def depuis_ligne(cls, row_data: Dict[str, Any]) -> "RegleBail":
+        """Construit une règle depuis un dict {en-tête: valeur}."""
+        return cls(
+            article=row_data.get('Article'),
+            designation=row_data.get('Désignation'),
+            nom_source=row_data.get('Nom Source'),
+            source=row_data.get('Source'),
+            donnee_source=row_data.get('Donnée source'),
+            condition=row_data.get('Condition'),
+            option_1=row_data.get('Entrée correspondante - Option 1'),
+            condition_2=row_data.get('Condition Option 2'),
+            option_2=row_data.get('Entrée correspondante - Option 2'),
+        )
+
+
+class ConditionCompilee(NamedTuple):
+    """Condition de règle pré-compilée en prédicat sur les données."""
+
+    texte: str
+    evaluer: Callable[[Dict[str, Any]], bool]
+    reconnue: bool = True
+
+
+def _toujours_faux(donnees: Dict[str, Any]) -> bool:
+    return False
+
+
+def _compiler_comparaison(var_name: str, operator: str, expected_value: str) -> Optional[Callable[[Dict[str, Any]], bool]]:
+    """Construit le prédicat d'une comparaison, opérande numérique pré-converti."""
+    if operator == "=":
+        return lambda donnees: str(donnees.get(var_name)).strip() == expected_value
+    if operator == "!=":
+        return lambda donnees: str(donnees.get(var_name)).strip() != expected_value
+
+    try:
+        seuil = float(expected_value)
+    except ValueError:
+        return None
+
+    comparateurs = {
+        ">": lambda a: a > seuil,
+        "supérieur à": lambda a: a > seuil,
+        "supérieure à": lambda a: a > seuil,
+        ">=": lambda a: a >= seuil,
+        "<": lambda a: a < seuil,
+        "<=": lambda a: a <= seuil,
+    }
+    comparer = comparateurs[operator]
+
+    def evaluer(donnees: Dict[str, Any]) -> bool:
+        actual_value = donnees.get(var_name)
+        try:
+            return comparer(float(actual_value))
+        except (ValueError, TypeError):
+            logger.warning(f"Impossible de comparer {actual_value} avec {expected_value}")
+            return False
+
+    return evaluer
+
+
+@lru_cache(maxsize=None)
+def compiler_condition(condition_str: str) -> ConditionCompilee:
+    """
+    Compile une condition textuelle en prédicat (résultat mis en cache par texte).
+
+    Exemples de conditions:
+    - "Si [Durée Bail] > 9"
+    - "Si [Actualisation] = 'Oui'"
+    - "Si [Loyer année 1] non vide"
+    - "Si plusieurs conditions suspensives"
+
+    Une condition non reconnue est signalée une seule fois, à la compilation,
+    et s'évalue toujours à False.
+
+    Args:
+        condition_str: Condition en format texte (non vide)
+
+    Returns:
+        Condition compilée
+    """
+    condition = condition_str.strip()
+
+    # Cas spécial: "Si plusieurs conditions suspensives"
+    if "plusieurs conditions suspensives" in condition.lower():
+        return ConditionCompilee(
+            condition,
+            lambda donnees: sum(1 for i in range(1, 5) if donnees.get(f"Condition suspensive {i}")) > 1
+        )
+
+    condition = condition.translate(GUILLEMETS_TYPOGRAPHIQUES)
+
+    match_comparison = CONDITION_COMPARAISON_PATTERN.search(condition)
+    if match_comparison:
+        var_name = match_comparison.group(1).strip().replace('[', '').replace(']', '')
+        var_name = NOMS_VARIABLES_ALIAS.get(var_name, var_name)
+        operator = match_comparison.group(2).strip().lower()
+        expected_value = match_comparison.group(3).strip()
+
+        evaluer = _compiler_comparaison(var_name, operator, expected_value)
+        if evaluer is None:
+            logger.warning(f"Valeur non numérique dans la condition: {condition}")
+            return ConditionCompilee(condition, _toujours_faux, reconnue=False)
+        return ConditionCompilee(condition, evaluer)
+
+    match_nonempty = CONDITION_NON_VIDE_PATTERN.search(condition)
+    if match_nonempty:
+        var_name = match_nonempty.group(1).strip()
+
+        def evaluer_non_vide(donnees: Dict[str, Any]) -> bool:
+            value = donnees.get(var_name)
+            # Considérer comme non vide si value existe et n'est pas None, "", 0, False
+            return bool(value) and value != 0
+
+        return ConditionCompilee(condition, evaluer_non_vide)
+
+    logger.warning(f"Condition non reconnue: {condition}")
+    return ConditionCompilee(condition, _toujours_faux, reconnue=False)
+
+
+def compiler_index_regles(regles: List[RegleBail]) -> Dict[Tuple[str, Optional[str]], Tuple[RegleBail, ...]]:
+    """
+    Compile les règles en un index {(Article, Désignation): lignes}.
+
+    Chaque entrée contient la ligne d'en-tête de la section et ses lignes de
+    continuation (Article vide). La clé (Article, None) regroupe toutes les
+    désignations consécutives du même article. Seule la première section
+    rencontrée pour une clé est indexée, comme le faisait le parcours linéaire.
+
+    Args:
+        regles: Lignes de règles dans l'ordre de la feuille
+
+    Returns:
+        Index des sections d'articles
+    """
+    index: Dict[Tuple[str, Optional[str]], List[RegleBail]] = {}
+    bloc_article = None
+    bloc_designation = None
+    cle_article = None
+    cle_designation = None
+
+    for regle in regles:
+        if pd.notna(regle.article):
+            if regle.article != cle_article:
+                cle_article = regle.article
+                cle_designation = None
+                # Une section déjà indexée n'est pas complétée par une occurrence ultérieure
+                bloc_article = None if (cle_article, None) in index else index.setdefault((cle_article, None), [])
+            if regle.designation != cle_designation or cle_designation is None:
+                cle_designation = regle.designation
+                cle = (cle_article, cle_designation)
+                bloc_designation = None if cle in index else index.setdefault(cle, [])
+
+        if bloc_article is not None:
+            bloc_article.append(regle)
+        if bloc_designation is not None:
+            bloc_designation.append(regle)
+
+    return {cle: tuple(lignes) for cle, lignes in index.items()}
+
+
+class ReglesBail(NamedTuple):
+    """Instantané immuable des règles chargées depuis un classeur BAIL."""
+
+    chemin: str
+    mtime: int
+    taille: int
+    sha256: str
+    colonnes: Tuple[str, ...]
+    valeurs: Tuple[Tuple[Any, ...], ...]
+    lignes: Tuple[RegleBail, ...]
+    index: Mapping[Tuple[str, Optional[str]], Tuple[RegleBail, ...]]
+    contenu: bytes
+
+    def regles_dataframe(self) -> pd.DataFrame:
+        """Onglet "Rédaction BAIL" sous forme de DataFrame (une ligne par règle)."""
+        return pd.DataFrame(list(self.valeurs), columns=list(self.colonnes))
+
+    def donnees_dataframe(self) -> pd.DataFrame:
+        """Onglet "Liste données BAIL" sous forme de DataFrame (lu par pd.read_excel, à la demande)."""
+        return pd.read_excel(io.BytesIO(self.contenu), sheet_name="Liste données BAIL")
+
+
+def charger_regles_bail(chemin: str, contenu: bytes, mtime: int, taille: int) -> ReglesBail:
+    """
+    Parse et compile le classeur de règles BAIL en une seule ouverture.
+
+    Args:
+        chemin: Chemin du classeur (pour information)
+        contenu: Contenu binaire du classeur
+        mtime: Date de modification du fichier (ns)
+        taille: Taille du fichier en octets
+
+    Returns:
+        Instantané des règles compilées
+    """
+    wb = openpyxl.load_workbook(io.BytesIO(contenu), read_only=True, data_only=True)
+    try:
+        # Lire TOUTES les lignes (même celles avec Article vide)
+        lignes_bail = wb["Rédaction BAIL"].iter_rows(values_only=True)
+        headers = next(lignes_bail, ())  # Row 1 = headers
+
+        regles_list = []
+        for row in lignes_bail:
+            row_data = {}
+            for header, cell_value in zip(headers, row):
+                if header:  # Skip empty headers
+                    row_data[header] = cell_value
+            regles_list.append(row_data)
+    finally:
+        wb.close()
+
+    colonnes = tuple(dict.fromkeys(h for h in headers if h))
+    regles = tuple(RegleBail.depuis_ligne(row_data) for row_data in regles_list)
+
+    # Pré-compiler les conditions: les conditions non reconnues sont signalées ici, une seule fois
+    for regle in regles:
+        for condition in (regle.condition, regle.condition_2):
+            if pd.notna(condition) and condition:
+                compiler_condition(str(condition))
+
+    return ReglesBail(
+        chemin=chemin,
+        mtime=mtime,
+        taille=taille,
+        sha256=hashlib.sha256(contenu).hexdigest(),
+        colonnes=colonnes,
+        valeurs=tuple(tuple(row_data.get(c) for c in colonnes) for row_data in regles_list),
+        lignes=regles,
+        index=MappingProxyType(compiler_index_regles(list(regles))),
+        contenu=contenu,
+    )
+
+
+class RegistreReglesBail:
+    """
+    Cache des règles BAIL partagé par le processus.
+
+    Un classeur est rechargé uniquement si sa date de modification ou sa taille
+    change ET que son empreinte SHA-256 diffère de la version en cache.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._regles: Dict[str, ReglesBail] = {}
+
+    def obtenir(self, excel_path: str) -> ReglesBail:
+        """
+        Retourne l'instantané des règles à jour pour un classeur.
+
+        Args:
+            excel_path: Chemin vers "Redaction BAIL.xlsx"
+
+        Returns:
+            Règles compilées (partagées, ne pas modifier)
+        """
+        chemin = str(Path(excel_path).resolve())
+
+        with self._lock:
+            stat = os.stat(chemin)
+            regles = self._regles.get(chemin)
+            if regles is not None and (regles.mtime, regles.taille) == (stat.st_mtime_ns, stat.st_size):
+                return regles
+
+            contenu = Path(chemin).read_bytes()
+            sha256 = hashlib.sha256(contenu).hexdigest()
+
+            if regles is not None and regles.sha256 == sha256:
+                # Fichier touché mais contenu identique: pas de rechargement
+                regles = regles._replace(mtime=stat.st_mtime_ns, taille=stat.st_size)
+            else:
+                regles = charger_regles_bail(chemin, contenu, stat.st_mtime_ns, stat.st_size)
+                logger.info(f"Règles BAIL chargées: {len(regles.lignes)} lignes ({Path(chemin).name}, sha256 {sha256[:12]})")
+
+            self._regles[chemin] = regles
+            return regles
+
+    def vider(self) -> None:
+        """Vide le cache (force le rechargement au prochain accès)."""
+        with self._lock:
+            self._regles.clear()
+
+
+_registre_regles_bail = RegistreReglesBail()
+
+
+def get_regles_bail(excel_path: str = "Redaction BAIL.xlsx") -> ReglesBail:
+    """
+    Récupère les règles BAIL depuis le registre partagé du processus.
+
+    Args:
+        excel_path: Chemin vers le fichier Excel contenant les règles
+
+    Returns:
+        Règles compilées
+    """
+    return _registre_regles_bail.obtenir(excel_path)
@@ -6,13 +6,17 @@ dans le template Word avec placeholders, puis remplace tous les placeholders
 [Variable] par les valeurs extraites.
 """
 
-from docx import Document
 from docx.shared import RGBColor, Pt
+from docx.text.run import Run
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import accumulate
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List, Tuple
 import logging
 import re
 from .number_to_french import number_to_french_words
+from .template_cache import load_template_with_index
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +25,12 @@ DEFAULT_FONT_NAME = "Calibri"
 DEFAULT_FONT_SIZE = Pt(11)
 
 
+@lru_cache(maxsize=256)
+def _compile_placeholder_alternation(placeholders: Tuple[str, ...]) -> re.Pattern:
+    """Alternance compilée des placeholders d'un paragraphe (les plus longs d'abord)."""
+    return re.compile("|".join(re.escape(p) for p in sorted(placeholders, key=len, reverse=True)))
+
+
 class BailWordGenerator:
     """Générateur de documents BAIL au format Word."""
 
@@ -182,8 +192,10 @@ class BailWordGenerator:
         """
         logger.info("Début de la génération du document BAIL Word")
 
-        # Charger le template
-        doc = Document(self.template_path)
+        # Charger le template (copie du template parsé en cache) et l'index de ses placeholders
+        doc, placeholder_index = load_template_with_index(self.template_path)
+        body_paragraphs = placeholder_index.paragraphs(doc)
+        table_paragraphs = placeholder_index.paragraphs(doc, in_table=True)
 
         # ÉTAPE 1: Remplacer les placeholders {{ARTICLE}}
         placeholder_mapping = {
@@ -208,28 +220,23 @@ class BailWordGenerator:
             "{{DATE_SIGNATURE}}": donnees.get("Date de signature", ""),
         }
 
-        # Remplacer les placeholders {{ARTICLE}} dans tous les paragraphes
-        for paragraph in doc.paragraphs:
-            self._replace_article_placeholders(paragraph, placeholder_mapping, doc)
+        # Remplacer les placeholders {{ARTICLE}} dans les paragraphes indexés
+        # (les paragraphes créés par un article sont à traiter à l'étape 2)
+        variable_paragraphs = []
+        for paragraph in body_paragraphs:
+            written = self._replace_article_placeholders(paragraph, placeholder_mapping, doc)
+            variable_paragraphs.extend(written or [paragraph])
 
         # Remplacer les placeholders dans les tableaux
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    for paragraph in cell.paragraphs:
-                        self._replace_article_placeholders(paragraph, placeholder_mapping, doc)
+        for paragraph in table_paragraphs:
+            written = self._replace_article_placeholders(paragraph, placeholder_mapping, doc)
+            variable_paragraphs.extend(written or [paragraph])
 
         # ÉTAPE 2: Remplacer les placeholders [Variable] dans TOUT le document
         # (comme dans LOIGenerator)
-        for paragraph in doc.paragraphs:
+        for paragraph in variable_paragraphs:
             self._replace_variable_placeholders(paragraph, donnees)
 
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    for paragraph in cell.paragraphs:
-                        self._replace_variable_placeholders(paragraph, donnees)
-
         # Nettoyer uniquement les placeholders {{}} non remplacés
         self._clean_unreplaced_placeholders(doc)
 
@@ -293,7 +300,7 @@ class BailWordGenerator:
         paragraph,
         mapping: Dict[str, str],
         doc=None
-    ) -> None:
+    ) -> List:
         """
         Remplace les placeholders {{ARTICLE}} dans un paragraphe.
         Parse et applique les balises de formatage HTML-like (<b>, <i>, <u>).
@@ -304,12 +311,16 @@ class BailWordGenerator:
             paragraph: Paragraphe docx
             mapping: Mapping {placeholder: texte_final}
             doc: Document docx (optionnel, nécessaire pour créer de nouveaux paragraphes)
+
+        Returns:
+            Paragraphes réécrits (le paragraphe puis ceux créés après lui), liste vide si inchangé
         """
         full_text = paragraph.text
+        written = []
 
         # Vérifier s'il y a des placeholders {{}}
         if "{{" not in full_text:
-            return
+            return written
 
         # Pour chaque placeholder trouvé
         for placeholder, replacement in mapping.items():
@@ -348,10 +359,11 @@ class BailWordGenerator:
 
 
             if not final_paragraphs:
-                return
+                return written
 
             # Traiter le premier paragraphe dans le paragraphe Word actuel
             self._process_paragraph_with_heading(paragraph, final_paragraphs[0])
+            written.append(paragraph)
 
             # Pour les paragraphes suivants, créer de nouveaux paragraphes Word si doc est fourni
             if doc and len(final_paragraphs) > 1:
@@ -389,9 +401,13 @@ class BailWordGenerator:
                         # Traiter le paragraphe
                         self._process_paragraph_with_heading(new_para, para_text)
 
+                    written.append(new_para)
+
                     # Mettre à jour le dernier élément traité
                     last_para_element = new_p_element
 
+        return written
+
     def _process_paragraph_with_heading(self, paragraph, text: str) -> None:
         """
         Traite un paragraphe unique en détectant les marqueurs de titre et en appliquant le formatage.
@@ -494,18 +510,45 @@ class BailWordGenerator:
                 else:
                     placeholder_mapping[f"[{placeholder}]"] = (f"[{placeholder}]", True)
 
-        # Maintenant, parcourir chaque run et remplacer les placeholders
-        # On crée de nouveaux runs pour chaque remplacement afin de pouvoir colorer individuellement
-        runs_to_process = list(paragraph.runs)  # Copie car on va modifier pendant l'itération
+        # Découper le texte des runs en un seul passage de l'alternance compilée des placeholders.
+        # Le texte est celui de la concaténation des runs: un placeholder fragmenté sur plusieurs
+        # runs est reconnu et sa valeur prend le formatage du run où il commence.
+        runs = paragraph.runs
+        runs_text = "".join(run.text for run in runs)
+        # starts[i] = offset du premier caractère du run i dans runs_text
+        starts = list(accumulate((len(run.text) for run in runs), initial=0))
+        matches = list(_compile_placeholder_alternation(tuple(placeholder_mapping)).finditer(runs_text))
+
+        if not matches:
+            return
+
+        # Runs touchés par au moins un placeholder (les autres restent intacts)
+        touched = set()
+        for match in matches:
+            touched.update(range(bisect_right(starts, match.start()) - 1, bisect_right(starts, match.end() - 1)))
+
+        # Segments (texte, is_red) de chaque run touché; is_red = None pour le texte normal
+        segments_by_run = {i: [] for i in touched}
 
-        for run in runs_to_process:
-            run_text = run.text
+        def add_text(start: int, end: int) -> None:
+            i = bisect_right(starts, start) - 1
+            while start < end:
+                run_end = min(end, starts[i + 1])
+                if i in segments_by_run and start < run_end:
+                    segments_by_run[i].append((runs_text[start:run_end], None))
+                start = run_end
+                i += 1
 
-            # Vérifier si ce run contient des placeholders
-            has_placeholder = any(ph_key in run_text for ph_key in placeholder_mapping.keys())
+        pos = 0
+        for match in matches:
+            add_text(pos, match.start())
+            value, is_red = placeholder_mapping[match.group(0)]
+            segments_by_run[bisect_right(starts, match.start()) - 1].append((value, is_red))
+            pos = match.end()
+        add_text(pos, len(runs_text))
 
-            if not has_placeholder:
-                continue
+        for i in sorted(touched):
+            run = runs[i]
 
             # Sauvegarder le formatage du run original
             original_bold = run.font.bold
@@ -514,45 +557,15 @@ class BailWordGenerator:
             original_font_name = run.font.name
             original_font_size = run.font.size
 
-            # Diviser le texte du run en segments (texte normal / placeholder)
-            segments = []
-            remaining = run_text
-
-            while remaining:
-                # Trouver le premier placeholder
-                first_pos = len(remaining)
-                first_placeholder = None
-
-                for ph_key in placeholder_mapping.keys():
-                    pos = remaining.find(ph_key)
-                    if pos != -1 and pos < first_pos:
-                        first_pos = pos
-                        first_placeholder = ph_key
-
-                if first_placeholder:
-                    # Ajouter le texte avant le placeholder
-                    if first_pos > 0:
-                        segments.append((remaining[:first_pos], None))  # None = pas un placeholder
-
-                    # Ajouter le placeholder
-                    value, is_red = placeholder_mapping[first_placeholder]
-                    segments.append((value, is_red))  # is_red = True/False
-
-                    remaining = remaining[first_pos + len(first_placeholder):]
-                else:
-                    # Plus de placeholders
-                    segments.append((remaining, None))
-                    break
-
-            # Supprimer le run original
-            run._element.getparent().remove(run._element)
-
-            # Créer de nouveaux runs pour chaque segment
-            for text, is_red in segments:
+            # Créer les nouveaux runs à la place du run original
+            for text, is_red in segments_by_run[i]:
                 if not text:
                     continue
 
-                new_run = paragraph.add_run(text)
+                new_r = paragraph._p.add_r()
+                run._r.addprevious(new_r)
+                new_run = Run(new_r, paragraph)
+                new_run.text = text
 
                 # Appliquer le formatage du run original
                 new_run.font.bold = original_bold
@@ -572,6 +585,9 @@ class BailWordGenerator:
                 else:
                     new_run.font.color.rgb = RGBColor(0, 0, 0)
 
+            # Supprimer le run original
+            run._r.getparent().remove(run._r)
+
     def _update_toc(self, doc) -> None:
         """
         Force la mise à jour de la TOC en recréant le champ TOC.
@@ -0,0 +1,277 @@
+"""
+Génération en lot des documents LOI et BAIL pour un répertoire de fiches de décision.
+
+Usage:
+    python -m modules.batch in_dir/ out_dir/ --docs loi,bail --workers 4
+
+Chaque fiche produit ses documents dans out_dir/<nom de la fiche>/. Les règles
+BAIL et les templates Word sont chargés une seule fois par processus (registre
+et cache partagés). Les workers sont démarrés par spawn: ils n'héritent ni des
+connexions SQLite (caches, registre, limiteur), ni des sessions HTTP, ni des
+threads du processus principal, inutilisables après un fork. Les SIRET de
+toutes les fiches sont enrichis au préalable en requêtes INPI groupées (cache
+INPI partagé), dans la file batch du limiteur INPI commun à la machine.
+"""
+
+import argparse
+import logging
+import multiprocessing
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import List, NamedTuple, Optional
+
+from .excel_parser import ExcelParser, read_siret
+from .loi_generator import LOIGenerator
+from .bail_generator import BailGenerator
+from .bail_word_generator import BailWordGenerator
+from .bail_excel_parser import BailExcelParser
+from .bail_rules import get_regles_bail
+from .inpi_client import get_inpi_client
+from .offline_registry import get_offline_registry
+from .rate_limiter import BATCH, set_default_lane
+from .template_cache import get_template_cache
+
+logger = logging.getLogger(__name__)
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+DOCUMENT_TYPES = ("loi", "bail")
+FICHE_EXTENSIONS = (".xlsx", ".xlsm")
+
+
+class BatchSettings(NamedTuple):
+    """Fichiers de configuration et templates utilisés pour toutes les fiches."""
+
+    config_loi: str = "Rédaction LOI.xlsx"
+    template_loi: str = "Template LOI avec placeholder.docx"
+    config_bail: str = "Redaction BAIL.xlsx"
+    template_bail: str = "2025 - Template BAIL.docx"
+
+
+class FicheResult(NamedTuple):
+    """Résultat du traitement d'une fiche de décision."""
+
+    fiche: str
+    documents: List[str]
+    error: Optional[str]
+    duration: float
+
+
+def find_fiches(in_dir: Path) -> List[Path]:
+    """
+    Liste les fiches de décision d'un répertoire (hors fichiers temporaires Excel).
+
+    Args:
+        in_dir: Répertoire d'entrée
+
+    Returns:
+        Chemins des fiches triés par nom
+    """
+    return sorted(
+        path for path in in_dir.iterdir()
+        if path.is_file()
+        and path.suffix.lower() in FICHE_EXTENSIONS
+        and not path.name.startswith(("~$", "temp_"))
+    )
+
+
+def _warm_up(settings: BatchSettings, docs: List[str]) -> None:
+    """Charge les ressources partagées (règles, templates parsés) dans le processus courant."""
+    # Les appels INPI du lot cèdent la priorité à ceux de l'interface
+    set_default_lane(BATCH)
+    if "loi" in docs:
+        get_template_cache().get(settings.template_loi)
+    if "bail" in docs:
+        get_regles_bail(settings.config_bail)
+        get_template_cache().get(settings.template_bail)
+
+
+def _init_worker(settings: BatchSettings, docs: List[str], log_level: int) -> None:
+    """Prépare un worker démarré par spawn: journalisation, puis ressources partagées."""
+    logging.basicConfig(level=log_level, format=LOG_FORMAT)
+    _warm_up(settings, docs)
+
+
+def _prefetch_inpi(fiches: List[Path]) -> None:
+    """
+    Enrichit en requêtes INPI groupées les SIRET de toutes les fiches.
+
+    Les SIRET présents dans le registre local ne sont pas demandés. Les
+    résultats alimentent le cache INPI partagé: l'enrichissement fait ensuite
+    par chaque fiche (dans n'importe quel processus) le retrouve sans nouvel
+    appel réseau.
+
+    Args:
+        fiches: Chemins des fiches de décision
+    """
+    client = get_inpi_client()
+    if client is None:
+        return
+
+    registry = get_offline_registry()
+    sirets = []
+    for fiche in fiches:
+        try:
+            siret = read_siret(str(fiche))
+        except Exception as e:
+            logger.warning(f"SIRET illisible dans {fiche.name}: {e}")
+            continue
+        if not siret:
+            continue
+        if registry is not None and registry.get_company_info(siret)["enrichment_status"] == "success":
+            continue
+        sirets.append(siret)
+
+    if sirets:
+        client.get_companies_info(sirets)
+
+
+def process_fiche(fiche_path: str, out_dir: str, docs: List[str], settings: BatchSettings) -> FicheResult:
+    """
+    Génère les documents demandés pour une fiche.
+
+    Args:
+        fiche_path: Chemin de la fiche de décision
+        out_dir: Répertoire de sortie
+        docs: Types de documents ("loi", "bail")
+        settings: Configuration et templates
+
+    Returns:
+        Résultat (documents générés ou message d'erreur)
+    """
+    start = time.perf_counter()
+    fiche_path = Path(fiche_path)
+    fiche_out_dir = Path(out_dir) / fiche_path.stem
+    documents = []
+
+    try:
+        parser = ExcelParser(str(fiche_path), settings.config_loi)
+        # Enrichissement INPI en arrière-plan: le travail local ci-dessous ne l'attend pas
+        variables = parser.extract_variables(wait_for_inpi=False)
+
+        if "loi" in docs:
+            societes_info = parser.extract_societe_info()
+            loi_path = fiche_out_dir / parser.get_output_filename(variables)
+        if "bail" in docs:
+            bail_generator = BailGenerator(settings.config_bail)
+            bail_path = fiche_out_dir / BailExcelParser.get_output_filename(variables)
+
+        # Les champs INPI ne sont nécessaires qu'au rendu des documents
+        parser.join_inpi_enrichment(variables)
+
+        if "loi" in docs:
+            generator = LOIGenerator(variables, societes_info, settings.template_loi)
+            documents.append(generator.generate(str(loi_path)))
+
+        if "bail" in docs:
+            articles_generes = bail_generator.generer_bail(variables)
+            donnees_complete = bail_generator.calculer_variables_derivees(variables)
+
+            bail_path.parent.mkdir(parents=True, exist_ok=True)
+            BailWordGenerator(settings.template_bail).generer_document(
+                articles_generes, donnees_complete, str(bail_path)
+            )
+            documents.append(str(bail_path))
+
+        return FicheResult(str(fiche_path), documents, None, time.perf_counter() - start)
+
+    except Exception as e:
+        logger.error(f"Erreur sur {fiche_path.name}: {traceback.format_exc()}")
+        return FicheResult(str(fiche_path), documents, str(e), time.perf_counter() - start)
+
+
+def run_batch(
+    in_dir: str,
+    out_dir: str,
+    docs: List[str],
+    workers: int = 1,
+    settings: BatchSettings = BatchSettings()
+) -> List[FicheResult]:
+    """
+    Génère les documents de toutes les fiches d'un répertoire.
+
+    Args:
+        in_dir: Répertoire des fiches de décision
+        out_dir: Répertoire de sortie
+        docs: Types de documents à générer
+        workers: Nombre de processus (1 = traitement dans le processus courant)
+        settings: Configuration et templates
+
+    Returns:
+        Résultats par fiche, dans l'ordre de fin de traitement
+    """
+    fiches = find_fiches(Path(in_dir))
+    Path(out_dir).mkdir(parents=True, exist_ok=True)
+    logger.info(f"{len(fiches)} fiches à traiter ({', '.join(docs)}) avec {workers} processus")
+
+    _warm_up(settings, docs)
+    # Enrichissement INPI groupé: les fiches le retrouveront dans le cache partagé
+    _prefetch_inpi(fiches)
+
+    results = []
+    if workers <= 1:
+        for fiche in fiches:
+            results.append(process_fiche(str(fiche), out_dir, docs, settings))
+        return results
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(settings, docs, logging.getLogger().getEffectiveLevel())
+    ) as executor:
+        futures = [
+            executor.submit(process_fiche, str(fiche), out_dir, docs, settings)
+            for fiche in fiches
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            status = "OK" if result.error is None else f"ERREUR: {result.error}"
+            logger.info(f"{Path(result.fiche).name}: {status} ({result.duration:.1f} s)")
+            results.append(result)
+
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Génère les documents LOI et/ou BAIL pour toutes les fiches de décision d'un répertoire."
+    )
+    parser.add_argument("in_dir", help="Répertoire contenant les fiches de décision (.xlsx)")
+    parser.add_argument("out_dir", help="Répertoire de sortie des documents générés")
+    parser.add_argument("--docs", default="loi,bail",
+                        help="Documents à générer, séparés par des virgules (défaut: loi,bail)")
+    parser.add_argument("--workers", type=int, default=1, help="Nombre de processus (défaut: 1)")
+    defaults = BatchSettings()
+    parser.add_argument("--config-loi", default=defaults.config_loi)
+    parser.add_argument("--template-loi", default=defaults.template_loi)
+    parser.add_argument("--config-bail", default=defaults.config_bail)
+    parser.add_argument("--template-bail", default=defaults.template_bail)
+    args = parser.parse_args(argv)
+
+    docs = [d.strip().lower() for d in args.docs.split(",") if d.strip()]
+    unknown = [d for d in docs if d not in DOCUMENT_TYPES]
+    if unknown or not docs:
+        parser.error(f"Type de document inconnu: {', '.join(unknown) or args.docs} (attendu: loi, bail)")
+
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+
+    settings = BatchSettings(args.config_loi, args.template_loi, args.config_bail, args.template_bail)
+    start = time.perf_counter()
+    results = run_batch(args.in_dir, args.out_dir, docs, args.workers, settings)
+
+    failures = [r for r in results if r.error is not None]
+    nb_documents = sum(len(r.documents) for r in results)
+    print(f"{len(results)} fiches traitées, {nb_documents} documents générés "
+          f"en {time.perf_counter() - start:.1f} s")
+    for result in failures:
+        print(f"  ✗ {Path(result.fiche).name}: {result.error}")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
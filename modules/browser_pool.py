@@ -0,0 +1,135 @@
+"""
+Pool de navigateurs Playwright (Chromium headless) réutilisés entre les scrapings.
+
+L'API synchrone de Playwright est liée au thread qui l'a démarrée: chaque
+thread du pool possède son navigateur et son contexte, lancés au premier usage
+puis gardés chauds. Le nombre de threads borne le nombre de pages ouvertes
+simultanément (Config.PLAYWRIGHT_MAX_PAGES), et un navigateur est relancé
+après Config.PLAYWRIGHT_MAX_USES pages pour contenir sa consommation mémoire.
+Les navigateurs encore ouverts à la fin du processus s'arrêtent avec le
+pilote Playwright.
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+BLOCKED_RESOURCES = {"image", "font", "media"}  # Inutiles à l'extraction du texte
+
+
+class _Browser:
+    """Navigateur et contexte d'un thread du pool."""
+
+    def __init__(self):
+        from playwright.sync_api import sync_playwright
+
+        self.playwright = sync_playwright().start()
+        try:
+            self.browser = self.playwright.chromium.launch(headless=True)
+            self.context = self.browser.new_context()
+            self.context.route("**/*", self._route)
+        except Exception:
+            self.playwright.stop()
+            raise
+        self.uses = 0
+        logger.info(f"Navigateur Playwright lancé ({threading.current_thread().name})")
+
+    @staticmethod
+    def _route(route):
+        if route.request.resource_type in BLOCKED_RESOURCES:
+            route.abort()
+        else:
+            route.continue_()
+
+    def close(self) -> None:
+        """Ferme contexte, navigateur et Playwright (depuis le thread propriétaire)."""
+        for close in (self.context.close, self.browser.close, self.playwright.stop):
+            try:
+                close()
+            except Exception as e:
+                logger.debug(f"Fermeture Playwright: {e}")
+
+
+class BrowserPool:
+    """Threads possédant chacun un navigateur chaud, auxquels on confie des pages."""
+
+    def __init__(self, max_pages: Optional[int] = None, max_uses: Optional[int] = None):
+        """
+        Args:
+            max_pages: Pages ouvertes simultanément au plus (Config.PLAYWRIGHT_MAX_PAGES par défaut)
+            max_uses: Pages servies par un navigateur avant relance (Config.PLAYWRIGHT_MAX_USES par défaut)
+        """
+        self.max_pages = max_pages or Config.PLAYWRIGHT_MAX_PAGES
+        self.max_uses = max_uses or Config.PLAYWRIGHT_MAX_USES
+        self._executor = ThreadPoolExecutor(max_workers=self.max_pages, thread_name_prefix="inpi-browser")
+        self._local = threading.local()
+
+    def run(self, fn: Callable[..., Any], *args, timeout: Optional[float] = None) -> Any:
+        """
+        Exécute fn(page, *args) sur une page neuve d'un navigateur du pool.
+
+        Args:
+            fn: Fonction recevant la page Playwright puis args
+            *args: Arguments supplémentaires de fn
+            timeout: Attente maximale du résultat en secondes (file d'attente comprise)
+
+        Returns:
+            Valeur retournée par fn
+        """
+        return self._executor.submit(self._run_in_worker, fn, args).result(timeout)
+
+    def _run_in_worker(self, fn: Callable[..., Any], args: tuple) -> Any:
+        """Ouvre une page dans le navigateur du thread courant, le relançant si nécessaire."""
+        browser = getattr(self._local, "browser", None)
+        if browser is None:
+            browser = self._local.browser = _Browser()
+
+        page = browser.context.new_page()
+        try:
+            return fn(page, *args)
+        finally:
+            try:
+                page.close()
+            except Exception as e:
+                logger.debug(f"Fermeture de page: {e}")
+            browser.uses += 1
+            if browser.uses >= self.max_uses or not browser.browser.is_connected():
+                logger.info(f"Navigateur Playwright recyclé après {browser.uses} pages")
+                browser.close()
+                self._local.browser = None
+
+    def _close_in_worker(self, barrier: threading.Barrier) -> None:
+        """Ferme le navigateur du thread courant (un appel par thread grâce à la barrière)."""
+        try:
+            barrier.wait(timeout=5)
+        except threading.BrokenBarrierError:
+            pass
+        browser = getattr(self._local, "browser", None)
+        if browser is not None:
+            browser.close()
+            self._local.browser = None
+
+    def close(self) -> None:
+        """Ferme tous les navigateurs puis arrête les threads du pool."""
+        barrier = threading.Barrier(self.max_pages)
+        for _ in range(self.max_pages):
+            self._executor.submit(self._close_in_worker, barrier)
+        self._executor.shutdown(wait=True)
+
+
+_browser_pool: Optional[BrowserPool] = None
+_browser_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """Retourne le pool de navigateurs du processus (threads et navigateurs créés à la demande)."""
+    global _browser_pool
+    with _browser_pool_lock:
+        if _browser_pool is None:
+            _browser_pool = BrowserPool()
+        return _browser_pool
@@ -0,0 +1,211 @@
+"""
+Résolution groupée des références de cellules ('Onglet'!B23, 'Onglet'!E38:E41).
+
+Les références nécessaires (configuration LOI, règles BAIL) sont collectées
+dans un plan, regroupées par onglet, puis lues en un seul balayage ordonné des
+lignes de chaque onglet, directement dans le XML du classeur (XlsxReader).
+Seuls les onglets référencés sont parsés, la lecture s'arrête à la dernière
+ligne utile et seules les chaînes partagées utilisées sont décodées.
+
+Le classeur peut être un chemin ou son contenu en mémoire (bytes, fichier
+uploadé): il est alors lu sans jamais passer par le disque.
+"""
+
+import logging
+from pathlib import Path
+from functools import lru_cache
+from typing import Any, BinaryIO, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple, Union
+
+from .xlsx_reader import XlsxReader, split_cell_ref
+
+logger = logging.getLogger(__name__)
+
+
+class CellReference(NamedTuple):
+    """Référence à une cellule ou à une plage d'un onglet."""
+
+    sheet: str
+    min_row: int
+    min_col: int
+    max_row: int
+    max_col: int
+    is_range: bool
+
+    def cells(self) -> List[Tuple[int, int]]:
+        """Coordonnées (ligne, colonne) couvertes, ligne par ligne."""
+        return [
+            (row, col)
+            for row in range(self.min_row, self.max_row + 1)
+            for col in range(self.min_col, self.max_col + 1)
+        ]
+
+
+@lru_cache(maxsize=1024)
+def parse_reference(formula: str) -> Optional[CellReference]:
+    """
+    Parse une formule de référence.
+
+    Args:
+        formula: Formule Excel (ex: "='3. Hypothèses'!E47" ou "=Validation!B23:B25")
+
+    Returns:
+        Référence parsée, ou None si la formule n'est pas une référence valide
+    """
+    text = str(formula).strip()
+    if text.startswith("="):
+        text = text[1:]
+
+    # Format: 'Sheet Name'!CellRef ou SheetName!CellRef
+    if "!" not in text:
+        return None
+
+    sheet_part, _, cell_part = text.rpartition("!")
+    sheet_name = sheet_part.strip().strip("'").replace("''", "'")
+    cell_part = cell_part.strip()
+
+    try:
+        if ":" in cell_part:
+            start, end = cell_part.split(":", 1)
+            start_row, start_col = split_cell_ref(start)
+            end_row, end_col = split_cell_ref(end)
+            return CellReference(
+                sheet_name,
+                min(start_row, end_row), min(start_col, end_col),
+                max(start_row, end_row), max(start_col, end_col),
+                True
+            )
+        row, col = split_cell_ref(cell_part)
+        return CellReference(sheet_name, row, col, row, col, False)
+    except ValueError:
+        return None
+
+
+WorkbookSource = Union[str, Path, bytes, BinaryIO]
+
+
+def workbook_source(source: WorkbookSource) -> Union[Path, bytes]:
+    """
+    Normalise la source d'un classeur: chemin, ou contenu binaire lu une seule fois.
+
+    Un fichier ouvert (upload Streamlit, BytesIO) est lu en entier: chaque
+    lecture ultérieure part alors de son propre tampon, sans position partagée
+    entre threads.
+
+    Args:
+        source: Chemin, contenu binaire ou fichier ouvert en binaire
+
+    Returns:
+        Chemin du classeur, ou son contenu (bytes)
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source)
+    if hasattr(source, "read"):
+        if hasattr(source, "getvalue"):
+            return source.getvalue()
+        if hasattr(source, "seek"):
+            source.seek(0)
+        return source.read()
+    return Path(source)
+
+
+def source_name(source: WorkbookSource) -> str:
+    """Nom du classeur pour les messages (nom du fichier uploadé s'il est connu)."""
+    if isinstance(source, (str, Path)):
+        return Path(source).name
+    return getattr(source, "name", None) or "classeur en mémoire"
+
+
+class CellValues:
+    """Valeurs typées lues depuis le classeur source, par onglet et coordonnées."""
+
+    def __init__(self, source, sheetnames: List[str], values: Dict[str, Dict[Tuple[int, int], Any]]):
+        self._source = source
+        self.sheetnames = sheetnames
+        self._values = values
+
+    def has_sheet(self, sheet_name: str) -> bool:
+        return sheet_name in self.sheetnames
+
+    def get(self, sheet_name: str, row: int, col: int) -> Any:
+        """
+        Valeur d'une cellule (lue à la demande si elle n'était pas planifiée).
+
+        Args:
+            sheet_name: Nom de l'onglet
+            row: Ligne (1-based)
+            col: Colonne (1-based)
+
+        Returns:
+            Valeur typée (str, int, float, datetime...) ou None
+        """
+        sheet_values = self._values.get(sheet_name)
+        if sheet_values is None or (row, col) not in sheet_values:
+            if not self.has_sheet(sheet_name):
+                return None
+            logger.debug(f"Cellule non planifiée {sheet_name}!R{row}C{col}, lecture à la demande")
+            fetched = _fetch_sheets(self._source, {sheet_name: {(row, col)}})[1]
+            self._values.setdefault(sheet_name, {}).update(fetched.get(sheet_name, {(row, col): None}))
+        return self._values[sheet_name].get((row, col))
+
+    def resolve(self, reference: CellReference) -> Any:
+        """Valeur d'une référence: valeur unique, ou liste ligne par ligne pour une plage."""
+        if reference.is_range:
+            return [self.get(reference.sheet, row, col) for row, col in reference.cells()]
+        return self.get(reference.sheet, reference.min_row, reference.min_col)
+
+
+class ReferencePlan:
+    """Collecte des références à lire, regroupées par onglet."""
+
+    def __init__(self, formulas: Iterable[Any] = ()):
+        self._cells: Dict[str, Set[Tuple[int, int]]] = {}
+        for formula in formulas:
+            self.add(formula)
+
+    def add(self, formula: Any) -> Optional[CellReference]:
+        """
+        Ajoute une formule de référence au plan (les autres valeurs sont ignorées).
+
+        Args:
+            formula: Formule Excel de référence
+
+        Returns:
+            Référence ajoutée ou None
+        """
+        if not formula or not isinstance(formula, str) or "!" not in formula:
+            return None
+        reference = parse_reference(formula)
+        if reference is not None:
+            self._cells.setdefault(reference.sheet, set()).update(reference.cells())
+        return reference
+
+    @property
+    def sheets(self) -> List[str]:
+        return list(self._cells)
+
+    def fetch(self, source) -> CellValues:
+        """
+        Lit toutes les cellules du plan en un balayage par onglet.
+
+        Args:
+            source: Chemin, contenu binaire ou fichier binaire du classeur (Fiche de décision)
+
+        Returns:
+            Valeurs typées des cellules planifiées
+        """
+        sheetnames, values = _fetch_sheets(source, self._cells)
+        return CellValues(source, sheetnames, values)
+
+
+def _fetch_sheets(source, cells_by_sheet: Dict[str, Set[Tuple[int, int]]]):
+    """Lecture directe des cellules de chaque onglet référencé (parties XML du classeur)."""
+    if hasattr(source, "seek"):
+        source.seek(0)
+
+    with XlsxReader(source) as reader:
+        sheetnames = reader.sheetnames
+        values: Dict[str, Dict[Tuple[int, int], Any]] = {}
+        for sheet_name, cells in cells_by_sheet.items():
+            if sheet_name in sheetnames and cells:
+                values[sheet_name] = reader.read_cells(sheet_name, cells)
+        return sheetnames, values
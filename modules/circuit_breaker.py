@@ -0,0 +1,86 @@
+"""
+Disjoncteur (circuit breaker) des appels à l'API INPI.
+
+Après Config.INPI_BREAKER_THRESHOLD échecs consécutifs (timeouts, erreurs
+réseau, 5xx, quota dépassé), le circuit s'ouvre: les appels suivants sont
+refusés immédiatement et l'enrichissement passe directement au scraping ou aux
+données en cache. Après Config.INPI_BREAKER_COOLDOWN secondes, un seul appel
+de test est autorisé (semi-ouvert): son succès referme le circuit, son échec
+le rouvre pour une nouvelle période.
+"""
+
+import logging
+import threading
+import time
+from typing import Optional
+
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """État du circuit partagé par tous les threads du processus."""
+
+    def __init__(self, name: str, threshold: Optional[int] = None, cooldown: Optional[float] = None):
+        """
+        Args:
+            name: Nom du service protégé (pour les logs)
+            threshold: Échecs consécutifs avant ouverture (Config.INPI_BREAKER_THRESHOLD par défaut)
+            cooldown: Durée d'ouverture en secondes avant un appel de test (Config.INPI_BREAKER_COOLDOWN par défaut)
+        """
+        self.name = name
+        self.threshold = Config.INPI_BREAKER_THRESHOLD if threshold is None else threshold
+        self.cooldown = Config.INPI_BREAKER_COOLDOWN if cooldown is None else cooldown
+        self.state = CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        """Vrai si les appels sont actuellement refusés (ouvert, ou appel de test en cours)."""
+        with self._lock:
+            if self.state == OPEN:
+                return time.monotonic() - self._opened_at < self.cooldown
+            return self.state == HALF_OPEN
+
+    def allow(self) -> bool:
+        """
+        Indique si un appel peut être tenté.
+
+        Returns:
+            True si le circuit est fermé, ou pour l'unique appel de test après la période d'ouverture
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() - self._opened_at >= self.cooldown:
+                self.state = HALF_OPEN
+                logger.info(f"Circuit {self.name} semi-ouvert: appel de test")
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """Le service a répondu: referme le circuit."""
+        with self._lock:
+            if self.state != CLOSED:
+                logger.info(f"Circuit {self.name} refermé")
+            self.state = CLOSED
+            self.failures = 0
+
+    def record_failure(self) -> None:
+        """Le service n'a pas répondu: ouvre le circuit au seuil (ou si l'appel de test échoue)."""
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or (self.state == CLOSED and self.failures >= self.threshold):
+                self.state = OPEN
+                self._opened_at = time.monotonic()
+                logger.warning(
+                    f"Circuit {self.name} ouvert après {self.failures} échecs consécutifs "
+                    f"(appels suspendus {self.cooldown:g} s)"
+                )
@@ -44,8 +44,35 @@ class Config:
 
     # API INPI settings
     INPI_BASE_URL = "https://registre-national-entreprises.inpi.fr/api"
-    INPI_RATE_LIMIT = 5  # requêtes par minute
+    INPI_RATE_LIMIT = 5  # requêtes par minute (quota commun à tous les processus)
+    INPI_INTERACTIVE_RESERVE = 1  # requêtes par minute réservées à l'interface (non utilisées en lot)
+    INPI_RATE_LIMIT_PATH = _get_secret(
+        'INPI_RATE_LIMIT_PATH', str(Path(__file__).parent.parent / '.cache' / 'inpi_rate_limit.sqlite')
+    )
+    INPI_DEADLINE = 20  # budget de latence d'un enrichissement, incidents INPI compris (secondes)
+    INPI_HEDGE_DELAY = 3  # scraping de secours lancé si l'API n'a pas répondu après ce délai (secondes)
+    INPI_BREAKER_THRESHOLD = 3  # échecs consécutifs de l'API avant ouverture du circuit
+    INPI_BREAKER_COOLDOWN = 60  # durée d'ouverture du circuit avant un appel de test (secondes)
     INPI_CACHE_DURATION = 3600  # 1 heure en secondes
+    INPI_NEGATIVE_CACHE_DURATION = 600  # SIREN inconnus: 10 minutes
+    # Registre local importé d'un export SIRENE/RNE (python import_registre.py export.csv)
+    INPI_REGISTRY_PATH = _get_secret(
+        'INPI_REGISTRY_PATH', str(Path(__file__).parent.parent / '.cache' / 'registre_entreprises.sqlite')
+    )
+    # Cache SQLite partagé par tous les processus (sessions Streamlit, génération en lot)
+    INPI_CACHE_PATH = _get_secret(
+        'INPI_CACHE_PATH', str(Path(__file__).parent.parent / '.cache' / 'inpi_cache.sqlite')
+    )
+
+    # Cache disque des extractions de fiches (par contenu de la fiche et de la configuration)
+    EXTRACTION_CACHE_PATH = _get_secret(
+        'EXTRACTION_CACHE_PATH', str(Path(__file__).parent.parent / '.cache' / 'extraction_cache.sqlite')
+    )
+    EXTRACTION_CACHE_MAX_BYTES = 50 * 1024 * 1024  # au-delà, les extractions les moins récentes sont évincées
+
+    # Pool de navigateurs Playwright (scraping data.inpi.fr)
+    PLAYWRIGHT_MAX_PAGES = 2  # pages ouvertes simultanément (un navigateur par page)
+    PLAYWRIGHT_MAX_USES = 50  # pages servies par un navigateur avant relance
 
     @classmethod
     def validate_inpi_credentials(cls) -> bool:
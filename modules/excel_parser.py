@@ -4,44 +4,185 @@ Lit les données depuis les différents onglets et les map vers les variables LO
 """
 
 import logging
-from typing import Dict, Optional
+from concurrent.futures import Future
+from typing import Dict, List, NamedTuple, Optional
 from datetime import datetime, timedelta
 from pathlib import Path
-import openpyxl
-from openpyxl.utils.exceptions import InvalidFileException
-from .inpi_client import get_inpi_client
+from .inpi_async import get_async_inpi_client
+from .offline_registry import get_offline_registry
+from .xlsx_reader import XlsxReader, split_cell_ref
+from .cell_references import (
+    CellValues, ReferencePlan, WorkbookSource, parse_reference, source_name, workbook_source
+)
+from .extraction_cache import content_sha256, extraction_key, get_extraction_cache
 
 logger = logging.getLogger(__name__)
 
+SIRET_REFERENCE = "=Validation!B25"  # SIRET pour l'enrichissement INPI
+EXTRACTOR_VERSION = 2  # À incrémenter quand l'extraction change (invalide le cache disque)
+
+
+class ConfigInstruction(NamedTuple):
+    """Instruction d'extraction issue d'une ligne de l'onglet "Rédaction LOI"."""
+
+    name: str
+    kind: str  # "reference" (='Onglet'!B23), "formula" (calcul avec [Variables]) ou "description"
+    source: str
+
+
+class LOIConfig(NamedTuple):
+    """Configuration LOI compilée (None si l'onglet est absent du classeur)."""
+
+    instructions: Optional[List[ConfigInstruction]]
+    societes: Optional[Dict[str, Dict[str, str]]]
+
+
+def load_loi_config(config_path) -> LOIConfig:
+    """
+    Lit le classeur de configuration en une seule passe streaming.
+
+    Seuls les onglets "Rédaction LOI" (colonnes A/B, valeur en cache et formule)
+    et "Société Bailleur" (colonnes A/B/C) sont parsés.
+
+    Args:
+        config_path: Chemin vers Rédaction LOI.xlsx
+
+    Returns:
+        Instructions d'extraction et informations des sociétés bailleures
+    """
+    with XlsxReader(config_path) as reader:
+        instructions = None
+        if "Rédaction LOI" in reader.sheetnames:
+            # ligne -> {colonne: cellule}
+            rows: Dict[int, Dict[int, object]] = {}
+            for cell in reader.iter_cells("Rédaction LOI", columns=(1, 2)):
+                if cell.row >= 2:
+                    rows.setdefault(cell.row, {})[cell.column] = cell
+
+            instructions = []
+            for cells in rows.values():
+                nom_cell = cells.get(1)
+                source_cell = cells.get(2)
+                nom = nom_cell.value if nom_cell else None  # Colonne A: Nom
+                if not nom:
+                    continue
+
+                # Colonne B: Source (valeur en cache, sinon la formule)
+                source = None
+                if source_cell:
+                    source = source_cell.value or source_cell.formula
+
+                if not source or not isinstance(source, str):
+                    continue
+
+                if source.startswith("=") and "!" in source:
+                    # C'est une référence à une cellule
+                    kind = "reference"
+                elif "[" in source and "]" in source:
+                    # C'est une formule qui sera calculée plus tard (ex: adresse, paliers)
+                    kind = "formula"
+                else:
+                    # Texte littéral ou description
+                    kind = "description"
+                instructions.append(ConfigInstruction(str(nom).strip(), kind, source))
+
+        societes = None
+        if "Société Bailleur" in reader.sheetnames:
+            rows = {}
+            for cell in reader.iter_cells("Société Bailleur", columns=(1, 2, 3)):
+                if cell.row >= 2:
+                    rows.setdefault(cell.row, {})[cell.column] = cell.value
+
+            societes = {}
+            # Parcourir les lignes (ligne 2 = première société)
+            for values in rows.values():
+                nom_societe = values.get(1)  # Colonne A
+                header = values.get(2)  # Colonne B
+                footer = values.get(3)  # Colonne C
+
+                if not nom_societe:
+                    continue
+
+                nom_societe = str(nom_societe).strip()
+                societes[nom_societe] = {
+                    "header": str(header).strip() if header else nom_societe,
+                    "footer": str(footer).strip() if footer else ""
+                }
+
+    return LOIConfig(instructions, societes)
+
 
 class ExcelParser:
     """Parse les fichiers Excel de décision pour extraire les variables LOI."""
 
-    def __init__(self, excel_path: str, config_path: str = "Rédaction LOI.xlsx"):
+    def __init__(self, excel_path: WorkbookSource, config_path: str = "Rédaction LOI.xlsx"):
         """
         Initialise le parser avec le fichier Excel source.
 
         Args:
-            excel_path: Chemin vers le fichier Excel source (Fiche de décision)
+            excel_path: Fiche de décision: chemin, contenu binaire ou fichier ouvert (upload), lu en mémoire
             config_path: Chemin vers le fichier de configuration (Rédaction LOI.xlsx)
         """
-        self.excel_path = Path(excel_path)
+        self.excel_name = source_name(excel_path)
+        self.excel_path = workbook_source(excel_path)
         self.config_path = Path(config_path)
 
-        if not self.excel_path.exists():
+        if isinstance(self.excel_path, Path) and not self.excel_path.exists():
             raise FileNotFoundError(f"Fichier Excel source introuvable: {excel_path}")
         if not self.config_path.exists():
             raise FileNotFoundError(f"Fichier de configuration introuvable: {config_path}")
 
+        # Enrichissement INPI en cours (lancé par start_inpi_enrichment)
+        self._siret: Optional[str] = None
+        self._inpi_future: Optional[Future] = None
+
+        self._config: Optional[LOIConfig] = None
+        self._cell_values: Optional[CellValues] = None
+
+        # Extraction déjà faite pour ce contenu de fiche et de configuration: classeurs non relus
+        self.cache_key = extraction_key(
+            content_sha256(self.excel_path), content_sha256(self.config_path), EXTRACTOR_VERSION
+        )
+        cache = get_extraction_cache()
+        self._cached = cache.get(self.cache_key) if cache is not None else None
+        if self._cached is not None:
+            logger.info(f"Extraction en cache: {self.excel_name} (classeur non relu)")
+        else:
+            self._load()
+
+    def _load(self) -> None:
+        """Lit la configuration puis, en un balayage par onglet, toutes les cellules référencées."""
+        # Configuration lue une seule fois (valeurs en cache + formules dans la même passe)
+        self._config = load_loi_config(self.config_path)
+        logger.info(f"Configuration chargée: {self.config_path.name}")
+
+        # Planifier toutes les cellules référencées puis les lire en un balayage par onglet
+        plan = ReferencePlan(
+            instruction.source for instruction in (self._config.instructions or [])
+            if instruction.kind == "reference"
+        )
+        plan.add(SIRET_REFERENCE)
+
         try:
-            self.workbook = openpyxl.load_workbook(self.excel_path, data_only=True)
-            self.config_workbook = openpyxl.load_workbook(self.config_path, data_only=True)
-            # Also load config with formulas to handle cases where cached values are missing
-            self.config_workbook_formulas = openpyxl.load_workbook(self.config_path, data_only=False)
-            logger.info(f"Fichier Excel chargé: {self.excel_path.name}")
-            logger.info(f"Configuration chargée: {self.config_path.name}")
-        except InvalidFileException as e:
-            raise ValueError(f"Fichier Excel invalide: {e}")
+            self._cell_values = plan.fetch(self.excel_path)
+            logger.info(f"Fichier Excel chargé: {self.excel_name} (onglets lus: {', '.join(plan.sheets)})")
+        except (ValueError, KeyError) as e:
+            # XlsxReader signale une archive illisible par ValueError, une partie manquante par KeyError
+            raise ValueError(f"Fichier Excel invalide ({self.excel_name}): {e}") from e
+
+    @property
+    def config(self) -> LOIConfig:
+        """Configuration LOI compilée (lue à la demande après une extraction en cache)."""
+        if self._config is None:
+            self._load()
+        return self._config
+
+    @property
+    def cell_values(self) -> CellValues:
+        """Cellules référencées de la fiche (lues à la demande après une extraction en cache)."""
+        if self._cell_values is None:
+            self._load()
+        return self._cell_values
 
     def _get_cell_value(self, sheet_name: str, cell_ref: str) -> Optional[str]:
         """
@@ -55,27 +196,31 @@ class ExcelParser:
             Valeur de la cellule ou None
         """
         try:
-            if sheet_name not in self.workbook.sheetnames:
+            if not self.cell_values.has_sheet(sheet_name):
                 logger.warning(f"Onglet '{sheet_name}' introuvable")
                 return None
 
-            sheet = self.workbook[sheet_name]
-            value = sheet[cell_ref].value
+            row, col = split_cell_ref(cell_ref)
+            value = self.cell_values.get(sheet_name, row, col)
 
-            # Convertir les valeurs en string, gérer les dates
-            if value is None:
-                return None
-            elif isinstance(value, datetime):
-                return value.strftime("%d/%m/%Y")
-            elif isinstance(value, (int, float)):
-                return str(value)
-            else:
-                return str(value).strip()
+            return self._format_value(value)
 
         except Exception as e:
             logger.warning(f"Erreur lecture cellule {sheet_name}!{cell_ref}: {e}")
             return None
 
+    @staticmethod
+    def _format_value(value) -> Optional[str]:
+        """Convertit une valeur de cellule en string (dates au format JJ/MM/AAAA)."""
+        if value is None:
+            return None
+        elif isinstance(value, datetime):
+            return value.strftime("%d/%m/%Y")
+        elif isinstance(value, (int, float)):
+            return str(value)
+        else:
+            return str(value).strip()
+
     def _parse_formula(self, formula: str) -> Optional[str]:
         """
         Parse une formule Excel pour extraire la valeur.
@@ -86,91 +231,125 @@ class ExcelParser:
         Returns:
             Valeur extraite ou None
         """
-        if not formula or not isinstance(formula, str):
+        if not formula or not isinstance(formula, str) or "!" not in formula:
             return None
 
-        # Retirer le signe =
-        formula = formula.strip()
-        if formula.startswith("="):
-            formula = formula[1:]
+        # Format: 'Sheet Name'!CellRef ou SheetName!CellRef (parse mis en cache)
+        reference = parse_reference(formula)
+        if reference is None or reference.is_range:
+            logger.warning(f"Référence de cellule non supportée: {formula}")
+            return None
 
-        # Format: 'Sheet Name'!CellRef ou SheetName!CellRef
-        if "!" in formula:
-            parts = formula.split("!")
-            sheet_name = parts[0].strip("'")
-            cell_ref = parts[1].strip()
-            return self._get_cell_value(sheet_name, cell_ref)
+        if not self.cell_values.has_sheet(reference.sheet):
+            logger.warning(f"Onglet '{reference.sheet}' introuvable")
+            return None
 
-        return None
+        return self._format_value(self.cell_values.resolve(reference))
 
-    def extract_variables(self) -> Dict[str, str]:
+    def extract_variables(self, wait_for_inpi: bool = True) -> Dict[str, str]:
         """
         Extrait toutes les variables depuis le fichier Excel source.
         Utilise le fichier de configuration pour savoir quoi extraire.
 
+        Le SIRET est lu en premier et son enrichissement INPI lancé en
+        arrière-plan pendant l'extraction. Avec wait_for_inpi=False, les champs
+        INPI ne sont pas attendus: l'appelant poursuit son travail local
+        (règles, templates) puis appelle join_inpi_enrichment avant le rendu.
+
+        Args:
+            wait_for_inpi: Attendre l'enrichissement INPI et l'inclure dans le résultat
+
         Returns:
             Dictionnaire {nom_variable: valeur}
         """
-        variables = {}
-
-        # Lire la configuration depuis Rédaction LOI
-        config_sheet = self.config_workbook["Rédaction LOI"]
-        config_sheet_formulas = self.config_workbook_formulas["Rédaction LOI"]
+        if self._cached is None and self.config.instructions is None:
+            raise KeyError("Worksheet Rédaction LOI does not exist.")
 
-        # Parcourir les lignes de configuration (ligne 2 à 40+)
-        for row in range(2, max(config_sheet.max_row, config_sheet_formulas.max_row) + 1):
-            nom = config_sheet.cell(row, 1).value  # Colonne A: Nom
-            source = config_sheet.cell(row, 2).value  # Colonne B: Source
+        # Enrichissement automatique via INPI si SIRET présent (en arrière-plan)
+        self.start_inpi_enrichment()
 
-            # If source is None, try getting the formula
-            if not source:
-                source = config_sheet_formulas.cell(row, 2).value
-
-            if not nom:
-                continue
-
-            nom = str(nom).strip()
-
-            # Cas spéciaux: formules de calcul dans la config
-            if source and isinstance(source, str):
-                if source.startswith("=") and "!" in source:
-                    # C'est une référence à une cellule
-                    value = self._parse_formula(source)
+        if self._cached is not None:
+            variables = dict(self._cached["variables"])
+        else:
+            variables = {}
+            for instruction in self.config.instructions:
+                if instruction.kind == "reference":
+                    value = self._parse_formula(instruction.source)
                     if value:
-                        variables[nom] = value
-                elif "[" in source and "]" in source:
-                    # C'est une formule qui sera calculée plus tard (ex: adresse, paliers)
+                        variables[instruction.name] = value
+                elif instruction.kind == "formula":
                     # On la stocke pour traitement ultérieur
-                    variables[f"_formula_{nom}"] = source
+                    variables[f"_formula_{instruction.name}"] = instruction.source
                 else:
-                    # Texte littéral ou description
-                    variables[f"_description_{nom}"] = source
+                    variables[f"_description_{instruction.name}"] = instruction.source
+            self._store_extraction(variables)
 
         # Ajouter la date d'aujourd'hui
         variables["Date d'aujourd'hui"] = datetime.now().strftime("%d/%m/%Y")
 
-        # Enrichissement automatique via INPI si SIRET présent
-        siret = self._get_cell_value("Validation", "B25")
-        if siret:
+        if wait_for_inpi:
+            self.join_inpi_enrichment(variables)
+
+        logger.info(f"{len(variables)} variables extraites")
+        return variables
+
+    def start_inpi_enrichment(self) -> Optional[str]:
+        """
+        Lance en arrière-plan l'enrichissement INPI du SIRET de la fiche (une seule fois).
+
+        Returns:
+            SIRET détecté, ou None si la fiche n'en contient pas
+        """
+        if self._inpi_future is None:
+            siret = self._cached["siret"] if self._cached is not None else self._get_cell_value("Validation", "B25")
+            if not siret:
+                return None
             logger.info(f"SIRET détecté: {siret} - Enrichissement INPI en cours...")
-            inpi_data = self._enrich_from_inpi(siret)
+            self._siret = siret
+            self._inpi_future = self._start_enrichment(siret)
+        return self._siret
+
+    def join_inpi_enrichment(self, variables: Dict[str, str]) -> Dict[str, str]:
+        """
+        Attend l'enrichissement INPI lancé pour la fiche et fusionne ses champs.
 
-            # Fusionner les données INPI avec les variables extraites
-            variables.update(inpi_data)
+        Args:
+            variables: Variables extraites, complétées sur place
 
-            # Ajouter un flag pour savoir si l'enrichissement a réussi
-            if inpi_data.get("enrichment_status") == "success":
-                variables["_inpi_enriched"] = "true"
-                logger.info("✓ Enrichissement INPI réussi")
-            else:
-                variables["_inpi_enriched"] = "false"
-                error_msg = inpi_data.get("error_message", "Erreur inconnue")
-                variables["_inpi_error"] = error_msg
-                logger.warning(f"✗ Enrichissement INPI échoué: {error_msg}")
+        Returns:
+            Les mêmes variables (inchangées si la fiche n'a pas de SIRET)
+        """
+        if self._inpi_future is None:
+            return variables
+
+        inpi_data = self._enrichment_result(self._siret, self._inpi_future)
+
+        # Fusionner les données INPI avec les variables extraites
+        variables.update(inpi_data)
+
+        # Ajouter un flag pour savoir si l'enrichissement a réussi
+        if inpi_data.get("enrichment_status") == "success":
+            variables["_inpi_enriched"] = "true"
+            logger.info("✓ Enrichissement INPI réussi")
+        else:
+            variables["_inpi_enriched"] = "false"
+            error_msg = inpi_data.get("error_message", "Erreur inconnue")
+            variables["_inpi_error"] = error_msg
+            logger.warning(f"✗ Enrichissement INPI échoué: {error_msg}")
 
-        logger.info(f"{len(variables)} variables extraites")
         return variables
 
+    def _store_extraction(self, variables: Dict[str, str]) -> None:
+        """Enregistre l'extraction (hors date du jour et INPI) dans le cache disque."""
+        cache = get_extraction_cache()
+        if cache is None:
+            return
+        cache.set(self.cache_key, {
+            "variables": variables,
+            "siret": self._get_cell_value("Validation", "B25"),
+            "societes": self.config.societes,
+        })
+
     def extract_societe_info(self) -> Dict[str, Dict[str, str]]:
         """
         Extrait les informations des sociétés bailleures depuis la configuration.
@@ -178,25 +357,11 @@ class ExcelParser:
         Returns:
             Dictionnaire {nom_societe: {header: str, footer: str}}
         """
-        societes = {}
-
-        config_sheet = self.config_workbook["Société Bailleur"]
-
-        # Parcourir les lignes (ligne 2 = première société)
-        for row in range(2, config_sheet.max_row + 1):
-            nom_societe = config_sheet.cell(row, 1).value  # Colonne A
-            header = config_sheet.cell(row, 2).value  # Colonne B
-            footer = config_sheet.cell(row, 3).value  # Colonne C
+        societes = self._cached["societes"] if self._cached is not None else self.config.societes
+        if societes is None:
+            raise KeyError("Worksheet Société Bailleur does not exist.")
 
-            if not nom_societe:
-                continue
-
-            nom_societe = str(nom_societe).strip()
-
-            societes[nom_societe] = {
-                "header": str(header).strip() if header else nom_societe,
-                "footer": str(footer).strip() if footer else ""
-            }
+        societes = dict(societes)
 
         logger.info(f"{len(societes)} sociétés bailleures chargées")
         return societes
@@ -235,11 +400,57 @@ class ExcelParser:
 
     def _enrich_from_inpi(self, siret: str) -> Dict[str, str]:
         """
-        Enrichit les données avec l'API INPI.
+        Enrichit les données depuis le registre local, sinon avec l'API INPI.
+
+        Args:
+            siret: Numéro SIRET de l'entreprise
+
+        Returns:
+            Dictionnaire avec les données enrichies INPI
+        """
+        return self._enrichment_result(siret, self._start_enrichment(siret))
+
+    @staticmethod
+    def _start_enrichment(siret: str) -> Future:
+        """
+        Lance l'enrichissement d'un SIRET sans l'attendre.
 
         Args:
             siret: Numéro SIRET de l'entreprise
 
+        Returns:
+            Future des informations de l'entreprise (déjà résolu pour le registre local)
+        """
+        future = Future()
+
+        # Registre local (export SIRENE/RNE importé): sans réseau
+        registry = get_offline_registry()
+        if registry is not None:
+            company_info = registry.get_company_info(siret)
+            if company_info["enrichment_status"] == "success":
+                future.set_result(company_info)
+                return future
+
+        # Client INPI asynchrone: l'attente du quota ne gèle pas de thread de travail
+        inpi_client = get_async_inpi_client()
+
+        if not inpi_client:
+            error_message = "Client INPI non configuré (credentials manquants)"
+            logger.warning(error_message)
+            future.set_result({"error_message": error_message})
+            return future
+
+        return inpi_client.submit(siret)
+
+    @staticmethod
+    def _enrichment_result(siret: str, future: Future) -> Dict[str, str]:
+        """
+        Attend un enrichissement lancé par _start_enrichment.
+
+        Args:
+            siret: Numéro SIRET de l'entreprise
+            future: Future retourné par _start_enrichment
+
         Returns:
             Dictionnaire avec les données enrichies INPI
         """
@@ -256,24 +467,39 @@ class ExcelParser:
             "error_message": ""
         }
 
-        # Récupérer le client INPI
-        inpi_client = get_inpi_client()
-
-        if not inpi_client:
-            inpi_data["error_message"] = "Client INPI non configuré (credentials manquants)"
-            logger.warning(inpi_data["error_message"])
-            return inpi_data
-
         try:
-            # Interroger l'API INPI
-            company_info = inpi_client.get_company_info(siret)
-
             # Mettre à jour avec les données récupérées
-            inpi_data.update(company_info)
-
+            inpi_data.update(future.result())
             return inpi_data
 
         except Exception as e:
             inpi_data["error_message"] = f"Erreur lors de l'enrichissement INPI: {str(e)}"
             logger.error(inpi_data["error_message"], exc_info=True)
             return inpi_data
+
+
+def read_siret(excel_path: WorkbookSource) -> Optional[str]:
+    """
+    Lit uniquement le SIRET d'une fiche de décision (sans configuration LOI).
+
+    Args:
+        excel_path: Chemin, contenu binaire ou fichier ouvert de la fiche de décision
+
+    Returns:
+        SIRET formaté comme par ExcelParser, ou None
+    """
+    source = workbook_source(excel_path)
+    cache = get_extraction_cache()
+    key = extraction_key(content_sha256(source), "siret", EXTRACTOR_VERSION)
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached["siret"]
+
+    reference = parse_reference(SIRET_REFERENCE)
+    values = ReferencePlan([SIRET_REFERENCE]).fetch(source)
+    siret = ExcelParser._format_value(values.resolve(reference)) if values.has_sheet(reference.sheet) else None
+
+    if cache is not None:
+        cache.set(key, {"siret": siret})
+    return siret
@@ -0,0 +1,201 @@
+"""
+Cache disque des extractions de fiches de décision, adressé par contenu.
+
+Une extraction est identifiée par le sha256 de la fiche, celui du classeur de
+configuration et la version de l'extracteur: une même fiche rouverte (autre
+session Streamlit, redémarrage, relance d'un lot) est servie sans relire le
+classeur. Les entrées sont stockées dans une base SQLite locale (mode WAL)
+partagée par tous les processus, bornée à Config.EXTRACTION_CACHE_MAX_BYTES:
+les entrées les moins récemment utilisées sont évincées au-delà.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+# Date d'utilisation rafraîchie au plus une fois par intervalle: une lecture n'écrit presque jamais
+USED_AT_REFRESH = 300  # secondes
+
+
+@lru_cache(maxsize=256)
+def _file_sha256(path: str, mtime_ns: int, size: int) -> str:
+    """sha256 d'un fichier (mémorisé tant que sa date et sa taille ne changent pas)."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def content_sha256(source: Union[str, Path, bytes]) -> str:
+    """
+    Empreinte du contenu d'un classeur.
+
+    Args:
+        source: Chemin du fichier ou contenu binaire
+
+    Returns:
+        sha256 hexadécimal
+    """
+    if isinstance(source, (bytes, bytearray)):
+        return hashlib.sha256(source).hexdigest()
+    path = Path(source).resolve()
+    stat = path.stat()
+    return _file_sha256(str(path), stat.st_mtime_ns, stat.st_size)
+
+
+def extraction_key(*parts: Any) -> str:
+    """Clé d'une extraction à partir de ses composantes (empreintes, version...)."""
+    return ":".join(str(part) for part in parts)
+
+
+class ExtractionCache:
+    """Extractions sérialisées en JSON par clé de contenu, avec éviction LRU par taille."""
+
+    def __init__(self, path=None, max_bytes: Optional[int] = None):
+        """
+        Ouvre (ou crée) la base du cache.
+
+        Args:
+            path: Chemin du fichier SQLite (Config.EXTRACTION_CACHE_PATH par défaut)
+            max_bytes: Taille totale maximale des entrées (Config.EXTRACTION_CACHE_MAX_BYTES par défaut)
+        """
+        self.path = Path(path or Config.EXTRACTION_CACHE_PATH)
+        self.max_bytes = Config.EXTRACTION_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS extractions ("
+                " key TEXT PRIMARY KEY,"
+                " payload TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " used_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS extractions_used_at ON extractions (used_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        """Connexion propre au thread courant (sqlite3 interdit le partage entre threads)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Extraction en cache (marquée comme récemment utilisée).
+
+        La date d'utilisation n'est réécrite que si elle date de plus de
+        USED_AT_REFRESH secondes: les lectures concurrentes (workers d'un lot)
+        ne prennent pas le verrou d'écriture de la base à chaque hit.
+
+        Args:
+            key: Clé construite par extraction_key
+
+        Returns:
+            Copie de l'extraction, ou None
+        """
+        try:
+            with self._connect() as conn:
+                row = conn.execute("SELECT payload, used_at FROM extractions WHERE key = ?", (key,)).fetchone()
+                now = time.time()
+                if row is not None and now - row[1] > USED_AT_REFRESH:
+                    conn.execute("UPDATE extractions SET used_at = ? WHERE key = ?", (now, key))
+        except sqlite3.Error as e:
+            logger.warning(f"Cache d'extraction illisible: {e}")
+            row = None
+
+        with self._stats_lock:
+            if row is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return json.loads(row[0]) if row is not None else None
+
+    def set(self, key: str, payload: Dict[str, Any]) -> None:
+        """
+        Enregistre une extraction puis évince les moins récemment utilisées au-delà de max_bytes.
+
+        Args:
+            key: Clé construite par extraction_key
+            payload: Extraction sérialisable en JSON
+        """
+        try:
+            data = json.dumps(payload, ensure_ascii=False)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Extraction non mise en cache (non sérialisable): {e}")
+            return
+        size = len(data.encode("utf-8"))
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO extractions (key, payload, size, used_at) VALUES (?, ?, ?, ?)",
+                    (key, data, size, time.time())
+                )
+                # Garder les entrées les plus récentes dont la taille cumulée tient dans max_bytes
+                evicted = conn.execute(
+                    "DELETE FROM extractions WHERE key IN ("
+                    " SELECT key FROM ("
+                    "  SELECT key, SUM(size) OVER (ORDER BY used_at DESC, key) AS total FROM extractions"
+                    " ) WHERE total > ?)",
+                    (self.max_bytes,)
+                ).rowcount
+            if evicted:
+                logger.info(f"Cache d'extraction: {evicted} entrées évincées (limite {self.max_bytes} octets)")
+        except sqlite3.Error as e:
+            logger.warning(f"Écriture du cache d'extraction impossible: {e}")
+
+    def clear(self) -> None:
+        """Vide le cache et remet les compteurs à zéro."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM extractions")
+        with self._stats_lock:
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Compteurs du processus courant, nombre d'entrées et taille totale en base."""
+        entries, size = self._connect().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM extractions"
+        ).fetchone()
+        with self._stats_lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": entries, "bytes": size}
+
+
+_extraction_cache: Optional[ExtractionCache] = None
+_extraction_cache_lock = threading.Lock()
+
+
+def get_extraction_cache() -> Optional[ExtractionCache]:
+    """
+    Retourne le cache d'extraction partagé du processus (ouvert au premier appel).
+
+    Returns:
+        Cache d'extraction, ou None si la base ne peut pas être ouverte
+    """
+    global _extraction_cache
+    with _extraction_cache_lock:
+        if _extraction_cache is None:
+            try:
+                _extraction_cache = ExtractionCache()
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"Cache d'extraction désactivé ({Config.EXTRACTION_CACHE_PATH}): {e}")
+                return None
+        return _extraction_cache
@@ -0,0 +1,252 @@
+"""
+Client INPI asynchrone (asyncio), sans blocage des threads appelants.
+
+L'attente du quota INPI (limiteur partagé de rate_limiter) se fait dans la
+boucle d'événements (await), au lieu de geler le thread appelant. Les appels
+bloquants du client synchrone (session HTTP partagée, token, scraping) sont
+exécutés dans des threads (asyncio.to_thread).
+
+Chaque enrichissement a une échéance (Config.INPI_DEADLINE). Le scraping
+BeautifulSoup n'est lancé qu'en secours: échec de l'API, absence de réponse
+après Config.INPI_HEDGE_DELAY secondes, ou dirigeant manquant. La première
+réponse complète l'emporte, l'autre est abandonnée.
+
+Les appelants synchrones (Streamlit, ExcelParser) soumettent leurs
+enrichissements à une boucle d'événements dédiée du processus (submit) et
+attendent le résultat sans occuper de thread de travail pendant le quota.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import Future
+from typing import Dict, Optional, Tuple
+
+from .config import Config
+from .inpi_cache import get_inpi_cache
+from .inpi_client import COMPANY_NOT_FOUND, INPIClient, SCRAPING_AVAILABLE, get_inpi_client, inpi_deadline
+from .rate_limiter import RateLimiter, get_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+
+class _NotFound(Exception):
+    """L'API INPI a répondu sans résultat pour ce SIREN."""
+
+
+class AsyncINPIClient:
+    """Enrichissement INPI asynchrone: API puis scraping en secours, avec échéance."""
+
+    def __init__(self, client: INPIClient, limiter: Optional[RateLimiter] = None):
+        """
+        Args:
+            client: Client synchrone (session, token et scraping partagés)
+            limiter: Limiteur de débit (limiteur partagé de la machine par défaut)
+        """
+        self.client = client
+        self.limiter = limiter or get_rate_limiter()
+
+    async def get_company_info(self, siret: str, deadline: Optional[float] = None) -> Dict[str, str]:
+        """
+        Récupère les informations d'une entreprise (même contrat que INPIClient.get_company_info).
+
+        Args:
+            siret: Numéro SIRET (14 chiffres) ou SIREN (9 chiffres)
+            deadline: Délai maximal en secondes (Config.INPI_DEADLINE par défaut)
+
+        Returns:
+            Dictionnaire avec les informations de l'entreprise
+        """
+        result = INPIClient._empty_result()
+        siren = INPIClient._siren_from_siret(siret, result)
+        if siren is None:
+            return result
+
+        cache = get_inpi_cache()
+        cached = self.client._lookup_cache(cache, siren)
+        if cached is not None:
+            return cached
+
+        logger.info(f"Recherche INPI asynchrone pour SIREN: {siren}")
+        deadline = Config.INPI_DEADLINE if deadline is None else deadline
+        # Échéance transmise aux threads: ceux abandonnés par la course s'arrêtent aussi
+        with inpi_deadline(deadline):
+            result, not_found = await self._race(siren, result, deadline)
+
+        INPIClient._cache_result(cache, siren, result, not_found)
+        return result
+
+    async def _race(self, siren: str, result: Dict[str, str], deadline: float) -> Tuple[Dict[str, str], bool]:
+        """
+        Interroge l'API, puis le scraping en secours, et retient la première réponse complète.
+
+        Le scraping de data.inpi.fr n'est lancé que si l'API échoue, ne répond
+        pas dans les Config.INPI_HEDGE_DELAY secondes, ou répond sans dirigeant
+        (le scraping le complète alors). Une page n'est donc jamais récupérée
+        pour une entreprise que l'API décrit entièrement.
+
+        Args:
+            siren: Numéro SIREN (9 chiffres)
+            result: Résultat vide, complété en cas d'échec
+            deadline: Délai maximal en secondes
+
+        Returns:
+            Tuple (résultat gagnant ou result avec le message d'erreur,
+            SIREN inconnu de l'API et du scraping)
+        """
+        loop = asyncio.get_running_loop()
+        end = loop.time() + deadline
+        hedge_at = loop.time() + Config.INPI_HEDGE_DELAY
+        api = asyncio.ensure_future(self._from_api(siren, end))
+        scrape: Optional[asyncio.Future] = None
+        pending = {api}
+        partial: Optional[Dict[str, str]] = None  # Réponse de l'API sans dirigeant
+        not_found = False
+        scrape_failed = False
+
+        try:
+            while pending:
+                remaining = end - loop.time()
+                if remaining <= 0:
+                    if partial is not None:
+                        return partial, False
+                    result["error_message"] = f"Délai de l'enrichissement INPI dépassé ({deadline:g} s)"
+                    logger.warning(result["error_message"])
+                    return result, False
+
+                hedging = scrape is None and SCRAPING_AVAILABLE
+                timeout = min(remaining, max(hedge_at - loop.time(), 0)) if hedging else remaining
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                for task in done:
+                    try:
+                        answer = task.result()
+                    except _NotFound:
+                        not_found = True
+                        continue
+                    except Exception as e:
+                        logger.warning(f"Source INPI en échec pour SIREN {siren}: {e}")
+                        scrape_failed = scrape_failed or task is scrape
+                        continue
+                    if answer is None:
+                        continue
+                    if task is scrape:
+                        if partial is None:
+                            return answer, False
+                        partial["PRESIDENT DE LA SOCIETE"] = answer.get("PRESIDENT DE LA SOCIETE", "")
+                        return partial, False
+                    if answer["PRESIDENT DE LA SOCIETE"] or not SCRAPING_AVAILABLE:
+                        return answer, False
+                    partial = answer
+
+                if hedging and (api.done() or loop.time() >= hedge_at):
+                    scrape = asyncio.ensure_future(self._from_scrape(siren))
+                    pending.add(scrape)
+        finally:
+            # Les threads déjà lancés se terminent seuls (au plus tard à l'échéance)
+            api.cancel()
+            if scrape is not None:
+                scrape.cancel()
+
+        if partial is not None:
+            return partial, False
+        result["error_message"] = "Entreprise non trouvée dans la base INPI (API et scraping échoués)"
+        logger.warning(result["error_message"])
+        # Cache négatif seulement si le scraping de secours a lui aussi répondu (pas de panne)
+        return result, not_found and not scrape_failed
+
+    async def _from_api(self, siren: str, end: float) -> Optional[Dict[str, str]]:
+        """
+        Réponse complète de l'API INPI, None si l'API n'a pas répondu (_NotFound si SIREN inconnu).
+
+        Args:
+            siren: Numéro SIREN (9 chiffres)
+            end: Échéance de la course (horloge de la boucle d'événements)
+        """
+        if self.client.breaker.is_open:
+            return None
+        # Premier envoi compté ici, sans occuper de thread; les nouvelles tentatives le sont par _make_request
+        try:
+            await asyncio.wait_for(self.limiter.acquire_async(), end - asyncio.get_running_loop().time())
+        except asyncio.TimeoutError:
+            logger.info(f"Quota INPI indisponible avant l'échéance pour SIREN {siren}")
+            return None
+        response = await asyncio.to_thread(
+            self.client._make_request, "companies", {"siren[]": siren}, False, None, True
+        )
+        company_data = INPIClient._first_company(response)
+        if company_data is None:
+            return None
+        company = self.client._project_company(company_data)
+        if company is COMPANY_NOT_FOUND:
+            raise _NotFound(siren)
+        if company is None:
+            return None
+        self.client._remember(siren, company)
+
+        # Dirigeant manquant: complété par le scraping de la course, pas ici (une seule page récupérée)
+        info = await asyncio.to_thread(
+            self.client._build_company_info, siren, company, INPIClient._empty_result(), False
+        )
+        return info if info["enrichment_status"] == "success" else None
+
+    async def _from_scrape(self, siren: str) -> Optional[Dict[str, str]]:
+        """Réponse complète du scraping data.inpi.fr, None si la page est absente (exception si indisponible)."""
+        scraped_data = await asyncio.to_thread(self.client._fetch_inpi_page, siren)
+        if not scraped_data:
+            return None
+        return INPIClient._fill_from_scraping(
+            INPIClient._empty_result(), scraped_data, "Données récupérées via scraping BeautifulSoup"
+        )
+
+    def submit(self, siret: str, deadline: Optional[float] = None) -> Future:
+        """
+        Soumet un enrichissement à la boucle d'événements du processus (appelants synchrones).
+
+        Args:
+            siret: Numéro SIRET (14 chiffres) ou SIREN (9 chiffres)
+            deadline: Délai maximal en secondes (Config.INPI_DEADLINE par défaut)
+
+        Returns:
+            Future dont result() retourne le dictionnaire de get_company_info
+        """
+        return asyncio.run_coroutine_threadsafe(self.get_company_info(siret, deadline), _background_loop())
+
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_pid: Optional[int] = None
+_async_client: Optional[AsyncINPIClient] = None
+_async_lock = threading.Lock()
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    """Boucle d'événements dédiée du processus (recréée après un fork)."""
+    global _loop, _loop_pid
+    with _async_lock:
+        if _loop is None or _loop_pid != os.getpid():
+            _loop = asyncio.new_event_loop()
+            _loop_pid = os.getpid()
+            threading.Thread(target=_loop.run_forever, name="inpi-async", daemon=True).start()
+        return _loop
+
+
+def get_async_inpi_client() -> Optional[AsyncINPIClient]:
+    """
+    Récupère le client INPI asynchrone du processus (créé au premier appel).
+
+    Il s'appuie sur le client synchrone partagé et sur le limiteur de débit
+    commun à tous les processus de la machine.
+
+    Returns:
+        Instance de AsyncINPIClient ou None si credentials manquants
+    """
+    global _async_client
+    client = get_inpi_client()
+    if client is None:
+        return None
+
+    with _async_lock:
+        if _async_client is None:
+            _async_client = AsyncINPIClient(client)
+        return _async_client
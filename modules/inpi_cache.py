@@ -0,0 +1,183 @@
+"""
+Cache persistant des enrichissements INPI, partagé entre processus.
+
+Les résultats de get_company_info sont stockés par SIREN dans une base SQLite
+locale (mode WAL): toutes les sessions Streamlit et tous les workers de
+génération en lot d'une même machine en profitent. Une entrée expire après
+Config.INPI_CACHE_DURATION secondes.
+
+Les SIREN inconnus (l'API a répondu sans résultat et le scraping n'a rien
+trouvé) sont aussi mémorisés, pour Config.INPI_NEGATIVE_CACHE_DURATION
+secondes seulement: une fiche relancée ne repaie pas les timeouts de l'API et
+du scraping.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class INPICache:
+    """Résultats d'enrichissement INPI par SIREN, avec durée de validité."""
+
+    def __init__(self, path=None, ttl: Optional[float] = None, negative_ttl: Optional[float] = None):
+        """
+        Ouvre (ou crée) la base du cache.
+
+        Args:
+            path: Chemin du fichier SQLite (Config.INPI_CACHE_PATH par défaut)
+            ttl: Durée de validité en secondes (Config.INPI_CACHE_DURATION par défaut)
+            negative_ttl: Durée de validité des SIREN inconnus (Config.INPI_NEGATIVE_CACHE_DURATION par défaut)
+        """
+        self.path = Path(path or Config.INPI_CACHE_PATH)
+        self.ttl = Config.INPI_CACHE_DURATION if ttl is None else ttl
+        self.negative_ttl = Config.INPI_NEGATIVE_CACHE_DURATION if negative_ttl is None else negative_ttl
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS companies ("
+                " siren TEXT PRIMARY KEY,"
+                " payload TEXT NOT NULL,"
+                " stored_at REAL NOT NULL,"
+                " not_found INTEGER NOT NULL DEFAULT 0)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        """Connexion propre au thread courant (sqlite3 interdit le partage entre threads)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _row(self, siren: str):
+        try:
+            return self._connect().execute(
+                "SELECT payload, stored_at, not_found FROM companies WHERE siren = ?", (siren,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Cache INPI illisible: {e}")
+            return None
+
+    def get(self, siren: str) -> Optional[Dict[str, str]]:
+        """
+        Résultat en cache pour un SIREN s'il n'a pas expiré.
+
+        Args:
+            siren: Numéro SIREN (9 chiffres)
+
+        Returns:
+            Copie du résultat mis en cache (en échec pour un SIREN inconnu), ou None
+        """
+        row = self._row(siren)
+        hit = row is not None and time.time() - row[1] < (self.negative_ttl if row[2] else self.ttl)
+        with self._stats_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if not hit:
+            return None
+        logger.info(f"Cache INPI: SIREN {siren} {'inconnu' if row[2] else 'trouvé'}")
+        return json.loads(row[0])
+
+    def get_stale(self, siren: str) -> Optional[Dict[str, str]]:
+        """
+        Dernier résultat réussi connu pour un SIREN, même expiré (API indisponible).
+
+        Args:
+            siren: Numéro SIREN (9 chiffres)
+
+        Returns:
+            Copie du résultat mis en cache, ou None
+        """
+        row = self._row(siren)
+        if row is None or row[2]:
+            return None
+        return json.loads(row[0])
+
+    def set(self, siren: str, company_info: Dict[str, str], not_found: bool = False) -> None:
+        """
+        Enregistre (ou remplace) le résultat d'un SIREN.
+
+        Args:
+            siren: Numéro SIREN (9 chiffres)
+            company_info: Résultat de get_company_info
+            not_found: SIREN inconnu (conservé Config.INPI_NEGATIVE_CACHE_DURATION secondes)
+        """
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO companies (siren, payload, stored_at, not_found) "
+                    "VALUES (?, ?, ?, ?)",
+                    (siren, json.dumps(company_info, ensure_ascii=False), time.time(), int(not_found))
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Écriture du cache INPI impossible: {e}")
+
+    def purge_expired(self) -> int:
+        """
+        Supprime les entrées expirées.
+
+        Returns:
+            Nombre d'entrées supprimées
+        """
+        with self._connect() as conn:
+            now = time.time()
+            cursor = conn.execute(
+                "DELETE FROM companies WHERE stored_at <= ? OR (not_found = 1 AND stored_at <= ?)",
+                (now - self.ttl, now - self.negative_ttl)
+            )
+        return cursor.rowcount
+
+    def clear(self) -> None:
+        """Vide le cache et remet les compteurs à zéro."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM companies")
+        with self._stats_lock:
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Compteurs du processus courant et nombre d'entrées en base."""
+        size = self._connect().execute("SELECT COUNT(*) FROM companies").fetchone()[0]
+        with self._stats_lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": size}
+
+
+_inpi_cache: Optional[INPICache] = None
+_inpi_cache_lock = threading.Lock()
+
+
+def get_inpi_cache() -> Optional[INPICache]:
+    """
+    Retourne le cache INPI partagé du processus (ouvert au premier appel).
+
+    Returns:
+        Cache INPI, ou None si la base ne peut pas être ouverte
+    """
+    global _inpi_cache
+    with _inpi_cache_lock:
+        if _inpi_cache is None:
+            try:
+                _inpi_cache = INPICache()
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"Cache INPI désactivé ({Config.INPI_CACHE_PATH}): {e}")
+                return None
+        return _inpi_cache
@@ -3,17 +3,21 @@ Client pour l'API INPI (Institut National de la Propriété Industrielle).
 Permet de récupérer les informations des entreprises françaises via le RNE.
 """
 
+import contextvars
 import logging
+import random
 import requests
+import threading
 import time
 import re
-from typing import Optional, Dict
-from ratelimit import limits, sleep_and_retry
-from functools import lru_cache
+from contextlib import contextmanager
+from collections import OrderedDict
+from requests.adapters import HTTPAdapter
+from typing import Callable, Optional, Dict, List, NamedTuple, Tuple, Union
 
 try:
     import cloudscraper
-    from bs4 import BeautifulSoup
+    from bs4 import BeautifulSoup, NavigableString
     SCRAPING_AVAILABLE = True
 except ImportError:
     SCRAPING_AVAILABLE = False
@@ -21,15 +25,88 @@ except ImportError:
     logger.warning("cloudscraper ou beautifulsoup4 non installé. Le scraping des dirigeants ne sera pas disponible.")
 
 try:
-    from playwright.sync_api import sync_playwright
+    import playwright.sync_api  # noqa: F401
     PLAYWRIGHT_AVAILABLE = True
 except ImportError:
     PLAYWRIGHT_AVAILABLE = False
 
 from .config import Config, _get_secret
+from .browser_pool import get_browser_pool
+from .circuit_breaker import CircuitBreaker
+from .inpi_cache import get_inpi_cache
+from .rate_limiter import BATCH, get_rate_limiter
 
 logger = logging.getLogger(__name__)
 
+TOKEN_LIFETIME = 3600  # Durée de vie estimée du token INPI (secondes)
+TOKEN_REFRESH_MARGIN = 300  # Renouvelé 5 minutes avant expiration
+MAX_RETRIES = 3
+RETRY_BACKOFF = 1.0  # Délai de base (secondes), doublé à chaque tentative
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+PLAYWRIGHT_SELECTOR_TIMEOUT = 5000  # Attente maximale d'un élément de la page (millisecondes)
+BULK_CHUNK_SIZE = 20  # SIREN par requête groupée (taille de page demandée explicitement)
+RECORD_CACHE_SIZE = 100  # Entreprises projetées gardées en mémoire par client
+
+# Codes des formes juridiques (principaux)
+FORMES_JURIDIQUES = {
+    "5499": "SAS (Société par Actions Simplifiée)",
+    "5498": "SASU (Société par Actions Simplifiée Unipersonnelle)",
+    "5710": "SCI (Société Civile Immobilière)",
+    "5505": "SA (Société Anonyme)",
+    "5410": "SARL (Société à Responsabilité Limitée)",
+    "5720": "EURL (Entreprise Unipersonnelle à Responsabilité Limitée)"
+}
+
+# Fiche entreprise data.inpi.fr
+INPI_PAGE_LABELS = re.compile(r"Forme juridique|Capital social|Adresse du siège")
+CAPITAL_AMOUNT_PATTERN = re.compile(r'([\d\s]+)')
+ARRONDISSEMENT_PATTERN = re.compile(r" (?:1ER|[2-9]E|1[0-9]E|20E) ARRONDISSEMENT")
+
+
+class CompanyRecord(NamedTuple):
+    """Champs utiles d'une formalité INPI, extraits dès la réponse de l'API (quelques centaines d'octets)."""
+
+    denomination: str
+    forme_juridique: str  # Code INSEE (voir FORMES_JURIDIQUES)
+    adresse: str  # Adresse du siège sur une ligne
+    commune: str
+    montant_capital: Union[int, float, str, None]
+    dirigeant: Optional[str]  # Représentant légal actif (composition.pouvoirs)
+
+
+# L'API a répondu sans résultat pour ce SIREN
+COMPANY_NOT_FOUND = CompanyRecord("", "", "", "", None, None)
+
+# Échéance (time.monotonic) de l'enrichissement en cours, héritée par asyncio.to_thread
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("inpi_deadline", default=None)
+
+
+@contextmanager
+def inpi_deadline(seconds: float):
+    """
+    Borne la durée totale des appels INPI (API, scraping, attente du quota) du bloc.
+
+    Les timeouts des requêtes sont réduits au temps restant et aucune nouvelle
+    tentative n'est faite au-delà de l'échéance. Une échéance déjà active plus
+    proche est conservée.
+
+    Args:
+        seconds: Budget de latence en secondes
+    """
+    deadline = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(deadline if current is None else min(current, deadline))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def _remaining_budget() -> Optional[float]:
+    """Temps restant avant l'échéance en cours (None sans échéance)."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
 
 class INPIClient:
     """Client pour interroger l'API INPI RNE."""
@@ -47,16 +124,31 @@ class INPIClient:
         self.password = password or _get_secret('INPI_PASSWORD', '')
         self.token = None
         self._token_expiry = 0
+        self._token_lock = threading.Lock()
+        # Appels à l'API suspendus après des échecs consécutifs (scraping et cache en secours)
+        self.breaker = CircuitBreaker("API INPI")
+        # Projections récentes {siren: (instant, entreprise)}, bornées à RECORD_CACHE_SIZE
+        self._records: "OrderedDict[str, tuple]" = OrderedDict()
+        self._records_lock = threading.Lock()
+
+        # Session HTTP partagée: connexions keep-alive réutilisées (API et data.inpi.fr)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=10)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
 
         if not self.username or not self.password:
             logger.warning("Credentials INPI non configurés. L'enrichissement INPI sera désactivé.")
         else:
             logger.info("Client INPI initialisé")
 
-    def _authenticate(self) -> bool:
+    def _authenticate(self, acquire: Optional[Callable[[], None]] = None) -> bool:
         """
         Authentification auprès de l'API INPI.
 
+        Args:
+            acquire: Consommation du quota avant chaque envoi (voir _quota)
+
         Returns:
             True si l'authentification a réussi
         """
@@ -64,50 +156,150 @@ class INPIClient:
             logger.error("Credentials INPI manquants")
             return False
 
-        # Vérifier si le token est encore valide (durée de vie: 1h estimée)
-        if self.token and time.time() < self._token_expiry:
+        # Vérifier si le token est encore valide (renouvelé avant expiration)
+        if self.token and time.time() < self._token_expiry - TOKEN_REFRESH_MARGIN:
             return True
 
-        try:
-            url = f"{self.base_url}/sso/login"
-            headers = {"Content-Type": "application/json"}
-            data = {
-                "username": self.username,
-                "password": self.password
-            }
+        # Un seul thread se réauthentifie, les autres réutilisent son token
+        with self._token_lock:
+            if self.token and time.time() < self._token_expiry - TOKEN_REFRESH_MARGIN:
+                return True
 
-            logger.info("Authentification INPI en cours...")
-            response = requests.post(url, json=data, headers=headers, timeout=10)
+            try:
+                url = f"{self.base_url}/sso/login"
+                headers = {"Content-Type": "application/json"}
+                data = {
+                    "username": self.username,
+                    "password": self.password
+                }
 
-            if response.status_code == 200:
-                self.token = response.json().get("token")
-                # Token valide pendant 1 heure (3600 secondes)
-                self._token_expiry = time.time() + 3600
-                logger.info("Authentification INPI réussie")
-                return True
-            else:
-                logger.error(f"Échec authentification INPI: {response.status_code} - {response.text}")
+                logger.info("Authentification INPI en cours...")
+                response = self._send("POST", url, acquire, json=data, headers=headers, timeout=10)
+
+                if response.status_code == 200:
+                    self.token = response.json().get("token")
+                    self._token_expiry = time.time() + TOKEN_LIFETIME
+                    logger.info("Authentification INPI réussie")
+                    return True
+                else:
+                    logger.error(f"Échec authentification INPI: {response.status_code} - {response.text}")
+                    return False
+
+            except Exception as e:
+                logger.error(f"Erreur lors de l'authentification INPI: {e}")
                 return False
 
-        except Exception as e:
-            logger.error(f"Erreur lors de l'authentification INPI: {e}")
-            return False
+    def _invalidate_token(self) -> None:
+        """Oublie le token (refusé par l'API avant son expiration estimée)."""
+        with self._token_lock:
+            self.token = None
+            self._token_expiry = 0
 
-    @sleep_and_retry
-    @limits(calls=Config.INPI_RATE_LIMIT, period=60)
-    def _make_request(self, endpoint: str, params: dict = None, use_json: bool = False) -> Optional[dict]:
+    def _quota(self, lane: Optional[str] = None, prepaid: bool = False) -> Callable[[], None]:
         """
-        Effectue une requête à l'API INPI avec rate limiting.
+        Consommation du quota INPI partagé, appelée avant chaque envoi à l'API.
+
+        Toutes les tentatives comptent (nouvelles tentatives 429/5xx, requête
+        renvoyée après réauthentification, obtention du token).
+
+        Args:
+            lane: File de priorité du limiteur (file par défaut du processus sinon)
+            prepaid: Le premier envoi a déjà été compté par l'appelant (attente asynchrone)
+
+        Returns:
+            Fonction levant requests.exceptions.Timeout si le quota n'est pas disponible avant l'échéance
+        """
+        pending_prepaid = [prepaid]
+
+        def acquire() -> None:
+            if pending_prepaid[0]:
+                pending_prepaid[0] = False
+                return
+            if not get_rate_limiter().acquire(lane, timeout=_remaining_budget()):
+                raise requests.exceptions.Timeout("Quota INPI non disponible avant l'échéance")
+
+        return acquire
+
+    def _send(self, method: str, url: str, acquire: Optional[Callable[[], None]] = None,
+              **kwargs) -> requests.Response:
+        """
+        Envoie une requête via la session partagée, avec nouvelles tentatives.
+
+        Les réponses 429/5xx et les erreurs de connexion sont retentées jusqu'à
+        MAX_RETRIES fois, avec un délai exponentiel aléatoirement étalé (ou le
+        Retry-After de la réponse), dans la limite de l'échéance en cours
+        (inpi_deadline).
+
+        Args:
+            method: Méthode HTTP
+            url: URL complète
+            acquire: Consommation du quota avant chaque tentative (requêtes à l'API, voir _quota)
+            **kwargs: Arguments de requests (params, json, headers, timeout...)
+
+        Returns:
+            Dernière réponse reçue
+        """
+        for attempt in range(MAX_RETRIES + 1):
+            remaining = _remaining_budget()
+            if remaining is not None:
+                if remaining <= 0:
+                    raise requests.exceptions.Timeout(f"Budget de latence INPI épuisé ({method} {url})")
+                kwargs["timeout"] = min(kwargs.get("timeout") or remaining, remaining)
+            if acquire is not None:
+                acquire()
+
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if attempt == MAX_RETRIES:
+                    raise
+                response = None
+
+            if response is not None and (response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES):
+                return response
+
+            delay = RETRY_BACKOFF * (2 ** attempt)
+            retry_after = response.headers.get("Retry-After") if response is not None else None
+            if retry_after and retry_after.isdigit():
+                delay = max(delay, float(retry_after))
+            delay *= random.uniform(0.5, 1.5)
+
+            remaining = _remaining_budget()
+            if remaining is not None and delay >= remaining:
+                if response is not None:
+                    return response
+                raise requests.exceptions.Timeout(f"Budget de latence INPI épuisé ({method} {url})")
+
+            status = response.status_code if response is not None else "erreur réseau"
+            logger.warning(f"INPI {method} {url}: {status}, nouvelle tentative dans {delay:.1f} s")
+            time.sleep(delay)
+
+    def _make_request(self, endpoint: str, params: dict = None, use_json: bool = False,
+                      lane: Optional[str] = None, prepaid: bool = False) -> Optional[dict]:
+        """
+        Effectue une requête à l'API INPI avec rate limiting (quota partagé par tous les processus).
+
+        Chaque envoi (nouvelles tentatives et token compris) consomme un appel du
+        quota. Le résultat alimente le disjoncteur de l'API: circuit ouvert, la
+        requête n'est pas envoyée (et ne consomme pas de quota).
 
         Args:
             endpoint: Endpoint de l'API (ex: "companies")
             params: Paramètres de la requête
             use_json: Si True, envoie les params en JSON body (POST)
+            lane: File de priorité du limiteur (file par défaut du processus sinon)
+            prepaid: Le premier envoi a déjà été compté par l'appelant
 
         Returns:
-            Réponse JSON ou None en cas d'erreur
+            Réponse JSON ([] si 404), ou None si l'API n'a pas pu répondre
         """
-        if not self._authenticate():
+        if not self.breaker.allow():
+            logger.info("API INPI ignorée (circuit ouvert)")
+            return None
+
+        acquire = self._quota(lane, prepaid)
+        if not self._authenticate(acquire):
+            self.breaker.record_failure()
             return None
 
         try:
@@ -120,56 +312,212 @@ class INPIClient:
             logger.debug(f"Requête INPI: {endpoint} avec params: {params}")
 
             if use_json:
-                response = requests.post(url, headers=headers, json=params, timeout=10)
+                response = self._send("POST", url, acquire, headers=headers, json=params, timeout=10)
             else:
-                response = requests.get(url, headers=headers, params=params, timeout=10)
+                response = self._send("GET", url, acquire, headers=headers, params=params, timeout=10)
+
+            if response.status_code == 401:
+                # Token expiré côté INPI: réauthentification puis une seule nouvelle tentative
+                self._invalidate_token()
+                if not self._authenticate(acquire):
+                    self.breaker.record_failure()
+                    return None
+                headers["Authorization"] = f"Bearer {self.token}"
+                method = "POST" if use_json else "GET"
+                payload = {"json": params} if use_json else {"params": params}
+                response = self._send(method, url, acquire, headers=headers, timeout=10, **payload)
 
             if response.status_code == 200:
                 result = response.json()
+                self.breaker.record_success()
                 logger.debug(f"Réponse INPI (200): {result}")
                 return result
             elif response.status_code == 429:
+                self.breaker.record_failure()
                 logger.warning("Rate limit INPI atteint")
                 return None
             elif response.status_code == 404:
+                self.breaker.record_success()
                 logger.warning(f"Entreprise non trouvée (404)")
-                return None
+                return []
             else:
+                if response.status_code >= 500:
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_success()
                 logger.error(f"Erreur API INPI: {response.status_code} - {response.text}")
                 return None
 
         except requests.exceptions.Timeout:
+            self.breaker.record_failure()
             logger.error("Timeout lors de la requête INPI")
             return None
         except Exception as e:
+            self.breaker.record_failure()
             logger.error(f"Erreur lors de la requête INPI: {e}")
             return None
 
-    @lru_cache(maxsize=100)
-    def _search_by_siren(self, siren: str) -> Optional[dict]:
+    def _search_by_siren(self, siren: str) -> Optional[CompanyRecord]:
+        """
+        Recherche une entreprise par numéro SIREN (avec cache en mémoire des entreprises trouvées).
+
+        Args:
+            siren: Numéro SIREN (9 chiffres)
+
+        Returns:
+            Entreprise projetée, COMPANY_NOT_FOUND si l'API ne la connaît pas, None si l'API n'a pas répondu
+        """
+        with self._records_lock:
+            entry = self._records.get(siren)
+            if entry is not None and time.monotonic() - entry[0] < Config.INPI_CACHE_DURATION:
+                self._records.move_to_end(siren)
+                return entry[1]
+
+        company = self._fetch_company(siren)
+        if company is None:
+            return None
+        record = self._project_company(company)
+        if record is not None and record is not COMPANY_NOT_FOUND:
+            self._remember(siren, record)
+        return record
+
+    def _fetch_company(self, siren: str) -> Optional[dict]:
         """
-        Recherche une entreprise par numéro SIREN (avec cache).
+        Entrée brute de l'API /companies pour un SIREN (sans cache).
 
         Args:
             siren: Numéro SIREN (9 chiffres)
 
         Returns:
-            Informations de l'entreprise ou None
+            Formalité complète, {} si l'API ne connaît pas le SIREN, None si l'API n'a pas répondu
         """
         # L'API INPI attend un array de SIRENs en paramètre GET
         # Utiliser la notation siren[] pour passer un array
-        params = {f"siren[]": siren}
-        result = self._make_request("companies", params=params)
-
+        params = {"siren[]": siren}
+        return self._first_company(self._make_request("companies", params=params))
+
+    def _remember(self, siren: str, record: CompanyRecord) -> None:
+        """Garde une entreprise projetée en mémoire (les plus anciennes sont évincées)."""
+        with self._records_lock:
+            self._records[siren] = (time.monotonic(), record)
+            self._records.move_to_end(siren)
+            while len(self._records) > RECORD_CACHE_SIZE:
+                self._records.popitem(last=False)
+
+    @staticmethod
+    def _first_company(result) -> Optional[dict]:
+        """Première entreprise d'une réponse de /companies ({} si aucune, None sans réponse)."""
         if result and isinstance(result, list) and len(result) > 0:
             # L'API retourne un array de résultats
             return result[0]
         elif result and isinstance(result, dict):
             # Cas où l'API retournerait un objet unique
             return result
+        elif isinstance(result, (list, dict)):
+            return {}
 
         return None
 
+    def _search_by_sirens(self, sirens: List[str]) -> Optional[Dict[str, CompanyRecord]]:
+        """
+        Recherche plusieurs entreprises en une requête (paramètre siren[] multiple).
+
+        Args:
+            sirens: Numéros SIREN (au plus BULK_CHUNK_SIZE)
+
+        Returns:
+            Dictionnaire {siren: entreprise projetée} des entreprises trouvées, None si l'API n'a pas répondu
+        """
+        # Taille de page explicite: une réponse paginée perdrait les SIREN au-delà de la première page
+        params = {"siren[]": list(sirens), "pageSize": BULK_CHUNK_SIZE}
+        result = self._make_request("companies", params=params, lane=BATCH)
+
+        if isinstance(result, dict):
+            result = [result]
+        if not isinstance(result, list):
+            return None
+
+        found = {}
+        for company in result:
+            if not isinstance(company, dict):
+                continue
+            siren = company.get("siren") or company.get("formality", {}).get("siren")
+            if siren in sirens:
+                record = self._project_company(company)
+                if record is not None and record is not COMPANY_NOT_FOUND:
+                    self._remember(siren, record)
+                    found[siren] = record
+        return found
+
+    def _project_company(self, company_data: dict) -> Optional[CompanyRecord]:
+        """
+        Extrait d'une formalité de l'API les seuls champs utiles à l'enrichissement.
+
+        La réponse complète (composition, établissements, historique) n'est
+        conservée nulle part: seule la projection est mise en cache.
+
+        Args:
+            company_data: Entrée de l'API /companies ({} si l'API ne connaît pas le SIREN)
+
+        Returns:
+            Entreprise projetée, COMPANY_NOT_FOUND pour {}, None si la formalité est illisible
+        """
+        if not company_data:
+            return COMPANY_NOT_FOUND
+
+        try:
+            # Extraction des données selon la structure de l'API INPI
+            # Structure: formality.content.personneMorale
+            formality = company_data.get("formality", {})
+            content = formality.get("content", {})
+
+            # Chercher les données de personne morale ou physique
+            personne_morale = content.get("personneMorale", {})
+            nature_creation = content.get("natureCreation", {})
+
+            # Nom de la société - chercher dans plusieurs endroits
+            etab_principal = personne_morale.get("etablissementPrincipal", {})
+            desc_etab = etab_principal.get("descriptionEtablissement", {})
+
+            # Chercher aussi dans identite.entreprise
+            identite = personne_morale.get("identite", {})
+            entreprise = identite.get("entreprise", {})
+
+            denomination = (
+                desc_etab.get("nomCommercial") or
+                desc_etab.get("enseigne") or
+                personne_morale.get("denomination") or
+                entreprise.get("denomination") or
+                ""
+            )
+
+            # Adresse de domiciliation (siège social)
+            adresse_entreprise = personne_morale.get("adresseEntreprise", {})
+            adresse = adresse_entreprise.get("adresse", {})
+            parts = []
+            commune = ""
+            if isinstance(adresse, dict):
+                for key in ("numVoie", "indiceRepetition", "typeVoie", "voie", "codePostal", "commune"):
+                    if adresse.get(key):
+                        parts.append(str(adresse[key]))
+                commune = adresse.get("commune", "") or ""
+
+            # Capital social - chercher dans personneMorale.identite.description
+            description = identite.get("description", {})
+
+            return CompanyRecord(
+                denomination=denomination,
+                forme_juridique=nature_creation.get("formeJuridique", "") or "",
+                adresse=" ".join(parts),
+                commune=commune,
+                montant_capital=description.get("montantCapital"),
+                dirigeant=self._extract_dirigeant_from_api(personne_morale),
+            )
+
+        except Exception as e:
+            logger.error(f"Formalité INPI illisible: {str(e)}", exc_info=True)
+            return None
+
     def _extract_dirigeant_from_api(self, personne_morale: dict) -> Optional[str]:
         """
         Extrait le nom du dirigeant depuis les données INPI (composition.pouvoirs).
@@ -240,159 +588,217 @@ class INPIClient:
         Returns:
             Dict avec toutes les informations ou None
         """
+        try:
+            result = self._fetch_inpi_page(siren)
+            return result if result else None
+
+        except Exception as e:
+            logger.error(f"Erreur scraping BeautifulSoup: {str(e)}")
+            return None
+
+    def _fetch_inpi_page(self, siren: str) -> Dict[str, str]:
+        """
+        Champs de la fiche data.inpi.fr d'un SIREN, en distinguant absence et panne.
+
+        Args:
+            siren: Numéro SIREN (9 chiffres)
+
+        Returns:
+            Champs trouvés ({} si la page n'existe pas, est vide ou si le scraping n'est pas disponible)
+
+        Raises:
+            requests.exceptions.RequestException: Page indisponible (erreur réseau, timeout, 5xx...)
+        """
         if not SCRAPING_AVAILABLE:
             logger.warning("BeautifulSoup non disponible")
-            return None
+            return {}
 
         url = f"https://data.inpi.fr/entreprises/{siren}"
+        logger.info(f"Scraping BeautifulSoup complet pour SIREN {siren}")
 
-        try:
-            logger.info(f"Scraping BeautifulSoup complet pour SIREN {siren}")
+        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+        response = self._send("GET", url, headers=headers, timeout=30)
 
-            headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-            response = requests.get(url, headers=headers, timeout=30)
+        if response.status_code == 404:
+            return {}
+        if response.status_code != 200:
+            raise requests.exceptions.HTTPError(f"data.inpi.fr: {response.status_code}", response=response)
 
-            if response.status_code != 200:
-                return None
+        result = self._parse_inpi_page(response.content)
+        logger.info(f"Scraping BeautifulSoup réussi: {len(result)} champs")
+        return result
 
-            soup = BeautifulSoup(response.content, 'html.parser')
-            result = {}
-
-            # 1. NOM
-            h1 = soup.find('h1')
-            if h1:
-                nom = h1.get_text().strip()
-                if " - SIREN" in nom:
-                    nom = nom.split(" - SIREN")[0]
-                if nom.startswith("Entreprise : "):
-                    nom = nom.replace("Entreprise : ", "")
-                result["NOM DE LA SOCIETE"] = nom.strip()
-
-            # 2. TYPE - Chercher "Forme juridique" et son sibling
-            forme_elements = soup.find_all(string=lambda s: s and 'Forme juridique' in s)
-            if forme_elements:
-                parent = forme_elements[0].parent
-                sibling = parent.find_next_sibling()
-                if sibling:
-                    result["TYPE DE SOCIETE"] = sibling.get_text(strip=True)
-
-            # 3. CAPITAL - Formater comme "145 131 987 €"
-            capital_elements = soup.find_all(string=lambda s: s and 'Capital social' in s)
-            if capital_elements:
-                parent = capital_elements[0].parent
-                sibling = parent.find_next_sibling()
-                if sibling:
-                    capital_text = sibling.get_text(strip=True)
-                    # Extraire le montant (ex: "145131987 EUR" ou "145131987  EUR")
-                    import re
-                    match = re.search(r'([\d\s]+)', capital_text)
-                    if match:
-                        # Enlever tous les espaces existants
-                        montant = match.group(1).replace(' ', '').replace('\xa0', '')
-                        # Formater avec espaces tous les 3 chiffres
-                        montant_formate = '{:,}'.format(int(montant)).replace(',', ' ')
-                        result["CAPITAL SOCIAL"] = f"{montant_formate} €"
-                    else:
-                        # Fallback si le format est inattendu
-                        result["CAPITAL SOCIAL"] = capital_text.replace('EUR', '€').strip()
-
-            # 4. ADRESSE
-            adresse_elements = soup.find_all(string=lambda s: s and 'Adresse du siège' in s)
-            if adresse_elements:
-                parent = adresse_elements[0].parent
-                sibling = parent.find_next_sibling()
-                if sibling:
-                    adresse = sibling.get_text(strip=True)
-                    result["ADRESSE DE DOMICILIATION"] = adresse
-
-                    # 5. LOCALITE RCS
-                    parts = adresse.split()
-                    for i, part in enumerate(parts):
-                        if part.isdigit() and len(part) == 5:
-                            if i + 1 < len(parts):
-                                ville = ' '.join(parts[i+1:])
-                                ville = ville.replace(" 1ER ARRONDISSEMENT", "").replace(" 2E ARRONDISSEMENT", "")
-                                for j in range(3, 21):
-                                    ville = ville.replace(f" {j}E ARRONDISSEMENT", "")
-                                result["LOCALITE RCS"] = ville.replace(" FRANCE", "").strip()
-                                break
+    @staticmethod
+    def _format_capital(capital_text: str) -> str:
+        """
+        Formate un capital lu sur data.inpi.fr comme "145 131 987 €".
 
-            # 6. DIRIGEANT - avec filtrage pour ignorer les commissaires aux comptes
-            gestion_h3 = soup.find('h3', id='representants')
-            if gestion_h3:
-                section_row = gestion_h3.find_parent('div', class_='row')
-                if section_row:
-                    blocs = section_row.find_all('div', class_='bloc-dirigeant')
-                    if blocs:
-                        # Regrouper les blocs par personne (chaque groupe commence par Nom ou Dénomination)
-                        dirigeants = []
-                        current_dirigeant = {}
-
-                        for bloc in blocs:
-                            paras = bloc.find_all('p')
-                            if len(paras) >= 2:
-                                label = paras[0].get_text().strip()
-                                value = paras[1].get_text().strip()
-
-                                # Nouveau dirigeant si on voit Nom ou Dénomination
-                                if label in ['Nom, Prénom(s)', 'Dénomination']:
-                                    if current_dirigeant:  # Sauver le précédent
-                                        dirigeants.append(current_dirigeant)
-                                    current_dirigeant = {}
-
-                                current_dirigeant[label] = value
-
-                        # Ajouter le dernier
-                        if current_dirigeant:
-                            dirigeants.append(current_dirigeant)
-
-                        # Filtrer pour trouver le vrai dirigeant (pas les commissaires)
-                        qualites_dirigeant = [
-                            'Gérant',
-                            'Président',
-                            'Directeur général',
-                            'Président du conseil d\'administration',
-                            'Président du conseil de surveillance'
-                        ]
-
-                        dirigeant = None
-                        for d in dirigeants:
-                            qualite = d.get('Qualité', '')
-
-                            # Ignorer les commissaires aux comptes
-                            if 'Commissaire' in qualite:
-                                continue
-
-                            # Vérifier si c'est un vrai dirigeant
-                            is_dirigeant = any(q.lower() in qualite.lower() for q in qualites_dirigeant)
-
-                            if is_dirigeant:
-                                # Extraire le nom
-                                if 'Dénomination' in d:
-                                    dirigeant = d['Dénomination']
-                                elif 'Nom, Prénom(s)' in d:
-                                    nom_prenom = d['Nom, Prénom(s)']
-                                    # Nettoyer les espaces multiples et sauts de ligne
-                                    parts = [p.strip() for p in nom_prenom.split() if p.strip()]
-                                    if len(parts) >= 2:
-                                        # Premier mot = Nom, reste = Prénom(s)
-                                        nom = parts[0].capitalize() if parts[0].isupper() else parts[0]
-                                        prenom = ' '.join(parts[1:])
-                                        prenom = prenom.capitalize() if prenom.isupper() else prenom
-                                        dirigeant = f"{prenom} {nom}"
-                                    elif len(parts) == 1:
-                                        dirigeant = parts[0].capitalize() if parts[0].isupper() else parts[0]
-
-                                if dirigeant:
-                                    result["PRESIDENT DE LA SOCIETE"] = dirigeant
-                                    break
-
-            logger.info(f"Scraping BeautifulSoup réussi: {len(result)} champs")
-            return result if result else None
+        Args:
+            capital_text: Texte de la page (ex: "145131987 EUR")
 
-        except Exception as e:
-            logger.error(f"Erreur scraping BeautifulSoup: {str(e)}")
-            return None
+        Returns:
+            Montant formaté, ou le texte d'origine (EUR remplacé par €) si le format est inattendu
+        """
+        match = CAPITAL_AMOUNT_PATTERN.search(capital_text)
+        # Enlever tous les espaces existants puis grouper par 3 chiffres
+        montant = match.group(1).replace(' ', '').replace('\xa0', '') if match else ""
+        if not montant.isdigit():
+            return capital_text.replace('EUR', '€').strip()
+        return '{:,}'.format(int(montant)).replace(',', ' ') + " €"
+
+    @staticmethod
+    def _localite_from_adresse(adresse: str) -> Optional[str]:
+        """
+        Ville du greffe: ce qui suit le code postal de l'adresse, sans arrondissement ni pays.
+
+        Args:
+            adresse: Adresse du siège (ex: "17 RUE DE L'ECHIQUIER 75010 PARIS 10E ARRONDISSEMENT")
+
+        Returns:
+            Localité, ou None si l'adresse n'a pas de code postal suivi d'une ville
+        """
+        parts = adresse.split()
+        for i, part in enumerate(parts[:-1]):
+            if part.isdigit() and len(part) == 5:
+                ville = ARRONDISSEMENT_PATTERN.sub("", ' '.join(parts[i + 1:]))
+                return ville.replace(" FRANCE", "").strip()
+        return None
+
+    @staticmethod
+    def _parse_inpi_page(content) -> Dict[str, str]:
+        """
+        Extrait les champs d'une fiche entreprise data.inpi.fr.
+
+        La page est parsée avec lxml puis parcourue une seule fois pour indexer
+        le titre, la section des représentants et le premier texte de chaque
+        libellé (INPI_PAGE_LABELS); tous les champs sont lus depuis cet index.
+
+        Args:
+            content: HTML de la page (bytes ou str)
+
+        Returns:
+            Dict des champs trouvés (éventuellement vide)
+        """
+        soup = BeautifulSoup(content, 'lxml')
+        result = {}
+
+        h1 = None
+        gestion_h3 = None
+        labels = {}
+        for node in soup.descendants:
+            if isinstance(node, NavigableString):
+                for label in INPI_PAGE_LABELS.findall(node):
+                    labels.setdefault(label, node)
+            elif node.name == 'h1':
+                h1 = h1 or node
+            elif node.name == 'h3' and gestion_h3 is None and node.get('id') == 'representants':
+                gestion_h3 = node
+
+        def label_value(label: str):
+            """Élément suivant celui qui porte le libellé."""
+            string = labels.get(label)
+            return string.parent.find_next_sibling() if string is not None else None
+
+        # 1. NOM
+        if h1:
+            nom = h1.get_text().strip()
+            if " - SIREN" in nom:
+                nom = nom.split(" - SIREN")[0]
+            if nom.startswith("Entreprise : "):
+                nom = nom.replace("Entreprise : ", "")
+            result["NOM DE LA SOCIETE"] = nom.strip()
+
+        # 2. TYPE - valeur suivant "Forme juridique"
+        sibling = label_value('Forme juridique')
+        if sibling:
+            result["TYPE DE SOCIETE"] = sibling.get_text(strip=True)
+
+        # 3. CAPITAL - Formater comme "145 131 987 €"
+        sibling = label_value('Capital social')
+        if sibling:
+            result["CAPITAL SOCIAL"] = INPIClient._format_capital(sibling.get_text(strip=True))
+
+        # 4. ADRESSE
+        sibling = label_value('Adresse du siège')
+        if sibling:
+            adresse = sibling.get_text(strip=True)
+            result["ADRESSE DE DOMICILIATION"] = adresse
+
+            # 5. LOCALITE RCS
+            localite = INPIClient._localite_from_adresse(adresse)
+            if localite is not None:
+                result["LOCALITE RCS"] = localite
+
+        # 6. DIRIGEANT - avec filtrage pour ignorer les commissaires aux comptes
+        if gestion_h3:
+            section_row = gestion_h3.find_parent('div', class_='row')
+            if section_row:
+                blocs = section_row.find_all('div', class_='bloc-dirigeant')
+                if blocs:
+                    # Regrouper les blocs par personne (chaque groupe commence par Nom ou Dénomination)
+                    dirigeants = []
+                    current_dirigeant = {}
+
+                    for bloc in blocs:
+                        paras = bloc.find_all('p')
+                        if len(paras) >= 2:
+                            label = paras[0].get_text().strip()
+                            value = paras[1].get_text().strip()
+
+                            # Nouveau dirigeant si on voit Nom ou Dénomination
+                            if label in ['Nom, Prénom(s)', 'Dénomination']:
+                                if current_dirigeant:  # Sauver le précédent
+                                    dirigeants.append(current_dirigeant)
+                                current_dirigeant = {}
+
+                            current_dirigeant[label] = value
+
+                    # Ajouter le dernier
+                    if current_dirigeant:
+                        dirigeants.append(current_dirigeant)
+
+                    # Filtrer pour trouver le vrai dirigeant (pas les commissaires)
+                    qualites_dirigeant = [
+                        'Gérant',
+                        'Président',
+                        'Directeur général',
+                        'Président du conseil d\'administration',
+                        'Président du conseil de surveillance'
+                    ]
+
+                    dirigeant = None
+                    for d in dirigeants:
+                        qualite = d.get('Qualité', '')
+
+                        # Ignorer les commissaires aux comptes
+                        if 'Commissaire' in qualite:
+                            continue
+
+                        # Vérifier si c'est un vrai dirigeant
+                        is_dirigeant = any(q.lower() in qualite.lower() for q in qualites_dirigeant)
+
+                        if is_dirigeant:
+                            # Extraire le nom
+                            if 'Dénomination' in d:
+                                dirigeant = d['Dénomination']
+                            elif 'Nom, Prénom(s)' in d:
+                                nom_prenom = d['Nom, Prénom(s)']
+                                # Nettoyer les espaces multiples et sauts de ligne
+                                parts = [p.strip() for p in nom_prenom.split() if p.strip()]
+                                if len(parts) >= 2:
+                                    # Premier mot = Nom, reste = Prénom(s)
+                                    nom = parts[0].capitalize() if parts[0].isupper() else parts[0]
+                                    prenom = ' '.join(parts[1:])
+                                    prenom = prenom.capitalize() if prenom.isupper() else prenom
+                                    dirigeant = f"{prenom} {nom}"
+                                elif len(parts) == 1:
+                                    dirigeant = parts[0].capitalize() if parts[0].isupper() else parts[0]
+
+                            if dirigeant:
+                                result["PRESIDENT DE LA SOCIETE"] = dirigeant
+                                break
+
+        return result
 
     def _scrape_inpi_dirigeant(self, siren: str) -> Optional[str]:
         """Wrapper pour compatibilité - retourne seulement le dirigeant."""
@@ -405,7 +811,8 @@ class INPIClient:
 
         Note: Cette méthode utilise Playwright pour récupérer les informations complètes
         qui sont chargées dynamiquement via JavaScript sur data.inpi.fr.
-        Utilisé uniquement pour un usage légitime et limité.
+        Utilisé uniquement pour un usage légitime et limité. La page est ouverte
+        dans un navigateur chaud du pool partagé (browser_pool).
 
         Args:
             siren: Numéro SIREN (9 chiffres)
@@ -413,14 +820,7 @@ class INPIClient:
         Returns:
             Dict avec toutes les informations trouvées ou None si erreur
         """
-        # Vérifier dynamiquement si Playwright est disponible
-        try:
-            from playwright.sync_api import sync_playwright
-            playwright_available = True
-        except ImportError:
-            playwright_available = False
-
-        if not playwright_available:
+        if not PLAYWRIGHT_AVAILABLE:
             logger.warning("Playwright non disponible - impossible de scraper les données complètes")
             logger.warning("Installez avec: pip install playwright && playwright install chromium")
             return None
@@ -430,154 +830,148 @@ class INPIClient:
         try:
             logger.info(f"Tentative de scraping INPI complet avec Playwright pour SIREN {siren}")
 
-            result = {}
+            result = get_browser_pool().run(self._read_inpi_page, url)
 
-            with sync_playwright() as p:
-                # Lancer le navigateur en mode headless
-                browser = p.chromium.launch(headless=True)
-                page = browser.new_page()
+            logger.info(f"Scraping Playwright réussi: {len(result)} champs récupérés")
+            return result if result else None
 
-                # Aller sur la page avec timeout plus long et stratégie de chargement moins stricte
-                logger.debug(f"Navigation vers {url}")
-                try:
-                    # Utiliser "domcontentloaded" au lieu de "networkidle" pour être moins strict
-                    page.goto(url, wait_until="domcontentloaded", timeout=60000)
-                except Exception as e:
-                    logger.warning(f"Timeout lors du chargement complet, mais continuons: {e}")
+        except Exception as e:
+            logger.error(f"Erreur lors du scraping Playwright INPI pour SIREN {siren}: {str(e)}")
+            return None
 
-                # Attendre que le contenu soit chargé
-                page.wait_for_timeout(3000)  # 3 secondes pour que le JS s'exécute
+    @staticmethod
+    def _read_inpi_page(page, url: str) -> Dict[str, str]:
+        """
+        Charge une fiche entreprise data.inpi.fr dans la page et en extrait les champs.
 
-                # 1. NOM DE LA SOCIETE - H1
-                try:
-                    h1_element = page.locator('h1').first
-                    if h1_element:
-                        nom_societe = h1_element.text_content().strip()
-                        # Nettoyer "Entreprise : NAME - SIREN XXX" → "NAME"
-                        if " - SIREN" in nom_societe:
-                            nom_societe = nom_societe.split(" - SIREN")[0]
-                        if nom_societe.startswith("Entreprise : "):
-                            nom_societe = nom_societe.replace("Entreprise : ", "")
-                        result["NOM DE LA SOCIETE"] = nom_societe.strip()
-                        logger.debug(f"Nom société trouvé: {result['NOM DE LA SOCIETE']}")
-                except Exception as e:
-                    logger.debug(f"Impossible d'extraire le nom: {e}")
+        Args:
+            page: Page Playwright fournie par le pool de navigateurs
+            url: URL de la fiche entreprise
 
-                # 2. TYPE DE SOCIETE - Chercher "Forme juridique"
-                try:
-                    # Chercher le texte contenant "Forme juridique"
-                    forme_element = page.locator('text=/Forme juridique/').first
-                    if forme_element:
-                        # Le sibling suivant contient la valeur
-                        sibling = forme_element.locator('xpath=following-sibling::*[1]')
-                        forme = sibling.text_content().strip()
-                        result["TYPE DE SOCIETE"] = forme
-                        logger.debug(f"Type société trouvé: {forme}")
-                except Exception as e:
-                    logger.debug(f"Impossible d'extraire le type: {e}")
+        Returns:
+            Dict des champs trouvés (éventuellement vide)
+        """
+        result = {}
 
-                # 3. CAPITAL SOCIAL - Formater comme "145 131 987 €"
-                try:
-                    capital_element = page.locator('text=/Capital/').first
-                    if capital_element:
-                        # Le sibling suivant contient la valeur
-                        sibling = capital_element.locator('xpath=following-sibling::*[1]')
-                        capital = sibling.text_content().strip()
-
-                        # Formater le capital
-                        import re
-                        match = re.search(r'([\d\s]+)', capital)
-                        if match:
-                            montant = match.group(1).replace(' ', '').replace('\xa0', '')
-                            montant_formate = '{:,}'.format(int(montant)).replace(',', ' ')
-                            result["CAPITAL SOCIAL"] = f"{montant_formate} €"
-                        else:
-                            result["CAPITAL SOCIAL"] = capital.replace('EUR', '€').strip()
+        # Aller sur la page avec timeout plus long et stratégie de chargement moins stricte
+        logger.debug(f"Navigation vers {url}")
+        try:
+            # Utiliser "domcontentloaded" au lieu de "networkidle" pour être moins strict
+            page.goto(url, wait_until="domcontentloaded", timeout=60000)
+        except Exception as e:
+            logger.warning(f"Timeout lors du chargement complet, mais continuons: {e}")
 
-                        logger.debug(f"Capital trouvé: {result['CAPITAL SOCIAL']}")
-                except Exception as e:
-                    logger.debug(f"Impossible d'extraire le capital: {e}")
+        # Attendre que le contenu soit rendu par le JS (au lieu d'un délai fixe)
+        try:
+            page.wait_for_selector('h1', timeout=PLAYWRIGHT_SELECTOR_TIMEOUT)
+            page.wait_for_selector('text=/Forme juridique|Capital|Adresse du siège/',
+                                   timeout=PLAYWRIGHT_SELECTOR_TIMEOUT)
+        except Exception as e:
+            logger.debug(f"Contenu de la page incomplet, extraction de ce qui est disponible: {e}")
 
-                # 4. ADRESSE DE DOMICILIATION
-                try:
-                    # Chercher "Adresse du siège"
-                    adresse_element = page.locator('text=/Adresse du siège/').first
-                    if adresse_element:
-                        # Le sibling suivant contient la valeur
-                        sibling = adresse_element.locator('xpath=following-sibling::*[1]')
-                        adresse = sibling.text_content().strip()
-                        result["ADRESSE DE DOMICILIATION"] = adresse
-                        logger.debug(f"Adresse trouvée: {adresse}")
-
-                        # 5. LOCALITE RCS - Extraire de l'adresse
-                        parts = adresse.split()
-                        for i, part in enumerate(parts):
-                            if part.isdigit() and len(part) == 5:  # Code postal
-                                if i + 1 < len(parts):
-                                    ville = ' '.join(parts[i+1:])
-                                    # Nettoyer les arrondissements et "FRANCE"
-                                    ville_clean = ville.replace(" 1ER ARRONDISSEMENT", "")
-                                    ville_clean = ville_clean.replace(" 2E ARRONDISSEMENT", "")
-                                    for j in range(3, 21):
-                                        ville_clean = ville_clean.replace(f" {j}E ARRONDISSEMENT", "")
-                                    ville_clean = ville_clean.replace(" FRANCE", "")
-                                    result["LOCALITE RCS"] = ville_clean.strip()
-                                    logger.debug(f"Localité RCS trouvée: {ville_clean}")
-                                    break
-                except Exception as e:
-                    logger.debug(f"Impossible d'extraire l'adresse: {e}")
+        # 1. NOM DE LA SOCIETE - H1
+        try:
+            h1_element = page.locator('h1').first
+            if h1_element:
+                nom_societe = h1_element.text_content().strip()
+                # Nettoyer "Entreprise : NAME - SIREN XXX" → "NAME"
+                if " - SIREN" in nom_societe:
+                    nom_societe = nom_societe.split(" - SIREN")[0]
+                if nom_societe.startswith("Entreprise : "):
+                    nom_societe = nom_societe.replace("Entreprise : ", "")
+                result["NOM DE LA SOCIETE"] = nom_societe.strip()
+                logger.debug(f"Nom société trouvé: {result['NOM DE LA SOCIETE']}")
+        except Exception as e:
+            logger.debug(f"Impossible d'extraire le nom: {e}")
 
-                # 6. PRESIDENT DE LA SOCIETE - Section "Gestion et Direction"
-                try:
-                    # Attendre que la section dirigeants soit visible
-                    page.wait_for_selector('h3#representants', timeout=5000)
-
-                    # Chercher les blocs dirigeant
-                    blocs_dirigeant = page.locator('.bloc-dirigeant').all()
-                    logger.debug(f"Nombre de blocs dirigeant trouvés: {len(blocs_dirigeant)}")
-
-                    if blocs_dirigeant:
-                        # Prendre le premier bloc (généralement le président)
-                        premier_bloc = blocs_dirigeant[0]
-                        paragraphes = premier_bloc.locator('p').all()
-
-                        dirigeant_info = {}
-                        for i in range(0, len(paragraphes), 2):
-                            if i + 1 < len(paragraphes):
-                                label = paragraphes[i].text_content().strip()
-                                valeur = paragraphes[i + 1].text_content().strip()
-                                dirigeant_info[label] = valeur
-                                logger.debug(f"  {label}: {valeur}")
-
-                        # Extraire le dirigeant
-                        dirigeant = None
-                        if 'Dénomination' in dirigeant_info:
-                            dirigeant = dirigeant_info['Dénomination']
-                        elif 'Nom' in dirigeant_info and 'Prénom' in dirigeant_info:
-                            nom = dirigeant_info['Nom']
-                            prenom = dirigeant_info['Prénom']
-                            nom_formatted = nom.capitalize() if nom.isupper() else nom
-                            prenom_formatted = prenom.capitalize() if prenom.isupper() else prenom
-                            dirigeant = f"{prenom_formatted} {nom_formatted}"
-                        elif 'Nom' in dirigeant_info:
-                            nom = dirigeant_info['Nom']
-                            dirigeant = nom.capitalize() if nom.isupper() else nom
+        # 2. TYPE DE SOCIETE - Chercher "Forme juridique"
+        try:
+            # Chercher le texte contenant "Forme juridique"
+            forme_element = page.locator('text=/Forme juridique/').first
+            if forme_element:
+                # Le sibling suivant contient la valeur
+                sibling = forme_element.locator('xpath=following-sibling::*[1]')
+                forme = sibling.text_content().strip()
+                result["TYPE DE SOCIETE"] = forme
+                logger.debug(f"Type société trouvé: {forme}")
+        except Exception as e:
+            logger.debug(f"Impossible d'extraire le type: {e}")
 
-                        if dirigeant:
-                            result["PRESIDENT DE LA SOCIETE"] = dirigeant
-                            logger.info(f"Dirigeant trouvé: {dirigeant}")
+        # 3. CAPITAL SOCIAL - Formater comme "145 131 987 €"
+        try:
+            capital_element = page.locator('text=/Capital/').first
+            if capital_element:
+                # Le sibling suivant contient la valeur
+                sibling = capital_element.locator('xpath=following-sibling::*[1]')
+                result["CAPITAL SOCIAL"] = INPIClient._format_capital(sibling.text_content().strip())
 
-                except Exception as e:
-                    logger.debug(f"Impossible d'extraire le dirigeant: {e}")
+                logger.debug(f"Capital trouvé: {result['CAPITAL SOCIAL']}")
+        except Exception as e:
+            logger.debug(f"Impossible d'extraire le capital: {e}")
 
-                browser.close()
+        # 4. ADRESSE DE DOMICILIATION
+        try:
+            # Chercher "Adresse du siège"
+            adresse_element = page.locator('text=/Adresse du siège/').first
+            if adresse_element:
+                # Le sibling suivant contient la valeur
+                sibling = adresse_element.locator('xpath=following-sibling::*[1]')
+                adresse = sibling.text_content().strip()
+                result["ADRESSE DE DOMICILIATION"] = adresse
+                logger.debug(f"Adresse trouvée: {adresse}")
+
+                # 5. LOCALITE RCS - Extraire de l'adresse
+                localite = INPIClient._localite_from_adresse(adresse)
+                if localite is not None:
+                    result["LOCALITE RCS"] = localite
+                    logger.debug(f"Localité RCS trouvée: {localite}")
+        except Exception as e:
+            logger.debug(f"Impossible d'extraire l'adresse: {e}")
 
-            logger.info(f"Scraping Playwright réussi: {len(result)} champs récupérés")
-            return result if result else None
+        # 6. PRESIDENT DE LA SOCIETE - Section "Gestion et Direction"
+        try:
+            # Attendre que la section dirigeants soit visible
+            page.wait_for_selector('h3#representants', timeout=PLAYWRIGHT_SELECTOR_TIMEOUT)
+
+            # Chercher les blocs dirigeant
+            blocs_dirigeant = page.locator('.bloc-dirigeant').all()
+            logger.debug(f"Nombre de blocs dirigeant trouvés: {len(blocs_dirigeant)}")
+
+            if blocs_dirigeant:
+                # Prendre le premier bloc (généralement le président)
+                premier_bloc = blocs_dirigeant[0]
+                paragraphes = premier_bloc.locator('p').all()
+
+                dirigeant_info = {}
+                for i in range(0, len(paragraphes), 2):
+                    if i + 1 < len(paragraphes):
+                        label = paragraphes[i].text_content().strip()
+                        valeur = paragraphes[i + 1].text_content().strip()
+                        dirigeant_info[label] = valeur
+                        logger.debug(f"  {label}: {valeur}")
+
+                # Extraire le dirigeant
+                dirigeant = None
+                if 'Dénomination' in dirigeant_info:
+                    dirigeant = dirigeant_info['Dénomination']
+                elif 'Nom' in dirigeant_info and 'Prénom' in dirigeant_info:
+                    nom = dirigeant_info['Nom']
+                    prenom = dirigeant_info['Prénom']
+                    nom_formatted = nom.capitalize() if nom.isupper() else nom
+                    prenom_formatted = prenom.capitalize() if prenom.isupper() else prenom
+                    dirigeant = f"{prenom_formatted} {nom_formatted}"
+                elif 'Nom' in dirigeant_info:
+                    nom = dirigeant_info['Nom']
+                    dirigeant = nom.capitalize() if nom.isupper() else nom
+
+                if dirigeant:
+                    result["PRESIDENT DE LA SOCIETE"] = dirigeant
+                    logger.info(f"Dirigeant trouvé: {dirigeant}")
 
         except Exception as e:
-            logger.error(f"Erreur lors du scraping Playwright INPI pour SIREN {siren}: {str(e)}")
-            return None
+            logger.debug(f"Impossible d'extraire le dirigeant: {e}")
+
+        return result
 
     def get_company_info(self, siret: str) -> Dict[str, str]:
         """
@@ -595,8 +989,85 @@ class INPIClient:
             - ADRESSE DE DOMICILIATION
             - PRESIDENT DE LA SOCIETE
         """
-        # Initialiser le résultat avec des valeurs vides
-        result = {
+        result = self._empty_result()
+        siren = self._siren_from_siret(siret, result)
+        if siren is None:
+            return result
+
+        # Cache persistant partagé (enrichissements réussis et SIREN inconnus)
+        cache = get_inpi_cache()
+        cached = self._lookup_cache(cache, siren)
+        if cached is not None:
+            return cached
+
+        logger.info(f"Recherche INPI pour SIREN: {siren}")
+        # Durée bornée même si l'INPI ne répond plus (API, scraping et quota compris)
+        with inpi_deadline(Config.INPI_DEADLINE):
+            company = self._search_by_siren(siren)
+            result, not_found = self._enrich(siren, company, result)
+
+        self._cache_result(cache, siren, result, not_found)
+        return result
+
+    def get_companies_info(self, sirets: List[str]) -> Dict[str, Dict[str, str]]:
+        """
+        Récupère les informations de plusieurs entreprises en requêtes groupées.
+
+        Les SIREN sont dédoublonnés, ceux absents du cache sont demandés à l'API
+        par paquets de BULK_CHUNK_SIZE (paramètre siren[] multiple, file batch du
+        limiteur), puis chaque réponse est traitée comme dans get_company_info
+        (scraping en secours pour les entreprises absentes de l'API).
+
+        Args:
+            sirets: Numéros SIRET (14 chiffres) ou SIREN (9 chiffres)
+
+        Returns:
+            Dictionnaire {siret tel que fourni: informations de l'entreprise}
+        """
+        results = {}
+        sirens_by_siret = {}
+        for siret in sirets:
+            result = self._empty_result()
+            siren = self._siren_from_siret(siret, result)
+            if siren is None:
+                results[siret] = result
+            else:
+                sirens_by_siret[siret] = siren
+
+        cache = get_inpi_cache()
+        companies = {}
+        to_fetch = []
+        for siren in dict.fromkeys(sirens_by_siret.values()):
+            cached = self._lookup_cache(cache, siren)
+            if cached is not None:
+                companies[siren] = cached
+            else:
+                to_fetch.append(siren)
+
+        logger.info(f"Recherche INPI groupée: {len(sirens_by_siret)} SIRET, "
+                    f"{len(companies)} SIREN en cache, {len(to_fetch)} à interroger")
+
+        for i in range(0, len(to_fetch), BULK_CHUNK_SIZE):
+            chunk = to_fetch[i:i + BULK_CHUNK_SIZE]
+            # Requête groupée bornée comme chaque enrichissement (nouvelles tentatives comprises)
+            with inpi_deadline(Config.INPI_DEADLINE):
+                found = self._search_by_sirens(chunk)
+            for siren in chunk:
+                # COMPANY_NOT_FOUND: absent de la réponse de l'API, None: l'API n'a pas répondu
+                company = found.get(siren, COMPANY_NOT_FOUND) if found is not None else None
+                with inpi_deadline(Config.INPI_DEADLINE):
+                    result, not_found = self._enrich(siren, company, self._empty_result())
+                self._cache_result(cache, siren, result, not_found)
+                companies[siren] = result
+
+        for siret, siren in sirens_by_siret.items():
+            results[siret] = dict(companies[siren])
+        return results
+
+    @staticmethod
+    def _empty_result() -> Dict[str, str]:
+        """Résultat d'enrichissement initialisé avec des valeurs vides."""
+        return {
             "NOM DE LA SOCIETE": "",
             "TYPE DE SOCIETE": "",
             "CAPITAL SOCIAL": "",
@@ -607,113 +1078,172 @@ class INPIClient:
             "error_message": ""
         }
 
+    @staticmethod
+    def _siren_from_siret(siret: str, result: Dict[str, str]) -> Optional[str]:
+        """
+        Extrait le SIREN (9 premiers chiffres du SIRET).
+
+        Args:
+            siret: Numéro SIRET (14 chiffres) ou SIREN (9 chiffres)
+            result: Résultat où consigner l'erreur si le numéro est invalide
+
+        Returns:
+            SIREN, ou None si le numéro est manquant ou invalide
+        """
         if not siret:
             result["error_message"] = "SIRET manquant"
-            return result
+            return None
 
-        # Extraire le SIREN (9 premiers chiffres du SIRET)
         siret_clean = str(siret).replace(" ", "").strip()
         if len(siret_clean) == 14:
-            siren = siret_clean[:9]
-        elif len(siret_clean) == 9:
-            siren = siret_clean
-        else:
-            result["error_message"] = f"SIRET invalide (longueur: {len(siret_clean)})"
-            logger.error(result["error_message"])
-            return result
+            return siret_clean[:9]
+        if len(siret_clean) == 9:
+            return siret_clean
 
-        logger.info(f"Recherche INPI pour SIREN: {siren}")
+        result["error_message"] = f"SIRET invalide (longueur: {len(siret_clean)})"
+        logger.error(result["error_message"])
+        return None
 
-        try:
-            company_data = self._search_by_siren(siren)
+    def _lookup_cache(self, cache, siren: str) -> Optional[Dict[str, str]]:
+        """
+        Résultat en cache pour un SIREN, ou dernier résultat connu si l'API est hors service.
 
-            if not company_data:
-                # Fallback: Essayer le scraping avec BeautifulSoup (TOUS les champs!)
-                # BeautifulSoup fonctionne sur Streamlit Cloud contrairement à Playwright
-                logger.info("API INPI non disponible, tentative de scraping BeautifulSoup...")
-                try:
-                    scraped_data = self._scrape_inpi_beautifulsoup(siren)
-                    if scraped_data and len(scraped_data) > 0:
-                        # Copier toutes les données récupérées
-                        for key, value in scraped_data.items():
-                            if value:
-                                result[key] = value
-
-                        result["enrichment_status"] = "success"
-                        result["error_message"] = "Données récupérées via scraping BeautifulSoup (API indisponible)"
-                        logger.info(f"Scraping BeautifulSoup réussi: {len(scraped_data)} champs récupérés")
-                        return result
-                except Exception as e:
-                    logger.warning(f"Échec du scraping BeautifulSoup: {str(e)}")
+        Args:
+            cache: Cache INPI (ou None)
+            siren: Numéro SIREN (9 chiffres)
 
-                result["error_message"] = "Entreprise non trouvée dans la base INPI (API et scraping échoués)"
-                logger.warning(result["error_message"])
-                return result
+        Returns:
+            Résultat mis en cache, ou None
+        """
+        if cache is None:
+            return None
+        cached = cache.get(siren)
+        if cached is None and self.breaker.is_open:
+            cached = cache.get_stale(siren)
+            if cached is not None:
+                logger.info(f"API INPI hors service: données expirées du cache utilisées pour {siren}")
+        return cached
+
+    @staticmethod
+    def _cache_result(cache, siren: str, result: Dict[str, str], not_found: bool) -> None:
+        """
+        Met en cache un enrichissement réussi, ou un SIREN inconnu (cache négatif).
 
-            # Extraction des données selon la structure de l'API INPI
-            # Structure: formality.content.personneMorale
-            formality = company_data.get("formality", {})
-            content = formality.get("content", {})
+        Args:
+            cache: Cache INPI (ou None)
+            siren: Numéro SIREN (9 chiffres)
+            result: Résultat de l'enrichissement
+            not_found: SIREN définitivement inconnu (réponse vide de l'API, sans panne du scraping de secours)
+        """
+        if cache is None:
+            return
+        if result["enrichment_status"] == "success":
+            cache.set(siren, result)
+        elif not_found:
+            cache.set(siren, result, not_found=True)
+
+    @staticmethod
+    def _fill_from_scraping(result: Dict[str, str], scraped_data: Dict[str, str], message: str) -> Dict[str, str]:
+        """
+        Complète le résultat avec les champs obtenus par scraping.
 
-            # Chercher les données de personne morale ou physique
-            personne_morale = content.get("personneMorale", {})
-            nature_creation = content.get("natureCreation", {})
+        Args:
+            result: Résultat initialisé avec des valeurs vides, complété puis retourné
+            scraped_data: Champs récupérés par _scrape_inpi_beautifulsoup
+            message: Message expliquant l'origine des données
 
-            # Nom de la société - chercher dans plusieurs endroits
-            etab_principal = personne_morale.get("etablissementPrincipal", {})
-            desc_etab = etab_principal.get("descriptionEtablissement", {})
+        Returns:
+            Résultat marqué comme réussi
+        """
+        # Copier toutes les données récupérées
+        for key, value in scraped_data.items():
+            if value:
+                result[key] = value
+
+        result["enrichment_status"] = "success"
+        result["error_message"] = message
+        logger.info(f"Scraping BeautifulSoup réussi: {len(scraped_data)} champs récupérés")
+        return result
 
-            # Chercher aussi dans identite.entreprise
-            identite = personne_morale.get("identite", {})
-            entreprise = identite.get("entreprise", {})
+    def _enrich(self, siren: str, company: Optional[CompanyRecord],
+                result: Dict[str, str]) -> Tuple[Dict[str, str], bool]:
+        """
+        Complète le résultat depuis la réponse de l'API, ou par scraping si l'entreprise n'y est pas.
 
-            result["NOM DE LA SOCIETE"] = (
-                desc_etab.get("nomCommercial") or
-                desc_etab.get("enseigne") or
-                personne_morale.get("denomination") or
-                entreprise.get("denomination") or
-                ""
+        Args:
+            siren: Numéro SIREN (9 chiffres)
+            company: Entreprise projetée par _project_company, COMPANY_NOT_FOUND ou None
+            result: Résultat initialisé avec des valeurs vides, complété puis retourné
+
+        Returns:
+            Tuple (résultat, SIREN définitivement inconnu: à mettre en cache négatif)
+        """
+        if company is None or company is COMPANY_NOT_FOUND:
+            definitive = self._scrape_fallback(siren, result)
+            # Un échec transitoire du scraping (timeout, 5xx) ne prouve pas que le SIREN est inconnu
+            return result, company is COMPANY_NOT_FOUND and definitive and result["enrichment_status"] != "success"
+        return self._build_company_info(siren, company, result), False
+
+    def _scrape_fallback(self, siren: str, result: Dict[str, str]) -> bool:
+        """
+        Complète le résultat par scraping de data.inpi.fr (entreprise absente de l'API ou API indisponible).
+
+        Args:
+            siren: Numéro SIREN (9 chiffres)
+            result: Résultat initialisé avec des valeurs vides, complété
+
+        Returns:
+            True si la page a répondu (données ou absence avérée), False si le scraping a échoué
+        """
+        # BeautifulSoup fonctionne sur Streamlit Cloud contrairement à Playwright
+        logger.info("API INPI non disponible, tentative de scraping BeautifulSoup...")
+        try:
+            scraped_data = self._fetch_inpi_page(siren)
+        except Exception as e:
+            logger.warning(f"Échec du scraping BeautifulSoup: {str(e)}")
+            scraped_data = None
+
+        if scraped_data:
+            self._fill_from_scraping(
+                result, scraped_data, "Données récupérées via scraping BeautifulSoup (API indisponible)"
             )
+            return True
 
-            # Type de société (forme juridique)
-            forme_juridique = nature_creation.get("formeJuridique", "")
-            if forme_juridique:
-                # Mapping des codes de formes juridiques (principaux)
-                formes_codes = {
-                    "5499": "SAS (Société par Actions Simplifiée)",
-                    "5498": "SASU (Société par Actions Simplifiée Unipersonnelle)",
-                    "5710": "SCI (Société Civile Immobilière)",
-                    "5505": "SA (Société Anonyme)",
-                    "5410": "SARL (Société à Responsabilité Limitée)",
-                    "5720": "EURL (Entreprise Unipersonnelle à Responsabilité Limitée)"
-                }
-                result["TYPE DE SOCIETE"] = formes_codes.get(forme_juridique, forme_juridique)
+        result["error_message"] = "Entreprise non trouvée dans la base INPI (API et scraping échoués)"
+        logger.warning(result["error_message"])
+        return scraped_data is not None
 
-            # Adresse de domiciliation (siège social) - extraire d'abord car on en a besoin pour le RCS
-            adresse_entreprise = personne_morale.get("adresseEntreprise", {})
-            adresse = adresse_entreprise.get("adresse", {})
-            if isinstance(adresse, dict):
-                parts = []
-                if adresse.get("numVoie"):
-                    parts.append(str(adresse["numVoie"]))
-                if adresse.get("indiceRepetition"):
-                    parts.append(adresse["indiceRepetition"])
-                if adresse.get("typeVoie"):
-                    parts.append(adresse["typeVoie"])
-                if adresse.get("voie"):
-                    parts.append(adresse["voie"])
-                if adresse.get("codePostal"):
-                    parts.append(str(adresse["codePostal"]))
-                if adresse.get("commune"):
-                    parts.append(adresse["commune"])
-
-                result["ADRESSE DE DOMICILIATION"] = " ".join(parts) if parts else ""
+    def _build_company_info(self, siren: str, company: Optional[CompanyRecord], result: Dict[str, str],
+                            scrape_dirigeant: bool = True) -> Dict[str, str]:
+        """
+        Complète le résultat depuis l'entreprise projetée (ou le scraping si elle n'est pas dans l'API).
 
-            # Capital social - chercher dans personneMorale.identite.description
-            identite = personne_morale.get("identite", {})
-            description = identite.get("description", {})
+        Args:
+            siren: Numéro SIREN (9 chiffres)
+            company: Entreprise projetée par _project_company, COMPANY_NOT_FOUND ou None
+            result: Résultat initialisé avec des valeurs vides, complété puis retourné
+            scrape_dirigeant: Scraper data.inpi.fr si l'API ne fournit pas le dirigeant
+
+        Returns:
+            Dictionnaire avec les informations de l'entreprise
+        """
+        try:
+            if company is None or company is COMPANY_NOT_FOUND:
+                # Fallback: Essayer le scraping avec BeautifulSoup (TOUS les champs!)
+                self._scrape_fallback(siren, result)
+                return result
+
+            result["NOM DE LA SOCIETE"] = company.denomination
 
-            montant_capital = description.get("montantCapital")
+            # Type de société (forme juridique)
+            if company.forme_juridique:
+                result["TYPE DE SOCIETE"] = FORMES_JURIDIQUES.get(company.forme_juridique, company.forme_juridique)
+
+            # Adresse de domiciliation (siège social)
+            result["ADRESSE DE DOMICILIATION"] = company.adresse
+
+            # Capital social
+            montant_capital = company.montant_capital
             if montant_capital:
                 if isinstance(montant_capital, (int, float)):
                     result["CAPITAL SOCIAL"] = f"{int(montant_capital):,}".replace(",", " ") + " €"
@@ -722,21 +1252,15 @@ class INPIClient:
 
             # Localité RCS (greffe) - déduire de la commune du siège social
             # Le greffe est généralement dans la même ville que le siège social
-            commune = adresse.get("commune", "") if isinstance(adresse, dict) else ""
-            if commune:
+            if company.commune:
                 # Nettoyer le nom de la commune (retirer arrondissement pour Paris, Lyon, Marseille)
-                commune_clean = commune.replace(" 1ER ARRONDISSEMENT", "")
-                commune_clean = commune_clean.replace(" 2E ARRONDISSEMENT", "")
-                for i in range(3, 21):
-                    commune_clean = commune_clean.replace(f" {i}E ARRONDISSEMENT", "")
-                result["LOCALITE RCS"] = commune_clean.strip()
+                result["LOCALITE RCS"] = ARRONDISSEMENT_PATTERN.sub("", company.commune).strip()
 
-            # Président/gérant (représentant légal)
-            # Essayer d'abord depuis l'API INPI (composition.pouvoirs)
-            dirigeant = self._extract_dirigeant_from_api(personne_morale)
+            # Président/gérant (représentant légal), depuis l'API INPI (composition.pouvoirs)
+            dirigeant = company.dirigeant
 
             # Fallback: Si pas trouvé dans l'API, essayer le scraping INPI web
-            if not dirigeant:
+            if not dirigeant and scrape_dirigeant:
                 try:
                     logger.info("Dirigeant non trouvé dans API INPI, tentative de scraping site INPI...")
                     dirigeant = self._scrape_inpi_dirigeant(siren)
@@ -755,19 +1279,31 @@ class INPIClient:
         return result
 
 
+_inpi_client: Optional[INPIClient] = None
+_inpi_client_lock = threading.Lock()
+
+
 def get_inpi_client() -> Optional[INPIClient]:
     """
-    Récupère une instance du client INPI (factory function).
+    Récupère le client INPI du processus (créé au premier appel).
+
+    Le client est partagé par tous les threads: session HTTP, token et caches
+    sont réutilisés d'un enrichissement à l'autre.
 
     Returns:
         Instance de INPIClient ou None si credentials manquants
     """
+    global _inpi_client
+
     if not Config.validate_inpi_credentials():
         logger.warning("Credentials INPI non configurés - enrichissement désactivé")
         return None
 
-    try:
-        return INPIClient()
-    except Exception as e:
-        logger.error(f"Erreur lors de l'initialisation du client INPI: {e}")
-        return None
+    with _inpi_client_lock:
+        if _inpi_client is None:
+            try:
+                _inpi_client = INPIClient()
+            except Exception as e:
+                logger.error(f"Erreur lors de l'initialisation du client INPI: {e}")
+                return None
+        return _inpi_client
@@ -5,6 +5,8 @@ Gère le remplacement des placeholders, les sections optionnelles, et les header
 
 import logging
 import re
+from bisect import bisect_right
+from itertools import accumulate
 from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 from datetime import datetime, timedelta
@@ -12,6 +14,8 @@ from docx import Document
 from docx.shared import RGBColor
 from docx.oxml import parse_xml
 from docx.oxml.ns import nsdecls
+from docx.text.run import Run
+from .template_cache import VARIABLE_PLACEHOLDER_PATTERN, load_template_with_index
 
 logger = logging.getLogger(__name__)
 
@@ -348,100 +352,12 @@ class LOIGenerator:
                 has_missing_data = True
                 break
 
-        import re
-
-        # CAS 1: Section OBLIGATOIRE avec données manquantes → Reconstruire pour mettre les placeholders en rouge
+        # CAS 1: Section OBLIGATOIRE avec données manquantes → Réécrire les runs pour mettre les placeholders en rouge
         if not is_optional and has_missing_data:
-            # Créer un mapping détaillé: position → (run, formatage)
-            char_to_run_map = []
+            # Tout le texte passe en noir, seuls les placeholders manquants seront en rouge
             for run in paragraph.runs:
-                for _ in range(len(run.text)):
-                    char_to_run_map.append(run)
-
-            # Sauvegarder runs originaux
-            original_runs = list(paragraph.runs)
-
-            # Effacer tous les runs
-            for run in list(paragraph.runs):
-                run.text = ""
-
-            # Construire une liste de segments avec leur formatage
-            # Segment = (start_pos, end_pos, text, run_source, is_placeholder, is_missing)
-            segments = []
-            current_pos = 0
-
-            # Identifier tous les placeholders et leurs positions
-            placeholder_matches = list(re.finditer(r'\[([^\]]+)\]', full_text))
-
-            # Si pas de placeholders, juste copier le texte
-            if not placeholder_matches:
-                pos = 0
-                for run in original_runs:
-                    if run.text:
-                        segments.append((pos, pos + len(run.text), run.text, run, False, False))
-                        pos += len(run.text)
-            else:
-                # Traiter le texte segment par segment en respectant les changements de run ET les placeholders
-                pos = 0
-                placeholder_idx = 0
-
-                while pos < len(full_text):
-                    # Y a-t-il un placeholder à cette position ?
-                    if placeholder_idx < len(placeholder_matches):
-                        match = placeholder_matches[placeholder_idx]
-                        ph_start, ph_end = match.span()
-                        placeholder = match.group(1)
-
-                        # Si on est avant le placeholder, ajouter le texte normal
-                        if pos < ph_start:
-                            # Découper par changement de run
-                            current_run = char_to_run_map[pos] if pos < len(char_to_run_map) else original_runs[0]
-                            segment_start = pos
-                            while pos < ph_start and pos < len(char_to_run_map):
-                                if char_to_run_map[pos] != current_run:
-                                    # Changement de run: sauvegarder le segment
-                                    segments.append((segment_start, pos, full_text[segment_start:pos], current_run, False, False))
-                                    segment_start = pos
-                                    current_run = char_to_run_map[pos]
-                                pos += 1
-                            # Sauvegarder le dernier segment avant le placeholder
-                            if segment_start < pos:
-                                segments.append((segment_start, pos, full_text[segment_start:pos], current_run, False, False))
-
-                        # Ajouter le placeholder ou sa valeur
-                        value = self._get_variable(placeholder)
-                        source_run = char_to_run_map[ph_start] if ph_start < len(char_to_run_map) else original_runs[0]
-                        if value:
-                            segments.append((ph_start, ph_end, value, source_run, True, False))
-                        else:
-                            segments.append((ph_start, ph_end, f"[{placeholder}]", source_run, True, True))
-
-                        pos = ph_end
-                        placeholder_idx += 1
-                    else:
-                        # Plus de placeholders, traiter le reste
-                        if pos < len(full_text):
-                            current_run = char_to_run_map[pos] if pos < len(char_to_run_map) else original_runs[0]
-                            segment_start = pos
-                            while pos < len(char_to_run_map):
-                                if char_to_run_map[pos] != current_run:
-                                    segments.append((segment_start, pos, full_text[segment_start:pos], current_run, False, False))
-                                    segment_start = pos
-                                    current_run = char_to_run_map[pos]
-                                pos += 1
-                            if segment_start < pos:
-                                segments.append((segment_start, pos, full_text[segment_start:pos], current_run, False, False))
-                        break
-
-            # Reconstruire en préservant le formatage de chaque segment
-            for _, _, text, source_run, is_ph, is_missing in segments:
-                if text:
-                    new_run = paragraph.add_run(text)
-                    if is_missing:
-                        override_color = RGBColor(255, 0, 0)
-                    else:
-                        override_color = RGBColor(0, 0, 0)
-                    self._copy_run_format(source_run, new_run, override_color=override_color)
+                run.font.color.rgb = RGBColor(0, 0, 0)
+            self._rewrite_placeholder_runs(paragraph, mark_missing=True)
 
             if has_missing_data:
                 logger.warning(f"Placeholder manquant (rouge): {full_text[:50]}...")
@@ -449,7 +365,7 @@ class LOIGenerator:
         # CAS 2: Toutes les données présentes → Remplacer dans le texte SANS toucher au formatage
         else:
             # Vérifier si des placeholders sont fragmentés (span multiple runs)
-            # Si oui, utiliser la reconstruction (CAS 1) pour les remplacer correctement
+            # Si oui, réécrire les runs concernés (comme CAS 1) pour les remplacer correctement
             has_fragmented_placeholder = False
             for placeholder in placeholders:
                 placeholder_pattern = f"[{placeholder}]"
@@ -464,76 +380,7 @@ class LOIGenerator:
                     break
 
             if has_fragmented_placeholder:
-                # Utiliser la même reconstruction que CAS 1 pour les placeholders fragmentés
-                char_to_run_map = []
-                for run in paragraph.runs:
-                    for _ in range(len(run.text)):
-                        char_to_run_map.append(run)
-
-                original_runs = list(paragraph.runs)
-
-                for run in list(paragraph.runs):
-                    run.text = ""
-
-                segments = []
-
-                placeholder_matches = list(re.finditer(r'\[([^\]]+)\]', full_text))
-
-                if not placeholder_matches:
-                    pos = 0
-                    for run in original_runs:
-                        if run.text:
-                            segments.append((pos, pos + len(run.text), run.text, run, False, False))
-                            pos += len(run.text)
-                else:
-                    pos = 0
-                    placeholder_idx = 0
-
-                    while pos < len(full_text):
-                        if placeholder_idx < len(placeholder_matches):
-                            match = placeholder_matches[placeholder_idx]
-                            ph_start, ph_end = match.span()
-                            placeholder = match.group(1)
-
-                            if pos < ph_start:
-                                current_run = char_to_run_map[pos] if pos < len(char_to_run_map) else original_runs[0]
-                                segment_start = pos
-                                while pos < ph_start and pos < len(char_to_run_map):
-                                    if char_to_run_map[pos] != current_run:
-                                        segments.append((segment_start, pos, full_text[segment_start:pos], current_run, False, False))
-                                        segment_start = pos
-                                        current_run = char_to_run_map[pos]
-                                    pos += 1
-                                if segment_start < pos:
-                                    segments.append((segment_start, pos, full_text[segment_start:pos], current_run, False, False))
-
-                            value = self._get_variable(placeholder)
-                            source_run = char_to_run_map[ph_start] if ph_start < len(char_to_run_map) else original_runs[0]
-                            if value:
-                                segments.append((ph_start, ph_end, value, source_run, True, False))
-                            else:
-                                segments.append((ph_start, ph_end, f"[{placeholder}]", source_run, True, True))
-
-                            pos = ph_end
-                            placeholder_idx += 1
-                        else:
-                            if pos < len(full_text):
-                                current_run = char_to_run_map[pos] if pos < len(char_to_run_map) else original_runs[0]
-                                segment_start = pos
-                                while pos < len(char_to_run_map):
-                                    if char_to_run_map[pos] != current_run:
-                                        segments.append((segment_start, pos, full_text[segment_start:pos], current_run, False, False))
-                                        segment_start = pos
-                                        current_run = char_to_run_map[pos]
-                                    pos += 1
-                                if segment_start < pos:
-                                    segments.append((segment_start, pos, full_text[segment_start:pos], current_run, False, False))
-                            break
-
-                for _, _, text, source_run, _, _ in segments:
-                    if text:
-                        new_run = paragraph.add_run(text)
-                        self._copy_run_format(source_run, new_run)
+                self._rewrite_placeholder_runs(paragraph, mark_missing=False)
             else:
                 # Remplacer les placeholders dans chaque run INDIVIDUELLEMENT
                 for placeholder in placeholders:
@@ -547,6 +394,71 @@ class LOIGenerator:
 
         return None
 
+    def _rewrite_placeholder_runs(self, paragraph, mark_missing: bool) -> None:
+        """
+        Remplace les placeholders d'un paragraphe en ne réécrivant que les runs qu'ils touchent.
+
+        Les offsets des placeholders sont rapportés aux runs par bisection sur les
+        longueurs cumulées des runs; chaque placeholder devient un run dédié (formatage
+        du run où il commence), le texte qui l'entoure reste dans ses runs d'origine.
+        Si une partie du texte est hors des runs (lien hypertexte), seuls les
+        placeholders contenus dans un run sont remplacés, run par run.
+
+        Args:
+            paragraph: Paragraphe docx
+            mark_missing: Mettre en rouge les placeholders sans donnée (en noir sinon)
+        """
+        runs = paragraph.runs
+        runs_text = "".join(run.text for run in runs)
+        # starts[i] = offset du premier caractère du run i dans runs_text
+        starts = list(accumulate((len(run.text) for run in runs), initial=0))
+        # Runs discontinus: un placeholder à cheval sur deux runs pourrait enjamber le lien
+        per_run = runs_text != paragraph.text
+        if per_run:
+            logger.debug(f"Texte hors des runs (lien hypertexte ?), remplacement run par run: {runs_text[:50]}...")
+
+        # En partant de la fin, les offsets des runs qui précèdent restent valides
+        for match in reversed(list(VARIABLE_PLACEHOLDER_PATTERN.finditer(runs_text))):
+            ph_start, ph_end = match.span()
+            placeholder = match.group(1)
+            first = bisect_right(starts, ph_start) - 1
+            last = bisect_right(starts, ph_end - 1) - 1
+            if per_run and last != first:
+                continue
+
+            value = self._get_variable(placeholder)
+            is_missing = not value
+            source_run = runs[first]
+            first_text = source_run.text
+            last_text = runs[last].text if last != first else first_text
+            suffix = last_text[ph_end - starts[last]:]
+
+            source_run.text = first_text[:ph_start - starts[first]]
+            for run in runs[first + 1:last]:
+                run.text = ""
+            if last != first:
+                runs[last].text = suffix
+
+            # Run dédié au placeholder (puis au reste du run s'il n'est pas fragmenté), juste après source_run
+            if mark_missing:
+                override_color = RGBColor(255, 0, 0) if is_missing else RGBColor(0, 0, 0)
+            else:
+                override_color = None
+            value_run = self._insert_run_after(paragraph, source_run, f"[{placeholder}]" if is_missing else value)
+            self._copy_run_format(source_run, value_run, override_color=override_color)
+            if last == first and suffix:
+                suffix_run = self._insert_run_after(paragraph, value_run, suffix)
+                self._copy_run_format(source_run, suffix_run)
+
+    @staticmethod
+    def _insert_run_after(paragraph, run, text: str) -> Run:
+        """Crée un run contenant text juste après run."""
+        new_r = paragraph._p.add_r()
+        run._r.addnext(new_r)
+        new_run = Run(new_r, paragraph)
+        new_run.text = text
+        return new_run
+
     def _update_headers_footers(self, doc: Document):
         """
         Met à jour les headers et footers selon la société bailleur.
@@ -636,13 +548,14 @@ class LOIGenerator:
         """
         logger.info(f"Génération du document LOI: {output_path}")
 
-        # Charger le template
-        doc = Document(str(self.template_path))
+        # Charger le template (copie du template parsé en cache) et l'index de ses placeholders
+        doc, placeholder_index = load_template_with_index(self.template_path)
 
         # Première passe: identifier les sections à garder
         # Pour les paragraphes comme "Remises..." qui n'ont pas de placeholder mais contrôlent une section
         paragraphs_with_data = set()
-        all_paragraphs = doc.paragraphs
+        all_paragraphs = placeholder_index.paragraphs(doc, containing=("Remises", "loyer"))
+        table_paragraphs = placeholder_index.paragraphs(doc, in_table=True)
 
         # Détecter si les paliers ont des données
         has_palier_data = any(
@@ -656,7 +569,7 @@ class LOIGenerator:
             for i in range(1, 5)
         )
 
-        # Traiter tous les paragraphes
+        # Traiter les paragraphes indexés (placeholders, ou titre "Remises" sans placeholder)
         paragraphs_to_delete = []
         for i, paragraph in enumerate(all_paragraphs):
             text = paragraph.text
@@ -707,19 +620,16 @@ class LOIGenerator:
             p.getparent().remove(p)
 
         # Traiter les tableaux
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    cells_to_delete = []
-                    for paragraph in cell.paragraphs:
-                        result = self._process_paragraph(paragraph)
-                        if result == "delete":
-                            cells_to_delete.append(paragraph)
-
-                    # Supprimer les paragraphes dans les cellules
-                    for paragraph in cells_to_delete:
-                        p = paragraph._element
-                        p.getparent().remove(p)
+        cells_to_delete = []
+        for paragraph in table_paragraphs:
+            result = self._process_paragraph(paragraph)
+            if result == "delete":
+                cells_to_delete.append(paragraph)
+
+        # Supprimer les paragraphes dans les cellules
+        for paragraph in cells_to_delete:
+            p = paragraph._element
+            p.getparent().remove(p)
 
         # Mettre à jour les headers/footers
         self._update_headers_footers(doc)
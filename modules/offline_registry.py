@@ -0,0 +1,291 @@
+"""
+Registre local des entreprises, importé d'un export en masse (SIRENE / RNE).
+
+Un export CSV ou Parquet (SIREN, dénomination, forme juridique, capital,
+siège, dirigeant) est importé une fois dans une base SQLite indexée par SIREN
+(Config.INPI_REGISTRY_PATH). OfflineRegistryClient y répond avec le même
+contrat que INPIClient.get_company_info, en moins d'une milliseconde et sans
+réseau; il est consulté avant le cache et l'API INPI.
+
+Import: python import_registre.py Exemples/registre_entreprises_exemple.csv
+"""
+
+import csv
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from .config import Config
+from .inpi_client import ARRONDISSEMENT_PATTERN, FORMES_JURIDIQUES, INPIClient
+
+logger = logging.getLogger(__name__)
+
+IMPORT_BATCH_SIZE = 10_000
+
+# Colonne du registre -> noms acceptés dans l'export (comparés en minuscules)
+COLUMN_ALIASES = {
+    "siren": ("siren",),
+    "nom": ("denomination", "dénomination", "denominationunitelegale", "nom", "raison_sociale"),
+    "forme": ("forme_juridique", "categoriejuridiqueunitelegale", "forme", "type"),
+    "capital": ("capital", "capital_social", "montant_capital"),
+    "adresse": ("adresse_siege", "adresse", "siege", "adresse_domiciliation"),
+    "localite": ("localite_rcs", "commune", "ville", "libellecommuneetablissement"),
+    "dirigeant": ("dirigeant", "president", "representant"),
+}
+
+# Colonne du registre -> champ du résultat de get_company_info
+RESULT_FIELDS = {
+    "nom": "NOM DE LA SOCIETE",
+    "forme": "TYPE DE SOCIETE",
+    "capital": "CAPITAL SOCIAL",
+    "localite": "LOCALITE RCS",
+    "adresse": "ADRESSE DE DOMICILIATION",
+    "dirigeant": "PRESIDENT DE LA SOCIETE",
+}
+
+
+def _resolve_columns(header: Iterable[str]) -> Dict[str, str]:
+    """
+    Associe les colonnes de l'export à celles du registre.
+
+    Args:
+        header: Noms des colonnes de l'export
+
+    Returns:
+        Dictionnaire {colonne du registre: colonne de l'export}
+    """
+    by_name = {str(name).strip().lower(): name for name in header}
+    columns = {}
+    for column, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in by_name:
+                columns[column] = by_name[alias]
+                break
+    if "siren" not in columns:
+        raise ValueError(f"Colonne SIREN introuvable dans l'export (colonnes: {', '.join(map(str, header))})")
+    return columns
+
+
+def _read_csv(path: Path) -> Iterator[Dict[str, str]]:
+    """Lignes d'un export CSV (séparateur détecté: virgule, point-virgule ou tabulation)."""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        dialect = csv.Sniffer().sniff(f.readline(), delimiters=",;\t")
+        f.seek(0)
+        yield from csv.DictReader(f, dialect=dialect)
+
+
+def _read_parquet(path: Path) -> Iterator[Dict[str, object]]:
+    """Lignes d'un export Parquet, lues par lots (pyarrow requis)."""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("pyarrow est requis pour importer un export Parquet: pip install pyarrow") from e
+
+    parquet_file = pq.ParquetFile(path)
+    for batch in parquet_file.iter_batches(batch_size=IMPORT_BATCH_SIZE):
+        yield from batch.to_pylist()
+
+
+def _clean(value) -> str:
+    return "" if value is None else " ".join(str(value).split())
+
+
+def _normalize_siren(value) -> Optional[str]:
+    """SIREN sur 9 chiffres (zéros de tête rétablis pour les exports numériques), ou None."""
+    siren = _clean(value).replace(" ", "")
+    if siren.endswith(".0"):
+        siren = siren[:-2]
+    if len(siren) == 14:
+        siren = siren[:9]  # SIRET
+    if not siren.isdigit() or len(siren) > 9:
+        return None
+    return siren.zfill(9)
+
+
+def _format_capital(value) -> str:
+    """Montant formaté comme l'enrichissement API ("145 131 987 €")."""
+    text = _clean(value)
+    try:
+        amount = float(text.replace(" ", "").replace(",", "."))
+    except ValueError:
+        return text.replace("EUR", "€")
+    return f"{int(amount):,}".replace(",", " ") + " €"
+
+
+def _localite(commune: str, adresse: str) -> str:
+    """Ville du greffe: commune sans arrondissement, sinon ville suivant le code postal du siège."""
+    if not commune:
+        parts = adresse.split()
+        for i, part in enumerate(parts[:-1]):
+            if part.isdigit() and len(part) == 5:
+                commune = " ".join(parts[i + 1:]).replace(" FRANCE", "")
+                break
+    return ARRONDISSEMENT_PATTERN.sub("", commune).strip()
+
+
+def _rows(records: Iterable[Dict[str, object]]) -> Iterator[tuple]:
+    """Lignes du registre (siren, nom, forme, capital, adresse, localite, dirigeant)."""
+    columns = None
+    for record in records:
+        if columns is None:
+            columns = _resolve_columns(record.keys())
+        siren = _normalize_siren(record.get(columns["siren"]))
+        if siren is None:
+            continue
+        values = {column: _clean(record.get(name)) for column, name in columns.items()}
+        forme = values.get("forme", "")
+        adresse = values.get("adresse", "")
+        yield (
+            siren,
+            values.get("nom", ""),
+            FORMES_JURIDIQUES.get(forme, forme),
+            _format_capital(values["capital"]) if values.get("capital") else "",
+            adresse,
+            _localite(values.get("localite", ""), adresse),
+            values.get("dirigeant", ""),
+        )
+
+
+def import_registry(source, db_path=None) -> int:
+    """
+    Importe un export d'entreprises dans le registre local (remplace les SIREN existants).
+
+    Args:
+        source: Chemin de l'export (.csv, .txt ou .parquet)
+        db_path: Chemin de la base SQLite (Config.INPI_REGISTRY_PATH par défaut)
+
+    Returns:
+        Nombre d'entreprises importées
+    """
+    source = Path(source)
+    db_path = Path(db_path or Config.INPI_REGISTRY_PATH)
+    records = _read_parquet(source) if source.suffix.lower() == ".parquet" else _read_csv(source)
+
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS companies ("
+            " siren TEXT PRIMARY KEY,"
+            " nom TEXT, forme TEXT, capital TEXT, adresse TEXT, localite TEXT, dirigeant TEXT"
+            ") WITHOUT ROWID"
+        )
+        count = 0
+        batch: List[tuple] = []
+        with conn:
+            for row in _rows(records):
+                batch.append(row)
+                if len(batch) >= IMPORT_BATCH_SIZE:
+                    conn.executemany("INSERT OR REPLACE INTO companies VALUES (?, ?, ?, ?, ?, ?, ?)", batch)
+                    count += len(batch)
+                    batch.clear()
+            conn.executemany("INSERT OR REPLACE INTO companies VALUES (?, ?, ?, ?, ?, ?, ?)", batch)
+            count += len(batch)
+    finally:
+        conn.close()
+
+    logger.info(f"Registre local: {count} entreprises importées depuis {source.name} dans {db_path}")
+    return count
+
+
+class OfflineRegistryClient:
+    """Enrichissement depuis le registre local (même contrat que INPIClient)."""
+
+    def __init__(self, path=None):
+        """
+        Args:
+            path: Chemin de la base SQLite (Config.INPI_REGISTRY_PATH par défaut)
+        """
+        self.path = Path(path or Config.INPI_REGISTRY_PATH)
+        if not self.path.is_file():
+            raise FileNotFoundError(f"Registre local introuvable: {self.path}")
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Connexion en lecture seule propre au thread courant."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(f"{self.path.resolve().as_uri()}?mode=ro", uri=True)
+            self._local.conn = conn
+        return conn
+
+    def lookup(self, siren: str) -> Optional[Dict[str, str]]:
+        """
+        Informations d'un SIREN présent dans le registre.
+
+        Args:
+            siren: Numéro SIREN (9 chiffres)
+
+        Returns:
+            Résultat réussi au format de get_company_info, ou None si absent
+        """
+        row = self._connect().execute(
+            "SELECT nom, forme, capital, localite, adresse, dirigeant FROM companies WHERE siren = ?",
+            (siren,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        result = INPIClient._empty_result()
+        for field, value in zip(("nom", "forme", "capital", "localite", "adresse", "dirigeant"), row):
+            result[RESULT_FIELDS[field]] = value or ""
+        result["enrichment_status"] = "success"
+        return result
+
+    def get_company_info(self, siret: str) -> Dict[str, str]:
+        """
+        Récupère les informations d'une entreprise à partir du SIRET.
+
+        Args:
+            siret: Numéro SIRET (14 chiffres) ou SIREN (9 chiffres)
+
+        Returns:
+            Dictionnaire avec les informations de l'entreprise (en échec si absente du registre)
+        """
+        result = INPIClient._empty_result()
+        siren = INPIClient._siren_from_siret(siret, result)
+        if siren is None:
+            return result
+
+        found = self.lookup(siren)
+        if found is None:
+            result["error_message"] = f"SIREN {siren} absent du registre local"
+            return result
+        return found
+
+    def get_companies_info(self, sirets: List[str]) -> Dict[str, Dict[str, str]]:
+        """
+        Récupère les informations de plusieurs entreprises.
+
+        Args:
+            sirets: Numéros SIRET (14 chiffres) ou SIREN (9 chiffres)
+
+        Returns:
+            Dictionnaire {siret tel que fourni: informations de l'entreprise}
+        """
+        return {siret: self.get_company_info(siret) for siret in sirets}
+
+
+_offline_registry: Optional[OfflineRegistryClient] = None
+_offline_registry_lock = threading.Lock()
+
+
+def get_offline_registry() -> Optional[OfflineRegistryClient]:
+    """
+    Retourne le registre local du processus s'il a été importé.
+
+    Returns:
+        Client du registre local, ou None si la base n'existe pas
+    """
+    global _offline_registry
+    with _offline_registry_lock:
+        if _offline_registry is None:
+            try:
+                _offline_registry = OfflineRegistryClient()
+            except (OSError, sqlite3.Error):
+                return None
+            logger.info(f"Registre local des entreprises: {_offline_registry.path}")
+        return _offline_registry
@@ -2,12 +2,12 @@
 Module pour extraire tous les placeholders d'un document Word.
 """
 
-from docx import Document
 from pathlib import Path
-import re
 from typing import Set, List
 import logging
 
+from .template_cache import get_template_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -21,27 +21,9 @@ def extract_all_placeholders(template_path: str) -> Set[str]:
     Returns:
         Set de noms de placeholders (sans les crochets)
     """
-    placeholders = set()
-
     try:
-        doc = Document(template_path)
-
-        # Extraire depuis les paragraphes
-        for paragraph in doc.paragraphs:
-            text = paragraph.text
-            # Trouver [Variable]
-            placeholders.update(re.findall(r'\[([^\]]+)\]', text))
-            # Trouver {{ARTICLE}}
-            placeholders.update(re.findall(r'\{\{([^}]+)\}\}', text))
-
-        # Extraire depuis les tableaux
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    for paragraph in cell.paragraphs:
-                        text = paragraph.text
-                        placeholders.update(re.findall(r'\[([^\]]+)\]', text))
-                        placeholders.update(re.findall(r'\{\{([^}]+)\}\}', text))
+        # Index calculé une seule fois par template (cache partagé avec les générateurs)
+        placeholders = get_template_cache().get(template_path).index.placeholders
 
         logger.info(f"{len(placeholders)} placeholders extraits du template")
         return placeholders
@@ -0,0 +1,357 @@
+"""
+Limiteur de débit des appels INPI partagé par tous les processus de la machine.
+
+Les appels des dernières `period` secondes sont enregistrés dans une base
+SQLite locale (mode WAL, transactions BEGIN IMMEDIATE): sessions Streamlit,
+workers de génération en lot et scripts respectent ensemble un seul quota
+(Config.INPI_RATE_LIMIT requêtes par minute), là où @limits comptait par
+processus.
+
+Deux files de priorité:
+- "interactive" (interface): prioritaire, peut utiliser tout le quota
+- "batch" (génération en lot): n'utilise pas les Config.INPI_INTERACTIVE_RESERVE
+  derniers appels de la fenêtre et cède son tour tant qu'une requête
+  interactive est en attente
+
+Si la base ne peut pas être ouverte (système de fichiers en lecture seule,
+fichier verrouillé), get_rate_limiter se replie sur une fenêtre en mémoire:
+le quota est alors compté par processus, mais jamais ignoré.
+"""
+
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+import sqlite3
+import threading
+import time
+import uuid
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, Optional, Tuple
+
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+LANES = (INTERACTIVE, BATCH)
+
+POLL_INTERVAL = 0.5  # Intervalle maximal entre deux tentatives (secondes)
+WAITER_TIMEOUT = 5.0  # Une attente non rafraîchie depuis ce délai est abandonnée (processus tué)
+
+_default_lane = INTERACTIVE
+
+
+def set_default_lane(lane: str) -> None:
+    """
+    Choisit la file utilisée par défaut dans le processus courant.
+
+    Args:
+        lane: INTERACTIVE ou BATCH
+    """
+    global _default_lane
+    if lane not in LANES:
+        raise ValueError(f"File de priorité inconnue: {lane}")
+    _default_lane = lane
+
+
+class RateLimiter(ABC):
+    """Attente d'un appel autorisé, commune aux limiteurs (try_acquire, _abandon et _release à fournir)."""
+
+    @abstractmethod
+    def try_acquire(self, lane: str, waiter_id: str) -> float:
+        """Tente de consommer un appel: 0 si autorisé, sinon délai avant une nouvelle tentative."""
+
+    @abstractmethod
+    def _abandon(self, waiter_id: str) -> None:
+        """Retire une attente interrompue (exception, annulation)."""
+
+    @abstractmethod
+    def _release(self) -> None:
+        """Rend le dernier appel consommé (accordé à une attente annulée entre-temps)."""
+
+    def acquire(self, lane: Optional[str] = None, timeout: Optional[float] = None) -> bool:
+        """
+        Attend (en bloquant le thread) qu'un appel soit autorisé.
+
+        Args:
+            lane: INTERACTIVE ou BATCH (file par défaut du processus sinon)
+            timeout: Attente maximale en secondes (illimitée par défaut)
+
+        Returns:
+            True si l'appel est autorisé, False si le délai est écoulé
+        """
+        lane = lane or _default_lane
+        waiter_id = uuid.uuid4().hex
+        deadline = None if timeout is None else time.monotonic() + timeout
+        waited = False
+        try:
+            while True:
+                wait = self.try_acquire(lane, waiter_id)
+                if wait == 0:
+                    return True
+                if not waited:
+                    logger.info(f"Quota INPI atteint ({lane}), requête différée d'environ {wait:.1f} s")
+                    waited = True
+                delay = min(wait, POLL_INTERVAL)
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._abandon(waiter_id)
+                        return False
+                    delay = min(delay, remaining)
+                time.sleep(delay)
+        except BaseException:
+            self._abandon(waiter_id)
+            raise
+
+    async def acquire_async(self, lane: Optional[str] = None) -> None:
+        """
+        Attend (sans bloquer la boucle d'événements) qu'un appel soit autorisé.
+
+        Args:
+            lane: INTERACTIVE ou BATCH (file par défaut du processus sinon)
+        """
+        lane = lane or _default_lane
+        waiter_id = uuid.uuid4().hex
+        waited = False
+        try:
+            while True:
+                # try_acquire peut bloquer (transaction SQLite, jusqu'au timeout): hors de la boucle
+                attempt = asyncio.ensure_future(asyncio.to_thread(self.try_acquire, lane, waiter_id))
+                try:
+                    wait = await asyncio.shield(attempt)
+                except asyncio.CancelledError:
+                    # La tentative se termine dans son thread: rendre l'appel qu'elle a pu consommer
+                    await asyncio.wait([attempt])
+                    if not attempt.cancelled() and attempt.exception() is None and attempt.result() == 0:
+                        await asyncio.to_thread(self._release)
+                    raise
+                if wait == 0:
+                    return
+                if not waited:
+                    logger.info(f"Quota INPI atteint ({lane}), requête différée d'environ {wait:.1f} s")
+                    waited = True
+                await asyncio.sleep(min(wait, POLL_INTERVAL))
+        except BaseException:
+            await asyncio.to_thread(self._abandon, waiter_id)
+            raise
+
+
+class SharedRateLimiter(RateLimiter):
+    """Fenêtre glissante d'appels stockée en SQLite, avec files de priorité."""
+
+    def __init__(self, path=None, rate: Optional[int] = None, period: float = 60.0,
+                 interactive_reserve: Optional[int] = None):
+        """
+        Ouvre (ou crée) la base du limiteur.
+
+        Args:
+            path: Chemin du fichier SQLite (Config.INPI_RATE_LIMIT_PATH par défaut)
+            rate: Nombre d'appels autorisés par période (Config.INPI_RATE_LIMIT par défaut)
+            period: Durée de la fenêtre en secondes
+            interactive_reserve: Appels de la fenêtre réservés à la file interactive
+        """
+        self.path = Path(path or Config.INPI_RATE_LIMIT_PATH)
+        self.rate = Config.INPI_RATE_LIMIT if rate is None else rate
+        self.period = period
+        self.interactive_reserve = (
+            Config.INPI_INTERACTIVE_RESERVE if interactive_reserve is None else interactive_reserve
+        )
+        self._local = threading.local()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        conn.execute("CREATE TABLE IF NOT EXISTS calls (called_at REAL NOT NULL)")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS waiters ("
+            " id TEXT PRIMARY KEY,"
+            " lane TEXT NOT NULL,"
+            " seen_at REAL NOT NULL)"
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        """Connexion propre au thread courant, en mode autocommit (transactions explicites)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def try_acquire(self, lane: str, waiter_id: str) -> float:
+        """
+        Tente de consommer un appel du quota.
+
+        En cas de refus, l'attente est enregistrée (ou rafraîchie) sous waiter_id
+        pour que la file batch cède le passage aux requêtes interactives.
+
+        Args:
+            lane: INTERACTIVE ou BATCH
+            waiter_id: Identifiant de l'attente en cours
+
+        Returns:
+            0 si l'appel est autorisé, sinon délai estimé avant une nouvelle tentative
+        """
+        now = time.time()
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM calls WHERE called_at <= ?", (now - self.period,))
+            conn.execute("DELETE FROM waiters WHERE seen_at <= ?", (now - WAITER_TIMEOUT,))
+
+            count, oldest = conn.execute("SELECT COUNT(*), MIN(called_at) FROM calls").fetchone()
+            limit = self.rate
+            if lane == BATCH:
+                limit = max(1, self.rate - self.interactive_reserve)
+                interactive_waiting = conn.execute(
+                    "SELECT 1 FROM waiters WHERE lane = ? LIMIT 1", (INTERACTIVE,)
+                ).fetchone()
+                if interactive_waiting:
+                    count = max(count, limit)
+
+            if count < limit:
+                conn.execute("INSERT INTO calls (called_at) VALUES (?)", (now,))
+                conn.execute("DELETE FROM waiters WHERE id = ?", (waiter_id,))
+                conn.execute("COMMIT")
+                return 0.0
+
+            conn.execute(
+                "INSERT OR REPLACE INTO waiters (id, lane, seen_at) VALUES (?, ?, ?)",
+                (waiter_id, lane, now)
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+        wait = oldest + self.period - now if oldest is not None else POLL_INTERVAL
+        return max(wait, 0.01)
+
+    def _abandon(self, waiter_id: str) -> None:
+        """Retire une attente interrompue (exception, annulation)."""
+        try:
+            self._connect().execute("DELETE FROM waiters WHERE id = ?", (waiter_id,))
+        except sqlite3.Error as e:
+            logger.warning(f"Limiteur INPI: attente {waiter_id} non retirée: {e}")
+
+    def _release(self) -> None:
+        """Rend le dernier appel consommé (accordé à une attente annulée entre-temps)."""
+        try:
+            self._connect().execute(
+                "DELETE FROM calls WHERE rowid = (SELECT rowid FROM calls ORDER BY called_at DESC LIMIT 1)"
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"Limiteur INPI: appel non rendu: {e}")
+
+    def clear(self) -> None:
+        """Oublie tous les appels et attentes enregistrés."""
+        conn = self._connect()
+        conn.execute("DELETE FROM calls")
+        conn.execute("DELETE FROM waiters")
+
+
+class LocalRateLimiter(RateLimiter):
+    """
+    Fenêtre glissante d'appels en mémoire (processus courant), avec les mêmes files de priorité.
+
+    Limiteur de secours quand la base partagée ne peut pas être ouverte: le
+    quota n'est plus commun à la machine, mais chaque processus le respecte.
+    """
+
+    def __init__(self, rate: Optional[int] = None, period: float = 60.0,
+                 interactive_reserve: Optional[int] = None):
+        """
+        Args:
+            rate: Nombre d'appels autorisés par période (Config.INPI_RATE_LIMIT par défaut)
+            period: Durée de la fenêtre en secondes
+            interactive_reserve: Appels de la fenêtre réservés à la file interactive
+        """
+        self.rate = Config.INPI_RATE_LIMIT if rate is None else rate
+        self.period = period
+        self.interactive_reserve = (
+            Config.INPI_INTERACTIVE_RESERVE if interactive_reserve is None else interactive_reserve
+        )
+        self._calls: Deque[float] = deque()
+        self._waiters: Dict[str, Tuple[str, float]] = {}  # id -> (file, dernière tentative)
+        self._lock = threading.Lock()
+
+    def try_acquire(self, lane: str, waiter_id: str) -> float:
+        """
+        Tente de consommer un appel du quota (voir SharedRateLimiter.try_acquire).
+
+        Args:
+            lane: INTERACTIVE ou BATCH
+            waiter_id: Identifiant de l'attente en cours
+
+        Returns:
+            0 si l'appel est autorisé, sinon délai estimé avant une nouvelle tentative
+        """
+        now = time.time()
+        with self._lock:
+            while self._calls and self._calls[0] <= now - self.period:
+                self._calls.popleft()
+            for stale in [w for w, (_, seen_at) in self._waiters.items() if seen_at <= now - WAITER_TIMEOUT]:
+                del self._waiters[stale]
+
+            count = len(self._calls)
+            limit = self.rate
+            if lane == BATCH:
+                limit = max(1, self.rate - self.interactive_reserve)
+                if any(waiting_lane == INTERACTIVE for waiting_lane, _ in self._waiters.values()):
+                    count = max(count, limit)
+
+            if count < limit:
+                self._calls.append(now)
+                self._waiters.pop(waiter_id, None)
+                return 0.0
+
+            self._waiters[waiter_id] = (lane, now)
+            oldest = self._calls[0] if self._calls else None
+
+        wait = oldest + self.period - now if oldest is not None else POLL_INTERVAL
+        return max(wait, 0.01)
+
+    def _abandon(self, waiter_id: str) -> None:
+        """Retire une attente interrompue (exception, annulation)."""
+        with self._lock:
+            self._waiters.pop(waiter_id, None)
+
+    def _release(self) -> None:
+        """Rend le dernier appel consommé (accordé à une attente annulée entre-temps)."""
+        with self._lock:
+            if self._calls:
+                self._calls.pop()
+
+    def clear(self) -> None:
+        """Oublie tous les appels et attentes enregistrés."""
+        with self._lock:
+            self._calls.clear()
+            self._waiters.clear()
+
+
+_rate_limiter: Optional[RateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """
+    Retourne le limiteur INPI partagé du processus (ouvert au premier appel).
+
+    Returns:
+        Limiteur partagé, ou limiteur en mémoire du processus si la base ne peut pas être ouverte
+    """
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            try:
+                _rate_limiter = SharedRateLimiter()
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(
+                    f"Limiteur INPI partagé indisponible ({Config.INPI_RATE_LIMIT_PATH}): {e}. "
+                    f"Quota compté par processus"
+                )
+                _rate_limiter = LocalRateLimiter()
+        return _rate_limiter
@@ -0,0 +1,260 @@
+"""
+Cache des templates Word (python-docx) partagé par le processus.
+
+Chaque template est parsé une seule fois (document.xml, styles, headers,
+footers...) puis chaque génération reçoit une copie profonde de l'arbre lxml
+intact, beaucoup moins coûteuse qu'un nouveau dézippage + parsing depuis le
+disque. Le cache est invalidé lorsque le fichier change (date de modification
+ou taille).
+
+Chaque entrée porte aussi un index des paragraphes du template (chemin XML,
+texte, placeholders [Variable] et {{ARTICLE}}), calculé une seule fois: les
+générateurs ne visitent que les paragraphes concernés de leur copie, et
+l'extraction des placeholders n'a plus besoin de relire le template.
+"""
+
+import copy
+import logging
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Set, Tuple
+
+from docx import Document
+from docx.document import Document as DocumentObject, _Body
+from docx.table import Table, _Cell
+from docx.text.paragraph import Paragraph
+
+logger = logging.getLogger(__name__)
+
+VARIABLE_PLACEHOLDER_PATTERN = re.compile(r'\[([^\]]+)\]')
+ARTICLE_PLACEHOLDER_PATTERN = re.compile(r'\{\{([^}]+)\}\}')
+
+
+class ParagraphLocation(NamedTuple):
+    """Paragraphe du template et ses placeholders (texte complet, tous runs confondus)."""
+
+    path: Tuple[int, ...]  # Index des éléments successifs depuis <w:body>
+    in_table: bool
+    text: str
+    variables: Tuple[str, ...]  # [Variable]
+    articles: Tuple[str, ...]  # {{ARTICLE}}
+
+    @property
+    def has_placeholders(self) -> bool:
+        return bool(self.variables or self.articles)
+
+
+def _element_path(element, root) -> Tuple[int, ...]:
+    """Chemin d'index d'un élément lxml depuis root."""
+    path = []
+    while element is not root:
+        parent = element.getparent()
+        path.append(parent.index(element))
+        element = parent
+    return tuple(reversed(path))
+
+
+class PlaceholderIndex:
+    """Index des paragraphes d'un template (corps et cellules des tableaux)."""
+
+    def __init__(self, locations: Iterable[ParagraphLocation]):
+        self.locations = tuple(locations)
+
+    @classmethod
+    def build(cls, document: DocumentObject) -> "PlaceholderIndex":
+        """
+        Indexe les paragraphes visités par les générateurs.
+
+        Même périmètre que doc.paragraphs puis doc.tables/rows/cells/paragraphs
+        (une cellule fusionnée n'est indexée qu'une fois).
+
+        Args:
+            document: Template parsé (non modifié)
+
+        Returns:
+            Index des paragraphes dans l'ordre du document
+        """
+        body = document.element.body
+        # _Body temporaire: document.paragraphs mettrait en cache sur le template
+        # intact un _Body que deepcopy dupliquerait hors de l'arbre copié
+        story = _Body(body, document)
+        paragraphs = [(paragraph, False) for paragraph in story.paragraphs]
+        for table in story.tables:
+            for row in table.rows:
+                for cell in row.cells:
+                    paragraphs.extend((paragraph, True) for paragraph in cell.paragraphs)
+
+        locations = []
+        seen = set()
+        for paragraph, in_table in paragraphs:
+            if paragraph._p in seen:
+                continue
+            seen.add(paragraph._p)
+            text = paragraph.text
+            locations.append(ParagraphLocation(
+                _element_path(paragraph._p, body),
+                in_table,
+                text,
+                tuple(VARIABLE_PLACEHOLDER_PATTERN.findall(text)),
+                tuple(ARTICLE_PLACEHOLDER_PATTERN.findall(text))
+            ))
+        return cls(locations)
+
+    @property
+    def placeholders(self) -> Set[str]:
+        """Noms de tous les placeholders du template (sans crochets ni accolades)."""
+        names = set()
+        for location in self.locations:
+            names.update(location.variables)
+            names.update(location.articles)
+        return names
+
+    def paragraphs(
+        self,
+        document: DocumentObject,
+        in_table: bool = False,
+        containing: Tuple[str, ...] = ()
+    ) -> List[Paragraph]:
+        """
+        Paragraphes à traiter dans une copie du template.
+
+        Les éléments sont tous résolus avant que l'appelant ne modifie la copie
+        (insertions et suppressions décaleraient les chemins).
+
+        Args:
+            document: Copie du template (load_template_with_index)
+            in_table: Paragraphes des tableaux plutôt que du corps
+            containing: Retient aussi les paragraphes sans placeholder contenant tous ces mots
+
+        Returns:
+            Paragraphes python-docx de la copie, dans l'ordre du document
+        """
+        body = document.element.body
+        story = document._body
+        result = []
+        for location in self.locations:
+            if location.in_table != in_table:
+                continue
+            if not location.has_placeholders and not (
+                containing and all(word in location.text for word in containing)
+            ):
+                continue
+
+            element = body
+            for i in location.path:
+                element = element[i]
+
+            if in_table:
+                parent = _Cell(element.getparent(), Table(body[location.path[0]], story))
+            else:
+                parent = story
+            result.append(Paragraph(element, parent))
+        return result
+
+
+class CachedTemplate(NamedTuple):
+    """Template parsé et version du fichier correspondante."""
+
+    path: str
+    mtime: int
+    size: int
+    document: DocumentObject  # Intact: ne jamais modifier, toujours copier
+    index: PlaceholderIndex
+
+
+class TemplateCache:
+    """Templates Word parsés, indexés par chemin absolu."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._templates: Dict[str, CachedTemplate] = {}
+
+    def get(self, template_path) -> CachedTemplate:
+        """
+        Retourne le template parsé à jour (à ne pas modifier).
+
+        Args:
+            template_path: Chemin du template .docx
+
+        Returns:
+            Entrée de cache du template
+        """
+        path = str(Path(template_path).resolve())
+
+        with self._lock:
+            stat = os.stat(path)
+            cached = self._templates.get(path)
+            if cached is None or (cached.mtime, cached.size) != (stat.st_mtime_ns, stat.st_size):
+                document = Document(path)
+                cached = CachedTemplate(
+                    path, stat.st_mtime_ns, stat.st_size, document, PlaceholderIndex.build(document)
+                )
+                self._templates[path] = cached
+                logger.info(f"Template parsé et mis en cache: {Path(path).name}")
+            return cached
+
+    def load_document(self, template_path) -> DocumentObject:
+        """
+        Retourne une copie modifiable du template.
+
+        Args:
+            template_path: Chemin du template .docx
+
+        Returns:
+            Document python-docx indépendant du cache
+        """
+        return copy.deepcopy(self.get(template_path).document)
+
+    def load_document_with_index(self, template_path) -> Tuple[DocumentObject, PlaceholderIndex]:
+        """
+        Retourne une copie modifiable du template et l'index de ses paragraphes.
+
+        Args:
+            template_path: Chemin du template .docx
+
+        Returns:
+            Tuple (copie du document, index partagé du template)
+        """
+        cached = self.get(template_path)
+        return copy.deepcopy(cached.document), cached.index
+
+    def clear(self) -> None:
+        """Vide le cache (force le parsing au prochain accès)."""
+        with self._lock:
+            self._templates.clear()
+
+
+_template_cache = TemplateCache()
+
+
+def load_template(template_path) -> DocumentObject:
+    """
+    Charge un template Word depuis le cache partagé du processus.
+
+    Args:
+        template_path: Chemin du template .docx
+
+    Returns:
+        Copie du template, prête à être modifiée puis sauvegardée
+    """
+    return _template_cache.load_document(template_path)
+
+
+def load_template_with_index(template_path) -> Tuple[DocumentObject, PlaceholderIndex]:
+    """
+    Charge un template Word depuis le cache avec l'index de ses placeholders.
+
+    Args:
+        template_path: Chemin du template .docx
+
+    Returns:
+        Tuple (copie du template, index à utiliser avec cette copie)
+    """
+    return _template_cache.load_document_with_index(template_path)
+
+
+def get_template_cache() -> TemplateCache:
+    """Retourne le cache de templates partagé du processus."""
+    return _template_cache
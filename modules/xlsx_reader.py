@@ -0,0 +1,362 @@
+"""
+Lecteur xlsx minimal en streaming (zip + iterparse).
+
+Contrairement à openpyxl, il permet de lire en une seule passe la valeur en
+cache ET la formule d'une cellule, et ne parse que les onglets demandés.
+
+read_cells lit seulement quelques cellules, typées comme openpyxl en mode
+data_only (dates selon les formats de styles.xml). La lecture s'arrête après
+la dernière ligne demandée, et seules les chaînes partagées utilisées sont
+décodées.
+"""
+
+import io
+import posixpath
+import re
+import zipfile
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple, Union
+from xml.etree.ElementTree import iterparse
+
+from openpyxl.formula.translate import Translator
+from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format, is_timedelta_format
+from openpyxl.utils import column_index_from_string
+from openpyxl.utils.datetime import CALENDAR_MAC_1904, CALENDAR_WINDOWS_1900, from_ISO8601, from_excel
+
+NS_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+NS_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+NS_PKG_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+CELL_REF_PATTERN = re.compile(r"^\$?([A-Za-z]{1,3})\$?(\d+)$")
+
+
+class XlsxCell(NamedTuple):
+    """Cellule lue: valeur en cache et formule éventuelle (préfixée par '=')."""
+
+    row: int
+    column: int
+    value: Any
+    formula: Optional[str]
+
+
+def split_cell_ref(cell_ref: str) -> tuple:
+    """
+    Découpe une référence de cellule.
+
+    Args:
+        cell_ref: Référence (ex: "B23" ou "$B$23")
+
+    Returns:
+        Tuple (ligne, colonne) en index 1
+    """
+    match = CELL_REF_PATTERN.match(cell_ref.strip())
+    if not match:
+        raise ValueError(f"Référence de cellule invalide: {cell_ref}")
+    return int(match.group(2)), column_index_from_string(match.group(1).upper())
+
+
+def _cast_number(text: str) -> Union[int, float]:
+    """Convertit une valeur numérique comme openpyxl (int si pas de décimale)."""
+    if "." in text or "E" in text or "e" in text:
+        return float(text)
+    return int(text)
+
+
+def _text_content(element) -> str:
+    """Concatène les <t> d'un <si> ou <is> (texte riche), hors phonétique."""
+    parts = []
+    for child in element:
+        if child.tag == f"{NS_MAIN}t":
+            parts.append(child.text or "")
+        elif child.tag == f"{NS_MAIN}r":
+            t = child.find(f"{NS_MAIN}t")
+            if t is not None:
+                parts.append(t.text or "")
+    return "".join(parts)
+
+
+def _shared_string(element) -> str:
+    """Texte d'une chaîne partagée <si>, comme openpyxl (sans mise en forme, échappement x005F_ retiré)."""
+    return _text_content(element).replace("x005F_", "")
+
+
+class XlsxReader:
+    """Lecture en streaming des cellules d'un classeur xlsx."""
+
+    def __init__(self, source: Union[str, Path, bytes, BinaryIO]):
+        """
+        Ouvre le classeur.
+
+        Args:
+            source: Chemin, contenu binaire ou fichier ouvert en binaire
+        """
+        if isinstance(source, (bytes, bytearray)):
+            source = io.BytesIO(source)
+        try:
+            self._zip = zipfile.ZipFile(source)
+        except zipfile.BadZipFile as e:
+            raise ValueError(f"Fichier xlsx invalide: {e}")
+        self._epoch = CALENDAR_WINDOWS_1900
+        self._sheet_parts = self._read_sheet_parts()
+        self._shared_strings: Optional[List[str]] = None
+        self._date_styles: Optional[Tuple[Set[int], Set[int]]] = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        self._zip.close()
+
+    @property
+    def sheetnames(self) -> List[str]:
+        return list(self._sheet_parts)
+
+    def _read_sheet_parts(self) -> Dict[str, str]:
+        """Résout nom d'onglet → chemin de la partie XML via workbook.xml et ses relations."""
+        targets = {}
+        with self._zip.open("xl/_rels/workbook.xml.rels") as f:
+            for _, element in iterparse(f):
+                if element.tag == f"{NS_PKG_REL}Relationship":
+                    target = element.get("Target", "")
+                    if target.startswith("/"):
+                        target = target.lstrip("/")
+                    else:
+                        target = posixpath.normpath(posixpath.join("xl", target))
+                    targets[element.get("Id")] = target
+
+        sheets = {}
+        with self._zip.open("xl/workbook.xml") as f:
+            for _, element in iterparse(f):
+                if element.tag == f"{NS_MAIN}sheet":
+                    target = targets.get(element.get(f"{NS_REL}id"))
+                    if target:
+                        sheets[element.get("name")] = target
+                elif element.tag == f"{NS_MAIN}workbookPr":
+                    if element.get("date1904") in ("1", "true"):
+                        self._epoch = CALENDAR_MAC_1904
+        return sheets
+
+    def _get_shared_strings(self) -> List[str]:
+        if self._shared_strings is None:
+            strings = []
+            if "xl/sharedStrings.xml" in self._zip.namelist():
+                with self._zip.open("xl/sharedStrings.xml") as f:
+                    for _, element in iterparse(f):
+                        if element.tag == f"{NS_MAIN}si":
+                            strings.append(_shared_string(element))
+                            element.clear()
+            self._shared_strings = strings
+        return self._shared_strings
+
+    def _get_shared_strings_subset(self, indices: Set[int]) -> Dict[int, str]:
+        """Chaînes partagées demandées, sans décoder les autres ni lire au-delà de la plus grande."""
+        if self._shared_strings is not None:
+            return {i: self._shared_strings[i] for i in indices if i < len(self._shared_strings)}
+
+        strings = {}
+        if indices and "xl/sharedStrings.xml" in self._zip.namelist():
+            last = max(indices)
+            index = 0
+            with self._zip.open("xl/sharedStrings.xml") as f:
+                for _, element in iterparse(f):
+                    if element.tag != f"{NS_MAIN}si":
+                        continue
+                    if index in indices:
+                        strings[index] = _shared_string(element)
+                    element.clear()
+                    if index >= last:
+                        break
+                    index += 1
+        return strings
+
+    def _get_date_styles(self) -> Tuple[Set[int], Set[int]]:
+        """Index des styles de cellule (cellXfs) au format date, et ceux au format durée."""
+        if self._date_styles is None:
+            dates, durations = set(), set()
+            if "xl/styles.xml" in self._zip.namelist():
+                custom = {}
+                in_cell_xfs = False
+                index = 0
+                with self._zip.open("xl/styles.xml") as f:
+                    for event, element in iterparse(f, events=("start", "end")):
+                        tag = element.tag
+                        if tag == f"{NS_MAIN}numFmt" and event == "end":
+                            custom[int(element.get("numFmtId"))] = element.get("formatCode")
+                        elif tag == f"{NS_MAIN}cellXfs":
+                            in_cell_xfs = event == "start"
+                            if not in_cell_xfs:
+                                break
+                        elif tag == f"{NS_MAIN}xf" and in_cell_xfs and event == "start":
+                            num_fmt_id = int(element.get("numFmtId", 0))
+                            fmt = custom.get(num_fmt_id) or BUILTIN_FORMATS.get(num_fmt_id)
+                            if fmt and is_date_format(fmt):
+                                dates.add(index)
+                            if fmt and is_timedelta_format(fmt):
+                                durations.add(index)
+                            index += 1
+            self._date_styles = (dates, durations)
+        return self._date_styles
+
+    def _decode_number(self, raw: str, style: Optional[str]) -> Any:
+        """Nombre d'une cellule, converti en date ou durée si son style l'indique (comme openpyxl)."""
+        value = _cast_number(raw)
+        if style:
+            dates, durations = self._get_date_styles()
+            style_id = int(style)
+            if style_id in dates:
+                try:
+                    return from_excel(value, self._epoch, timedelta=style_id in durations)
+                except (OverflowError, ValueError):
+                    return "#VALUE!"
+        return value
+
+    def _decode_value(self, cell_type: Optional[str], raw: Optional[str], element) -> Any:
+        if cell_type == "inlineStr":
+            inline = element.find(f"{NS_MAIN}is")
+            return _text_content(inline) if inline is not None else None
+        if not raw:
+            return None
+        if cell_type == "s":
+            return self._get_shared_strings()[int(raw)]
+        if cell_type in ("str", "e"):
+            return raw
+        if cell_type == "b":
+            return raw == "1"
+        if cell_type == "d":
+            return from_ISO8601(raw)
+        return _cast_number(raw)
+
+    def iter_cells(
+        self,
+        sheet_name: str,
+        columns: Optional[Iterable[int]] = None,
+        max_row: Optional[int] = None,
+        formulas: bool = True
+    ) -> Iterator[XlsxCell]:
+        """
+        Parcourt les cellules non vides d'un onglet, ligne par ligne.
+
+        Args:
+            sheet_name: Nom de l'onglet
+            columns: Index (1-based) des colonnes à retenir (toutes par défaut)
+            max_row: Arrête la lecture après cette ligne
+            formulas: Lire aussi les formules (sinon formula vaut toujours None)
+
+        Yields:
+            Cellules avec valeur en cache et formule
+        """
+        shared_formulas: Dict[str, Translator] = {}
+        for row, col, ref, element in self._iter_cell_elements(sheet_name, columns, max_row):
+            formula = None
+            f_element = element.find(f"{NS_MAIN}f") if formulas else None
+            if f_element is not None:
+                formula = self._read_formula(f_element, ref, shared_formulas)
+
+            raw = element.findtext(f"{NS_MAIN}v")
+            value = self._decode_value(element.get("t"), raw, element)
+
+            if value is not None or formula is not None:
+                yield XlsxCell(row, col, value, formula)
+
+    def read_cells(self, sheet_name: str, cells: Iterable[Tuple[int, int]]) -> Dict[Tuple[int, int], Any]:
+        """
+        Lit uniquement les cellules demandées d'un onglet, typées comme openpyxl (data_only).
+
+        Args:
+            sheet_name: Nom de l'onglet
+            cells: Coordonnées (ligne, colonne) en index 1
+
+        Returns:
+            Dictionnaire {(ligne, colonne): valeur}, None pour une cellule vide
+        """
+        values: Dict[Tuple[int, int], Any] = {cell: None for cell in cells}
+        if not values:
+            return values
+
+        max_row = max(row for row, _ in values)
+        columns = {col for _, col in values}
+        shared: Dict[Tuple[int, int], int] = {}  # cellule -> index de chaîne partagée
+
+        rows = {row for row, _ in values}
+        for row, col, _, element in self._iter_cell_elements(sheet_name, columns, max_row, rows):
+            if (row, col) not in values:
+                continue
+            cell_type = element.get("t", "n")
+            raw = element.findtext(f"{NS_MAIN}v") or None
+            if raw is None and cell_type != "inlineStr":
+                continue
+            if cell_type == "s":
+                shared[(row, col)] = int(raw)
+            elif cell_type == "n":
+                values[(row, col)] = self._decode_number(raw, element.get("s"))
+            else:
+                values[(row, col)] = self._decode_value(cell_type, raw, element)
+
+        if shared:
+            strings = self._get_shared_strings_subset(set(shared.values()))
+            for cell, index in shared.items():
+                values[cell] = strings.get(index)
+        return values
+
+    def _iter_cell_elements(
+        self,
+        sheet_name: str,
+        columns: Optional[Iterable[int]],
+        max_row: Optional[int],
+        rows: Optional[Set[int]] = None
+    ) -> Iterator[Tuple[int, int, Optional[str], Any]]:
+        """Éléments <c> d'un onglet (ligne, colonne, référence, élément), jusqu'à max_row."""
+        if sheet_name not in self._sheet_parts:
+            raise KeyError(f"Worksheet {sheet_name} does not exist.")
+
+        columns = set(columns) if columns is not None else None
+        current_row = 0
+        current_col = 0
+        skip_row = False
+
+        with self._zip.open(self._sheet_parts[sheet_name]) as f:
+            for event, element in iterparse(f, events=("start", "end")):
+                tag = element.tag
+                if tag == f"{NS_MAIN}row":
+                    if event == "start":
+                        row_ref = element.get("r")
+                        current_row = int(row_ref) if row_ref else current_row + 1
+                        current_col = 0
+                        if max_row is not None and current_row > max_row:
+                            break
+                        skip_row = rows is not None and current_row not in rows
+                    else:
+                        element.clear()
+                    continue
+                if tag != f"{NS_MAIN}c" or event != "end" or skip_row:
+                    continue
+
+                # La ligne est celle de <row>: seule la colonne est lue dans la référence ("B23")
+                ref = element.get("r")
+                if ref:
+                    current_col = column_index_from_string(ref.rstrip("0123456789"))
+                else:
+                    current_col += 1
+
+                if columns is not None and current_col not in columns:
+                    continue
+
+                yield current_row, current_col, ref, element
+
+    @staticmethod
+    def _read_formula(f_element, ref: Optional[str], shared_formulas: Dict[str, Translator]) -> Optional[str]:
+        """Formule d'une cellule, en traduisant les formules partagées."""
+        text = f_element.text
+        if f_element.get("t") == "shared":
+            si = f_element.get("si")
+            if text:
+                # Formule maîtresse: tokenisée une seule fois pour toutes les cellules qui la partagent
+                shared_formulas[si] = Translator(f"={text}", origin=ref)
+                return f"={text}"
+            if si in shared_formulas and ref:
+                return shared_formulas[si].translate_formula(ref)
+            return None
+        return f"={text}" if text else None
@@ -0,0 +1,150 @@
+"""
+Test du pool de navigateurs Playwright (modules/browser_pool.py).
+
+Le navigateur est remplacé par un faux navigateur qui compte ses lancements,
+ses pages et ses fermetures: le test vérifie la logique du pool (navigateur
+gardé chaud par thread, relance après max_uses pages ou déconnexion, nombre
+de pages simultanées borné, fermeture de tous les navigateurs) sans lancer
+Chromium.
+"""
+
+import threading
+import time
+
+from modules import browser_pool
+from modules.browser_pool import BrowserPool
+
+
+class FauxNavigateur:
+    """Remplace browser_pool._Browser: même interface, aucun processus lancé."""
+
+    lances = []
+    fermes = []
+    verrou = threading.Lock()
+
+    def __init__(self):
+        self.uses = 0
+        self.connecte = True
+        self.thread = threading.current_thread().name
+        self.browser = self
+        self.context = self
+        with self.verrou:
+            self.lances.append(self)
+
+    def is_connected(self) -> bool:
+        return self.connecte
+
+    def new_page(self):
+        return FaussePage(self)
+
+    def close(self) -> None:
+        assert threading.current_thread().name == self.thread  # fermé par son thread propriétaire
+        with self.verrou:
+            self.fermes.append(self)
+
+
+class FaussePage:
+    def __init__(self, navigateur: FauxNavigateur):
+        self.navigateur = navigateur
+        self.fermee = False
+
+    def close(self) -> None:
+        self.fermee = True
+
+
+def pool_de_test(max_pages: int, max_uses: int) -> BrowserPool:
+    FauxNavigateur.lances, FauxNavigateur.fermes = [], []
+    return BrowserPool(max_pages=max_pages, max_uses=max_uses)
+
+
+def avec_faux_navigateur(test):
+    """Exécute le test avec FauxNavigateur à la place du navigateur Playwright."""
+
+    def wrapper():
+        navigateur = browser_pool._Browser
+        browser_pool._Browser = FauxNavigateur
+        try:
+            test()
+        finally:
+            browser_pool._Browser = navigateur
+
+    wrapper.__name__, wrapper.__doc__ = test.__name__, test.__doc__
+    return wrapper
+
+
+@avec_faux_navigateur
+def test_navigateur_reutilise_puis_recycle():
+    """Le navigateur d'un thread sert plusieurs pages, puis est relancé après max_uses pages."""
+    pool = pool_de_test(max_pages=1, max_uses=3)
+    pages = [pool.run(lambda page: page) for _ in range(5)]
+    pool.close()
+
+    assert all(page.fermee for page in pages)
+    assert len(FauxNavigateur.lances) == 2
+    assert [page.navigateur for page in pages[:3]] == [FauxNavigateur.lances[0]] * 3
+    assert FauxNavigateur.lances[0] in FauxNavigateur.fermes
+    assert len(FauxNavigateur.fermes) == 2  # le second fermé par pool.close()
+
+
+@avec_faux_navigateur
+def test_navigateur_deconnecte_relance():
+    """Un navigateur déconnecté (crash de Chromium) est relancé pour la page suivante."""
+    pool = pool_de_test(max_pages=1, max_uses=100)
+
+    def plantage(page):
+        page.navigateur.connecte = False
+        raise RuntimeError("Target closed")
+
+    try:
+        pool.run(plantage)
+        assert False, "exception de la page non propagée"
+    except RuntimeError:
+        pass
+    page = pool.run(lambda page: page)
+    pool.close()
+
+    assert len(FauxNavigateur.lances) == 2 and page.navigateur is FauxNavigateur.lances[1]
+
+
+@avec_faux_navigateur
+def test_pages_simultanees_bornees():
+    """Jamais plus de max_pages pages ouvertes en même temps, un navigateur par thread."""
+    pool = pool_de_test(max_pages=2, max_uses=100)
+    ouvertes, maximum = 0, 0
+    verrou = threading.Lock()
+
+    def page_lente(page, index):
+        nonlocal ouvertes, maximum
+        with verrou:
+            ouvertes += 1
+            maximum = max(maximum, ouvertes)
+        time.sleep(0.05)
+        with verrou:
+            ouvertes -= 1
+        return index
+
+    resultats = []
+    threads = [threading.Thread(target=lambda i=i: resultats.append(pool.run(page_lente, i, timeout=5)))
+               for i in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    pool.close()
+
+    assert sorted(resultats) == list(range(6))
+    assert maximum == 2
+    assert len(FauxNavigateur.lances) == 2
+    assert len(FauxNavigateur.fermes) == 2
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("TEST DU POOL DE NAVIGATEURS")
+    print("=" * 60)
+    for test in (test_navigateur_reutilise_puis_recycle, test_navigateur_deconnecte_relance,
+                 test_pages_simultanees_bornees):
+        test()
+        print(f"✅ {test.__doc__}")
+    print("=" * 60)
+    print("✅ TOUS LES TESTS ONT RÉUSSI")
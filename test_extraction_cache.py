@@ -0,0 +1,113 @@
+"""
+Test du cache disque des extractions (modules/extraction_cache.py).
+
+Vérifie les clés de contenu, la lecture et l'écriture des extractions,
+l'éviction des moins récemment utilisées au-delà de max_bytes et la date
+d'utilisation rafraîchie au plus une fois par USED_AT_REFRESH secondes.
+"""
+
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from modules import extraction_cache
+from modules.extraction_cache import ExtractionCache, content_sha256, extraction_key
+
+EXTRACTION = {"variables": {"Nom Preneur": "SCI FORGEOT PROPERTY", "Loyer": 12500.0}, "siret": "12345678900012"}
+TAILLE = len('{"x": "' + "a" * 100 + '"}')
+
+
+def extraction(lettre: str) -> dict:
+    """Extraction de TAILLE octets une fois sérialisée."""
+    return {"x": lettre * 100}
+
+
+def date_utilisation(cache: ExtractionCache, key: str) -> float:
+    with sqlite3.connect(cache.path) as conn:
+        return conn.execute("SELECT used_at FROM extractions WHERE key = ?", (key,)).fetchone()[0]
+
+
+def test_empreinte_du_contenu():
+    """Même contenu, même empreinte, que la fiche soit lue sur disque ou en mémoire."""
+    with tempfile.TemporaryDirectory() as dossier:
+        fichier = Path(dossier) / "fiche.xlsx"
+        fichier.write_bytes(b"contenu de la fiche")
+        assert content_sha256(fichier) == content_sha256(b"contenu de la fiche")
+        assert content_sha256(str(fichier)) != content_sha256(b"autre fiche")
+        assert extraction_key("a" * 64, "b" * 64, 3) == f"{'a' * 64}:{'b' * 64}:3"
+
+
+def test_lecture_et_ecriture():
+    """Une extraction enregistrée est relue à l'identique, par une autre instance aussi."""
+    with tempfile.TemporaryDirectory() as dossier:
+        cache = ExtractionCache(Path(dossier) / "cache.sqlite")
+        assert cache.get("fiche") is None
+        cache.set("fiche", EXTRACTION)
+        assert cache.get("fiche") == EXTRACTION
+        assert ExtractionCache(Path(dossier) / "cache.sqlite").get("fiche") == EXTRACTION
+
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+
+def test_eviction_des_moins_recemment_utilisees():
+    """Au-delà de max_bytes, l'entrée la moins récemment utilisée est évincée."""
+    refresh = extraction_cache.USED_AT_REFRESH
+    extraction_cache.USED_AT_REFRESH = 0
+    try:
+        with tempfile.TemporaryDirectory() as dossier:
+            cache = ExtractionCache(Path(dossier) / "cache.sqlite", max_bytes=2 * TAILLE)
+            cache.set("a", extraction("a"))
+            time.sleep(0.01)
+            cache.set("b", extraction("b"))
+            time.sleep(0.01)
+            assert cache.get("a") == extraction("a")  # a redevient la plus récente
+            time.sleep(0.01)
+            cache.set("c", extraction("c"))
+
+            assert cache.get("b") is None
+            assert cache.get("a") == extraction("a")
+            assert cache.get("c") == extraction("c")
+            assert cache.stats()["bytes"] == 2 * TAILLE
+    finally:
+        extraction_cache.USED_AT_REFRESH = refresh
+
+
+def test_date_utilisation_rafraichie_rarement():
+    """Une lecture ne réécrit la date d'utilisation que si elle date de plus de USED_AT_REFRESH."""
+    with tempfile.TemporaryDirectory() as dossier:
+        cache = ExtractionCache(Path(dossier) / "cache.sqlite")
+        cache.set("fiche", EXTRACTION)
+        ecriture = date_utilisation(cache, "fiche")
+
+        time.sleep(0.01)
+        cache.get("fiche")
+        assert date_utilisation(cache, "fiche") == ecriture
+
+        with sqlite3.connect(cache.path) as conn:
+            conn.execute("UPDATE extractions SET used_at = ?",
+                         (time.time() - extraction_cache.USED_AT_REFRESH - 1,))
+        cache.get("fiche")
+        assert date_utilisation(cache, "fiche") > time.time() - 5
+
+
+def test_extraction_non_serialisable():
+    """Une extraction non sérialisable en JSON n'est pas mise en cache."""
+    with tempfile.TemporaryDirectory() as dossier:
+        cache = ExtractionCache(Path(dossier) / "cache.sqlite")
+        cache.set("fiche", {"valeur": object()})
+        assert cache.get("fiche") is None
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("TEST DU CACHE DES EXTRACTIONS")
+    print("=" * 60)
+    for test in (test_empreinte_du_contenu, test_lecture_et_ecriture,
+                 test_eviction_des_moins_recemment_utilisees, test_date_utilisation_rafraichie_rarement,
+                 test_extraction_non_serialisable):
+        test()
+        print(f"✅ {test.__doc__}")
+    print("=" * 60)
+    print("✅ TOUS LES TESTS ONT RÉUSSI")
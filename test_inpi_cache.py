@@ -0,0 +1,97 @@
+"""
+Test du cache persistant des enrichissements INPI (modules/inpi_cache.py).
+
+Vérifie l'expiration des entrées (TTL), la durée plus courte des SIREN
+inconnus (cache négatif), les données expirées servies en secours et la purge.
+"""
+
+import tempfile
+import time
+from pathlib import Path
+
+from modules.inpi_cache import INPICache
+
+RESULTAT = {
+    "NOM DE LA SOCIETE": "SCI FORGEOT PROPERTY",
+    "TYPE DE SOCIETE": "SCI (Société Civile Immobilière)",
+    "enrichment_status": "success",
+    "error_message": "",
+}
+INCONNU = {"NOM DE LA SOCIETE": "", "enrichment_status": "failed", "error_message": "Entreprise non trouvée"}
+
+
+def nouveau_cache(dossier: str, ttl: float = 60, negative_ttl: float = 60) -> INPICache:
+    return INPICache(Path(dossier) / "inpi_cache.sqlite", ttl=ttl, negative_ttl=negative_ttl)
+
+
+def test_entree_valide_puis_expiree():
+    """Une entrée est servie pendant ttl secondes, puis ignorée."""
+    with tempfile.TemporaryDirectory() as dossier:
+        cache = nouveau_cache(dossier, ttl=0.3)
+        assert cache.get("123456789") is None
+
+        cache.set("123456789", RESULTAT)
+        assert cache.get("123456789") == RESULTAT
+
+        time.sleep(0.4)
+        assert cache.get("123456789") is None
+        assert cache.stats() == {"hits": 1, "misses": 2, "entries": 1}
+
+
+def test_cache_negatif_plus_court():
+    """Les SIREN inconnus expirent après negative_ttl, sans toucher aux entrées réussies."""
+    with tempfile.TemporaryDirectory() as dossier:
+        cache = nouveau_cache(dossier, ttl=60, negative_ttl=0.3)
+        cache.set("111111111", RESULTAT)
+        cache.set("222222222", INCONNU, not_found=True)
+        assert cache.get("222222222") == INCONNU
+
+        time.sleep(0.4)
+        assert cache.get("222222222") is None
+        assert cache.get("111111111") == RESULTAT
+
+
+def test_donnees_expirees_en_secours():
+    """get_stale sert un résultat réussi expiré, jamais un SIREN inconnu."""
+    with tempfile.TemporaryDirectory() as dossier:
+        cache = nouveau_cache(dossier, ttl=0.1, negative_ttl=0.1)
+        cache.set("111111111", RESULTAT)
+        cache.set("222222222", INCONNU, not_found=True)
+        time.sleep(0.2)
+
+        assert cache.get("111111111") is None
+        assert cache.get_stale("111111111") == RESULTAT
+        assert cache.get_stale("222222222") is None
+
+
+def test_purge_des_entrees_expirees():
+    """purge_expired supprime les entrées expirées (positives et négatives) et garde les autres."""
+    with tempfile.TemporaryDirectory() as dossier:
+        cache = nouveau_cache(dossier, ttl=60, negative_ttl=0.1)
+        cache.set("111111111", RESULTAT)
+        cache.set("222222222", INCONNU, not_found=True)
+        time.sleep(0.2)
+
+        assert cache.purge_expired() == 1
+        assert cache.stats()["entries"] == 1
+        assert cache.get("111111111") == RESULTAT
+
+
+def test_partage_entre_instances():
+    """Deux instances sur la même base (deux processus) voient les mêmes entrées."""
+    with tempfile.TemporaryDirectory() as dossier:
+        nouveau_cache(dossier).set("123456789", RESULTAT)
+        assert nouveau_cache(dossier).get("123456789") == RESULTAT
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("TEST DU CACHE INPI")
+    print("=" * 60)
+    for test in (test_entree_valide_puis_expiree, test_cache_negatif_plus_court,
+                 test_donnees_expirees_en_secours, test_purge_des_entrees_expirees,
+                 test_partage_entre_instances):
+        test()
+        print(f"✅ {test.__doc__}")
+    print("=" * 60)
+    print("✅ TOUS LES TESTS ONT RÉUSSI")
@@ -0,0 +1,179 @@
+"""
+Test de la résilience de l'enrichissement INPI (disjoncteur et cache négatif).
+
+Vérifie les transitions du disjoncteur (fermé, ouvert, semi-ouvert) et qu'un
+SIREN n'est mis en cache négatif que si son absence est avérée: réponse vide
+de l'API ET page data.inpi.fr qui répond, jamais après une panne du scraping
+de secours. Aucun appel réseau: la session HTTP est simulée.
+"""
+
+import asyncio
+import logging
+import time
+
+import requests
+
+from modules import inpi_async, inpi_client
+from modules.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from modules.inpi_client import COMPANY_NOT_FOUND, INPIClient
+from modules.rate_limiter import INTERACTIVE, LocalRateLimiter
+
+logging.disable(logging.WARNING)
+
+SIREN = "123456789"
+
+
+class CacheMemoire:
+    """Cache INPI minimal qui enregistre les écritures."""
+
+    def __init__(self):
+        self.ecritures = []
+
+    def get(self, siren):
+        return None
+
+    def get_stale(self, siren):
+        return None
+
+    def set(self, siren, result, not_found=False):
+        self.ecritures.append((siren, not_found))
+
+
+class Reponse:
+    def __init__(self, status_code: int):
+        self.status_code = status_code
+        self.content = b"<html><body></body></html>"
+        self.headers = {}
+
+
+def page(status_code: int):
+    return lambda *args, **kwargs: Reponse(status_code)
+
+
+def page_en_timeout(*args, **kwargs):
+    raise requests.exceptions.Timeout("data.inpi.fr ne répond pas")
+
+
+def client_simule(envoi) -> INPIClient:
+    """Client dont l'API ne connaît pas le SIREN et dont la page data.inpi.fr est simulée."""
+    client = INPIClient("utilisateur", "mot de passe")
+    client._search_by_siren = lambda siren: COMPANY_NOT_FOUND
+    client._send = envoi
+    return client
+
+
+def test_disjoncteur_transitions():
+    """Fermé -> ouvert au seuil -> semi-ouvert après la période -> refermé ou rouvert."""
+    disjoncteur = CircuitBreaker("test", threshold=2, cooldown=0.2)
+    assert disjoncteur.allow() and disjoncteur.state == CLOSED
+
+    disjoncteur.record_failure()
+    assert disjoncteur.state == CLOSED
+    disjoncteur.record_failure()
+    assert disjoncteur.state == OPEN and disjoncteur.is_open and not disjoncteur.allow()
+
+    time.sleep(0.25)
+    assert not disjoncteur.is_open
+    assert disjoncteur.allow() and disjoncteur.state == HALF_OPEN
+    assert not disjoncteur.allow()  # un seul appel de test
+
+    disjoncteur.record_failure()  # l'appel de test échoue: rouvert
+    assert disjoncteur.state == OPEN and not disjoncteur.allow()
+
+    time.sleep(0.25)
+    assert disjoncteur.allow()
+    disjoncteur.record_success()
+    assert disjoncteur.state == CLOSED and disjoncteur.failures == 0
+
+
+def test_disjoncteur_succes_remet_a_zero():
+    """Un succès entre deux échecs remet le compteur à zéro."""
+    disjoncteur = CircuitBreaker("test", threshold=2, cooldown=60)
+    disjoncteur.record_failure()
+    disjoncteur.record_success()
+    disjoncteur.record_failure()
+    assert disjoncteur.state == CLOSED
+
+
+def test_disjoncteur_seuil_explicite():
+    """Un seuil explicite est respecté, même nul (ouverture au premier échec)."""
+    disjoncteur = CircuitBreaker("test", threshold=0, cooldown=60)
+    assert disjoncteur.threshold == 0
+    disjoncteur.record_failure()
+    assert disjoncteur.state == OPEN
+
+
+def enrichir(envoi):
+    """Écritures du cache après un enrichissement synchrone."""
+    cache, get_inpi_cache = CacheMemoire(), inpi_client.get_inpi_cache
+    inpi_client.get_inpi_cache = lambda: cache
+    try:
+        resultat = client_simule(envoi).get_company_info(SIREN)
+    finally:
+        inpi_client.get_inpi_cache = get_inpi_cache
+    assert resultat["enrichment_status"] == "failed"
+    return cache.ecritures
+
+
+def test_cache_negatif_si_absence_averee():
+    """API sans résultat et page absente (404) ou vide: SIREN mis en cache négatif."""
+    assert enrichir(page(404)) == [(SIREN, True)]
+    assert enrichir(page(200)) == [(SIREN, True)]
+
+
+def test_pas_de_cache_negatif_si_le_scraping_echoue():
+    """API sans résultat mais scraping en panne (timeout, 5xx): rien n'est mis en cache."""
+    assert enrichir(page_en_timeout) == []
+    assert enrichir(page(503)) == []
+
+
+def enrichir_async(envoi):
+    """Écritures du cache après un enrichissement asynchrone (API: SIREN inconnu)."""
+
+    class ClientAsync(inpi_async.AsyncINPIClient):
+        async def _from_api(self, siren, end):
+            raise inpi_async._NotFound(siren)
+
+    cache, get_inpi_cache = CacheMemoire(), inpi_async.get_inpi_cache
+    inpi_async.get_inpi_cache = lambda: cache
+    try:
+        client = ClientAsync(client_simule(envoi), limiter=object())
+        asyncio.run(client.get_company_info(SIREN, deadline=5))
+    finally:
+        inpi_async.get_inpi_cache = get_inpi_cache
+    return cache.ecritures
+
+
+def test_cache_negatif_asynchrone():
+    """Même règle pour l'enrichissement asynchrone."""
+    assert enrichir_async(page(404)) == [(SIREN, True)]
+    assert enrichir_async(page_en_timeout) == []
+
+
+def test_quota_sature_borne_par_l_echeance():
+    """Quota saturé: l'API abandonne à l'échéance de la course (None) sans consommer d'appel."""
+    limiteur = LocalRateLimiter(rate=1, period=60, interactive_reserve=0)
+    assert limiteur.try_acquire(INTERACTIVE, "premier") == 0
+    client = inpi_async.AsyncINPIClient(client_simule(page(404)), limiter=limiteur)
+
+    async def scenario():
+        debut = asyncio.get_running_loop().time()
+        reponse = await client._from_api(SIREN, debut + 0.3)
+        return reponse, asyncio.get_running_loop().time() - debut
+
+    reponse, duree = asyncio.run(scenario())
+    assert reponse is None and duree < 1
+    assert len(limiteur._calls) == 1
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("TEST DE LA RÉSILIENCE INPI")
+    print("=" * 60)
+    for test in (test_disjoncteur_transitions, test_disjoncteur_succes_remet_a_zero, test_disjoncteur_seuil_explicite,
+                 test_cache_negatif_si_absence_averee, test_pas_de_cache_negatif_si_le_scraping_echoue,
+                 test_cache_negatif_asynchrone, test_quota_sature_borne_par_l_echeance):
+        test()
+        print(f"✅ {test.__doc__}")
+    print("=" * 60)
+    print("✅ TOUS LES TESTS ONT RÉUSSI")
@@ -0,0 +1,112 @@
+"""
+Test du registre local des entreprises (modules/offline_registry.py).
+
+Importe l'export d'exemple (Exemples/registre_entreprises_exemple.csv) puis un
+export aux colonnes SIRENE, et vérifie que le registre répond avec le même
+contrat que INPIClient.get_company_info, sans réseau.
+"""
+
+import tempfile
+from pathlib import Path
+
+from modules import offline_registry
+from modules.config import Config
+from modules.offline_registry import OfflineRegistryClient, import_registry
+
+EXEMPLE = Path(__file__).parent / "Exemples" / "registre_entreprises_exemple.csv"
+
+
+def test_import_de_l_exemple():
+    """L'export d'exemple est importé et chaque SIREN donne un résultat complet."""
+    with tempfile.TemporaryDirectory() as dossier:
+        base = Path(dossier) / "registre.sqlite"
+        assert import_registry(EXEMPLE, base) == 4
+
+        resultat = OfflineRegistryClient(base).get_company_info("55210055400012")
+        assert resultat == {
+            "NOM DE LA SOCIETE": "KARAVEL",
+            "TYPE DE SOCIETE": "SASU, Société par actions simplifiée unipersonnelle",
+            "CAPITAL SOCIAL": "145 131 987 €",
+            "LOCALITE RCS": "PARIS",
+            "ADRESSE DE DOMICILIATION": "17 RUE DE L'ECHIQUIER 75010 PARIS 10E ARRONDISSEMENT",
+            "PRESIDENT DE LA SOCIETE": "Jean Martin",
+            "enrichment_status": "success",
+            "error_message": "",
+        }
+
+
+def test_normalisation_des_champs():
+    """Codes de forme juridique traduits, capital formaté, ville déduite de l'adresse du siège."""
+    with tempfile.TemporaryDirectory() as dossier:
+        base = Path(dossier) / "registre.sqlite"
+        import_registry(EXEMPLE, base)
+        registre = OfflineRegistryClient(base)
+
+        halles = registre.lookup("012345678")  # SIREN à zéro de tête, sans commune
+        assert halles["TYPE DE SOCIETE"] == "SCI (Société Civile Immobilière)"
+        assert halles["CAPITAL SOCIAL"] == "1 500 000 €"
+        assert halles["LOCALITE RCS"] == "LYON"
+        assert registre.lookup("987654321")["CAPITAL SOCIAL"] == "7 500 €"
+
+
+def test_siren_absent_ou_invalide():
+    """SIREN absent du registre ou SIRET invalide: résultat en échec avec un message."""
+    with tempfile.TemporaryDirectory() as dossier:
+        base = Path(dossier) / "registre.sqlite"
+        import_registry(EXEMPLE, base)
+        registre = OfflineRegistryClient(base)
+
+        absent = registre.get_company_info("111111111")
+        assert absent["enrichment_status"] == "failed"
+        assert absent["error_message"] == "SIREN 111111111 absent du registre local"
+        assert registre.get_company_info("12")["enrichment_status"] == "failed"
+        assert set(registre.get_companies_info(["111111111", "987654321"])) == {"111111111", "987654321"}
+
+
+def test_colonnes_sirene_et_reimport():
+    """Colonnes au nom SIRENE reconnues (virgule, SIREN numérique); un nouvel import remplace l'entrée."""
+    with tempfile.TemporaryDirectory() as dossier:
+        base = Path(dossier) / "registre.sqlite"
+        export = Path(dossier) / "sirene.csv"
+        export.write_text(
+            "siren,denominationUniteLegale,categorieJuridiqueUniteLegale,libelleCommuneEtablissement\n"
+            "12345678.0,SOCIETE NUMERIQUE,5710,NANTES\n"
+            "pas un siren,IGNOREE,5710,NANTES\n",
+            encoding="utf-8"
+        )
+        assert import_registry(export, base) == 1
+        assert OfflineRegistryClient(base).lookup("012345678")["NOM DE LA SOCIETE"] == "SOCIETE NUMERIQUE"
+
+        export.write_text("siren,denominationUniteLegale\n012345678,NOUVEAU NOM\n", encoding="utf-8")
+        import_registry(export, base)
+        assert OfflineRegistryClient(base).lookup("012345678")["NOM DE LA SOCIETE"] == "NOUVEAU NOM"
+
+        export.write_text("numero,nom\n012345678,SANS SIREN\n", encoding="utf-8")
+        try:
+            import_registry(export, base)
+            assert False, "export sans colonne SIREN accepté"
+        except ValueError:
+            pass
+
+
+def test_registre_absent():
+    """Sans base importée, get_offline_registry retourne None (l'API INPI prend le relais)."""
+    chemin, registre = Config.INPI_REGISTRY_PATH, offline_registry._offline_registry
+    try:
+        Config.INPI_REGISTRY_PATH = str(Path(tempfile.gettempdir()) / "registre_inexistant.sqlite")
+        offline_registry._offline_registry = None
+        assert offline_registry.get_offline_registry() is None
+    finally:
+        Config.INPI_REGISTRY_PATH, offline_registry._offline_registry = chemin, registre
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("TEST DU REGISTRE LOCAL DES ENTREPRISES")
+    print("=" * 60)
+    for test in (test_import_de_l_exemple, test_normalisation_des_champs, test_siren_absent_ou_invalide,
+                 test_colonnes_sirene_et_reimport, test_registre_absent):
+        test()
+        print(f"✅ {test.__doc__}")
+    print("=" * 60)
+    print("✅ TOUS LES TESTS ONT RÉUSSI")
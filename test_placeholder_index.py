@@ -0,0 +1,113 @@
+"""
+Test de l'index des placeholders des templates (modules/template_cache.py).
+
+Vérifie, sur un template généré, que PlaceholderIndex trouve les placeholders
+[Variable] et {{ARTICLE}} du corps et des tableaux (y compris fragmentés sur
+plusieurs runs), n'indexe qu'une fois une cellule fusionnée, et résout ses
+paragraphes dans une copie du template.
+"""
+
+import tempfile
+import time
+from pathlib import Path
+
+from docx import Document
+
+from modules.template_cache import PlaceholderIndex, get_template_cache, load_template_with_index
+
+
+def creer_template(chemin: Path) -> Path:
+    """Template de test: paragraphes du corps, dont un placeholder fragmenté, et un tableau fusionné."""
+    document = Document()
+    document.add_paragraph("Titre sans placeholder")
+    document.add_paragraph("Le preneur [Nom Preneur] signe le [Date de signature].")
+    fragmente = document.add_paragraph("Loyer: ")
+    for texte in ("[Loyer", " annuel", "] euros"):
+        fragmente.add_run(texte)
+    document.add_paragraph("{{ARTICLE_DESTINATION}}")
+    document.add_paragraph("Remises accordées au preneur")
+
+    tableau = document.add_table(rows=2, cols=2)
+    tableau.cell(0, 0).text = "Surface [Surface totale]"
+    tableau.cell(0, 1).text = "Sans placeholder"
+    fusion = tableau.cell(1, 0).merge(tableau.cell(1, 1))
+    fusion.text = "Bailleur [Nom Bailleur]"
+
+    document.save(chemin)
+    return chemin
+
+
+def test_placeholders_du_template():
+    """Les placeholders du corps et des tableaux sont indexés, même fragmentés sur plusieurs runs."""
+    with tempfile.TemporaryDirectory() as dossier:
+        index = PlaceholderIndex.build(Document(creer_template(Path(dossier) / "template.docx")))
+
+    assert index.placeholders == {
+        "Nom Preneur", "Date de signature", "Loyer annuel", "ARTICLE_DESTINATION",
+        "Surface totale", "Nom Bailleur",
+    }
+    corps = [location for location in index.locations if not location.in_table]
+    assert [location.text for location in corps][:3] == [
+        "Titre sans placeholder",
+        "Le preneur [Nom Preneur] signe le [Date de signature].",
+        "Loyer: [Loyer annuel] euros",
+    ]
+    assert corps[3].articles == ("ARTICLE_DESTINATION",) and not corps[3].variables
+
+
+def test_cellule_fusionnee_indexee_une_fois():
+    """Une cellule fusionnée n'est indexée qu'une fois."""
+    with tempfile.TemporaryDirectory() as dossier:
+        index = PlaceholderIndex.build(Document(creer_template(Path(dossier) / "template.docx")))
+
+    textes = [location.text for location in index.locations if location.in_table]
+    assert textes.count("Bailleur [Nom Bailleur]") == 1
+    assert textes == ["Surface [Surface totale]", "Sans placeholder", "Bailleur [Nom Bailleur]"]
+
+
+def test_paragraphes_resolus_dans_la_copie():
+    """paragraphs() retourne les paragraphes à placeholders de la copie, pas ceux du template en cache."""
+    with tempfile.TemporaryDirectory() as dossier:
+        chemin = creer_template(Path(dossier) / "template.docx")
+        copie, index = load_template_with_index(chemin)
+        intact = get_template_cache().get(chemin).document
+
+        corps = index.paragraphs(copie)
+        assert [paragraph.text for paragraph in corps] == [
+            "Le preneur [Nom Preneur] signe le [Date de signature].",
+            "Loyer: [Loyer annuel] euros",
+            "{{ARTICLE_DESTINATION}}",
+        ]
+        assert [paragraph.text for paragraph in index.paragraphs(copie, in_table=True)] == [
+            "Surface [Surface totale]", "Bailleur [Nom Bailleur]",
+        ]
+        assert index.paragraphs(copie, containing=("Remises",))[-1].text == "Remises accordées au preneur"
+
+        corps[0].runs[0].text = "modifié"
+        assert intact.paragraphs[1].text.startswith("Le preneur")
+        assert copie.paragraphs[1].text.startswith("modifié")
+
+
+def test_index_recalcule_si_le_template_change():
+    """L'index est recalculé lorsque le fichier du template est modifié."""
+    with tempfile.TemporaryDirectory() as dossier:
+        chemin = creer_template(Path(dossier) / "template.docx")
+        assert "Nouveau" not in load_template_with_index(chemin)[1].placeholders
+
+        time.sleep(0.01)
+        document = Document(chemin)
+        document.add_paragraph("[Nouveau]")
+        document.save(chemin)
+        assert "Nouveau" in load_template_with_index(chemin)[1].placeholders
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("TEST DE L'INDEX DES PLACEHOLDERS")
+    print("=" * 60)
+    for test in (test_placeholders_du_template, test_cellule_fusionnee_indexee_une_fois,
+                 test_paragraphes_resolus_dans_la_copie, test_index_recalcule_si_le_template_change):
+        test()
+        print(f"✅ {test.__doc__}")
+    print("=" * 60)
+    print("✅ TOUS LES TESTS ONT RÉUSSI")
@@ -0,0 +1,144 @@
+"""
+Test de la réécriture des runs lors du remplacement des placeholders.
+
+Vérifie, pour les générateurs LOI et BAIL, qu'un placeholder (fragmenté ou
+non sur plusieurs runs) est remplacé à sa place, que sa valeur prend le
+formatage du run où il commence, que le texte qui l'entoure garde ses runs et
+leur formatage, et que les placeholders sans donnée restent en rouge.
+"""
+
+import tempfile
+from pathlib import Path
+
+from docx import Document
+from docx.oxml import OxmlElement
+from docx.shared import RGBColor
+
+from modules.bail_word_generator import BailWordGenerator
+from modules.loi_generator import LOIGenerator
+from modules.number_to_french import number_to_french_words
+
+ROUGE = RGBColor(255, 0, 0)
+NOIR = RGBColor(0, 0, 0)
+
+
+def paragraphe(*runs):
+    """Paragraphe composé des runs (texte, gras)."""
+    document = Document()
+    paragraph = document.add_paragraph()
+    for texte, gras in runs:
+        paragraph.add_run(texte).bold = gras
+    return paragraph
+
+
+def runs(paragraph):
+    """(texte, gras) des runs non vides."""
+    return [(run.text, run.bold) for run in paragraph.runs if run.text]
+
+
+def generateur(classe, *args):
+    """Générateur construit sur un template vide (seules les méthodes de paragraphe sont testées)."""
+    with tempfile.TemporaryDirectory() as dossier:
+        template = Path(dossier) / "template.docx"
+        Document().save(template)
+        return classe(*args, template_path=str(template))
+
+
+def generateur_loi(variables: dict) -> LOIGenerator:
+    return generateur(LOIGenerator, variables, {})
+
+
+def test_loi_placeholder_dans_un_run():
+    """LOI: un placeholder contenu dans un run est remplacé sans toucher aux autres runs."""
+    paragraph = paragraphe(("Preneur: ", True), ("la société [Nom Preneur], ", False), ("fin", True))
+    generateur_loi({"Nom Preneur": "SCI FORGEOT"})._process_paragraph(paragraph)
+
+    assert paragraph.text == "Preneur: la société SCI FORGEOT, fin"
+    assert runs(paragraph) == [("Preneur: ", True), ("la société SCI FORGEOT, ", False), ("fin", True)]
+
+
+def test_loi_placeholder_fragmente():
+    """LOI: un placeholder fragmenté est remplacé, avec le formatage du run où il commence."""
+    paragraph = paragraphe(("Loyer de ", False), ("[Loyer", True), (" annuel] ", False), ("euros", False))
+    generateur_loi({"Loyer annuel": "12 500"})._process_paragraph(paragraph)
+
+    assert paragraph.text == "Loyer de 12 500 euros"
+    assert runs(paragraph) == [("Loyer de ", False), ("12 500", True), (" ", False), ("euros", False)]
+
+
+def test_loi_placeholders_manquants_en_rouge():
+    """LOI, paragraphe obligatoire: placeholder sans donnée en rouge, le reste en noir."""
+    paragraph = paragraphe(("Le preneur [Nom ", False), ("Preneur] signe le [Date]", True), (".", False))
+    generateur_loi({"Date": "01/01/2025"})._process_paragraph(paragraph)
+
+    assert paragraph.text == "Le preneur [Nom Preneur] signe le 01/01/2025."
+    couleurs = {run.text: run.font.color.rgb for run in paragraph.runs if run.text}
+    assert couleurs["[Nom Preneur]"] == ROUGE
+    assert couleurs["01/01/2025"] == NOIR
+    assert couleurs["Le preneur "] == NOIR and couleurs["."] == NOIR
+    assert [run.bold for run in paragraph.runs if run.text == "01/01/2025"] == [True]
+
+
+def test_loi_paragraphe_avec_lien_hypertexte():
+    """LOI: un lien hypertexte dans le paragraphe n'empêche pas de remplacer les placeholders des runs."""
+    paragraph = paragraphe(("Le preneur [Nom Preneur], voir ", False))
+    lien = OxmlElement("w:hyperlink")
+    run_du_lien = OxmlElement("w:r")
+    texte_du_lien = OxmlElement("w:t")
+    texte_du_lien.text = "le site"
+    run_du_lien.append(texte_du_lien)
+    lien.append(run_du_lien)
+    paragraph._p.append(lien)
+    paragraph.add_run(" le [Date].")
+
+    generateur_loi({"Nom Preneur": "SCI FORGEOT"})._process_paragraph(paragraph)
+
+    textes = "".join(run.text for run in paragraph.runs)
+    assert "SCI FORGEOT" in textes and "[Nom Preneur]" not in textes
+    couleurs = {run.text: run.font.color.rgb for run in paragraph.runs if run.text}
+    assert couleurs["[Date]"] == ROUGE
+
+
+def test_bail_ordre_des_runs_conserve():
+    """BAIL: un run réécrit reste à sa place dans le paragraphe, les autres runs sont intacts."""
+    paragraph = paragraphe(("Le preneur [Nom Preneur]", True), (" exploite ", False), ("[Enseigne].", True))
+    generateur(BailWordGenerator)._replace_variable_placeholders(
+        paragraph, {"Nom Preneur": "SCI FORGEOT", "Enseigne": "Boulangerie"}
+    )
+
+    assert paragraph.text == "Le preneur SCI FORGEOT exploite Boulangerie."
+    assert runs(paragraph) == [("Le preneur ", True), ("SCI FORGEOT", True), (" exploite ", False),
+                               ("Boulangerie", True), (".", True)]
+
+
+def test_bail_placeholder_fragmente_et_manquant():
+    """BAIL: placeholder fragmenté remplacé, placeholder sans donnée laissé en rouge."""
+    paragraph = paragraphe(("Surface de [Surf", False), ("ace totale] m², ", True), ("[Destination]", False))
+    generateur(BailWordGenerator)._replace_variable_placeholders(paragraph, {"Surface totale": "120"})
+
+    assert paragraph.text == "Surface de 120 m², [Destination]"
+    couleurs = {run.text: run.font.color.rgb for run in paragraph.runs if run.text}
+    assert couleurs["120"] == NOIR and couleurs["[Destination]"] == ROUGE
+    assert [run.bold for run in paragraph.runs if run.text == "120"] == [False]
+
+
+def test_bail_montant_en_lettres():
+    """BAIL: [Variable en lettres] est remplacé par le montant écrit en toutes lettres."""
+    paragraph = paragraphe(("soit [Loyer annuel en lettres]euros", False))
+    generateur(BailWordGenerator)._replace_variable_placeholders(paragraph, {"Loyer annuel": "12 500"})
+
+    assert paragraph.text == f"soit {number_to_french_words(12500)} euros"
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("TEST DE LA RÉÉCRITURE DES RUNS")
+    print("=" * 60)
+    for test in (test_loi_placeholder_dans_un_run, test_loi_placeholder_fragmente,
+                 test_loi_placeholders_manquants_en_rouge, test_loi_paragraphe_avec_lien_hypertexte,
+                 test_bail_ordre_des_runs_conserve,
+                 test_bail_placeholder_fragmente_et_manquant, test_bail_montant_en_lettres):
+        test()
+        print(f"✅ {test.__doc__}")
+    print("=" * 60)
+    print("✅ TOUS LES TESTS ONT RÉUSSI")
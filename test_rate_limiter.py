@@ -0,0 +1,162 @@
+"""
+Test du limiteur de débit INPI (modules/rate_limiter.py).
+
+Vérifie, pour le limiteur partagé (SQLite) et le limiteur de secours en
+mémoire, le quota par fenêtre, la réserve de la file interactive, la priorité
+donnée aux requêtes interactives en attente, et le repli sur le limiteur en
+mémoire quand la base ne peut pas être ouverte.
+"""
+
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from modules import rate_limiter
+from modules.config import Config
+from modules.rate_limiter import BATCH, INTERACTIVE, LocalRateLimiter, RateLimiter, SharedRateLimiter
+
+
+def limiteurs(dossier: str, rate: int = 3, period: float = 60, interactive_reserve: int = 1):
+    """Les deux implémentations, configurées à l'identique."""
+    return (
+        SharedRateLimiter(Path(dossier) / "quota.sqlite", rate=rate, period=period,
+                          interactive_reserve=interactive_reserve),
+        LocalRateLimiter(rate=rate, period=period, interactive_reserve=interactive_reserve),
+    )
+
+
+def test_reserve_de_la_file_interactive():
+    """La file batch laisse interactive_reserve appels par fenêtre à la file interactive."""
+    with tempfile.TemporaryDirectory() as dossier:
+        for limiteur in limiteurs(dossier):
+            assert limiteur.try_acquire(BATCH, "b1") == 0
+            assert limiteur.try_acquire(BATCH, "b2") == 0
+            assert limiteur.try_acquire(BATCH, "b3") > 0
+            assert limiteur.try_acquire(INTERACTIVE, "i1") == 0
+            assert limiteur.try_acquire(INTERACTIVE, "i2") > 0
+
+
+def test_batch_cede_aux_requetes_interactives():
+    """Une place libérée revient à la requête interactive en attente, pas à la file batch."""
+    with tempfile.TemporaryDirectory() as dossier:
+        for limiteur in limiteurs(dossier, rate=2, period=0.3, interactive_reserve=0):
+            assert limiteur.try_acquire(INTERACTIVE, "i1") == 0
+            assert limiteur.try_acquire(INTERACTIVE, "i2") == 0
+            assert limiteur.try_acquire(INTERACTIVE, "i3") > 0  # quota plein: i3 attend
+
+            time.sleep(0.35)  # les deux appels sortent de la fenêtre
+            assert limiteur.try_acquire(BATCH, "b1") > 0
+            assert limiteur.try_acquire(INTERACTIVE, "i3") == 0
+            assert limiteur.try_acquire(BATCH, "b1") == 0  # plus d'attente interactive
+
+
+def test_fenetre_glissante():
+    """Un appel refusé est autorisé dès que le plus ancien sort de la fenêtre."""
+    with tempfile.TemporaryDirectory() as dossier:
+        for limiteur in limiteurs(dossier, rate=2, period=0.5, interactive_reserve=0):
+            debut = time.monotonic()
+            for _ in range(3):
+                assert limiteur.acquire(INTERACTIVE, timeout=2)
+            assert 0.4 <= time.monotonic() - debut < 1.5
+
+
+def test_delai_depasse():
+    """acquire retourne False si le quota n'est pas disponible dans le délai."""
+    with tempfile.TemporaryDirectory() as dossier:
+        for limiteur in limiteurs(dossier, rate=1, period=60, interactive_reserve=0):
+            assert limiteur.acquire(INTERACTIVE, timeout=0.1)
+            assert not limiteur.acquire(INTERACTIVE, timeout=0.1)
+
+
+def test_attente_asynchrone_sans_bloquer_la_boucle():
+    """acquire_async laisse tourner les autres tâches de la boucle pendant l'attente."""
+    with tempfile.TemporaryDirectory() as dossier:
+        limiteur = limiteurs(dossier, rate=1, period=0.3, interactive_reserve=0)[0]
+
+        async def scenario():
+            ticks = 0
+
+            async def horloge():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0.01)
+
+            tache = asyncio.ensure_future(horloge())
+            await limiteur.acquire_async(INTERACTIVE)
+            await limiteur.acquire_async(INTERACTIVE)
+            tache.cancel()
+            return ticks
+
+        assert asyncio.run(scenario()) >= 10
+
+
+def test_annulation_rend_l_appel_accorde():
+    """Attente annulée pendant une tentative: l'appel accordé entre-temps est rendu au quota."""
+
+    def lent(limiteur):
+        try_acquire = limiteur.try_acquire
+
+        def tentative(lane, waiter_id):
+            time.sleep(0.1)
+            return try_acquire(lane, waiter_id)
+
+        limiteur.try_acquire = tentative
+        return limiteur
+
+    with tempfile.TemporaryDirectory() as dossier:
+        for limiteur in limiteurs(dossier, rate=1, period=60, interactive_reserve=0):
+
+            async def scenario():
+                tache = asyncio.ensure_future(lent(limiteur).acquire_async(INTERACTIVE))
+                await asyncio.sleep(0.03)  # la tentative est en cours dans son thread
+                tache.cancel()
+                try:
+                    await tache
+                    assert False, "annulation ignorée"
+                except asyncio.CancelledError:
+                    pass
+
+            asyncio.run(scenario())
+            del limiteur.try_acquire
+            assert limiteur.try_acquire(INTERACTIVE, "suivant") == 0
+
+
+def test_limiteur_incomplet_refuse():
+    """Un limiteur qui ne fournit pas toutes les méthodes abstraites ne peut pas être créé."""
+
+    class Incomplet(RateLimiter):
+        def try_acquire(self, lane, waiter_id):
+            return 0.0
+
+    try:
+        Incomplet()
+        assert False, "limiteur incomplet créé"
+    except TypeError:
+        pass
+
+
+def test_repli_sur_le_limiteur_en_memoire():
+    """Base impossible à ouvrir: le quota est compté en mémoire, jamais désactivé."""
+    chemin, limiteur = Config.INPI_RATE_LIMIT_PATH, rate_limiter._rate_limiter
+    try:
+        Config.INPI_RATE_LIMIT_PATH = "/proc/inexistant/quota.sqlite"
+        rate_limiter._rate_limiter = None
+        assert isinstance(rate_limiter.get_rate_limiter(), LocalRateLimiter)
+    finally:
+        Config.INPI_RATE_LIMIT_PATH, rate_limiter._rate_limiter = chemin, limiteur
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("TEST DU LIMITEUR DE DÉBIT INPI")
+    print("=" * 60)
+    for test in (test_reserve_de_la_file_interactive, test_batch_cede_aux_requetes_interactives,
+                 test_fenetre_glissante, test_delai_depasse,
+                 test_attente_asynchrone_sans_bloquer_la_boucle, test_annulation_rend_l_appel_accorde,
+                 test_limiteur_incomplet_refuse, test_repli_sur_le_limiteur_en_memoire):
+        test()
+        print(f"✅ {test.__doc__}")
+    print("=" * 60)
+    print("✅ TOUS LES TESTS ONT RÉUSSI")
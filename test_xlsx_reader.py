@@ -0,0 +1,160 @@
+"""
+Test du lecteur xlsx en streaming (modules/xlsx_reader.py).
+
+Compare read_cells et iter_cells à openpyxl (data_only) sur des classeurs
+générés: nombres, booléens, chaînes partagées (échappement x005F_ compris),
+dates et durées selon le format de cellule, dates ISO 8601 (t="d") et
+calendrier 1904.
+"""
+
+import datetime
+import io
+import re
+import zipfile
+
+import openpyxl
+from openpyxl.utils.datetime import CALENDAR_MAC_1904
+
+from modules.xlsx_reader import XlsxReader, split_cell_ref
+
+VALEURS = {
+    "A1": "texte",
+    "B2": 42,
+    "C3": 3.5,
+    "D4": datetime.datetime(2024, 3, 1, 12, 30),
+    "E5": datetime.date(2023, 1, 2),
+    "F6": True,
+    "G7": False,
+    "H8": datetime.time(10, 15),
+    "J10": 0.25,
+    "K11": "x005F_x000D_ texte échappé",
+    "L12": "texte",
+    "A40": "dernière ligne",
+}
+
+
+def generer_classeur(epoch=None, iso_dates: bool = False) -> bytes:
+    """Classeur de test: les VALEURS, une durée, un pourcentage et une formule, plus un second onglet."""
+    workbook = openpyxl.Workbook()
+    if epoch is not None:
+        workbook.epoch = epoch
+    workbook.iso_dates = iso_dates
+    sheet = workbook.active
+    sheet.title = "Fiche"
+    for ref, valeur in VALEURS.items():
+        sheet[ref] = valeur
+    sheet["I9"] = datetime.timedelta(hours=30)
+    sheet["I9"].number_format = "[h]:mm:ss"
+    sheet["J10"].number_format = "0.00%"
+    sheet["M13"] = "=B2*2"
+    workbook.create_sheet("Autre")["B2"] = datetime.datetime(2020, 1, 1)
+
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return partager_les_chaines(buffer.getvalue())
+
+
+def partager_les_chaines(content: bytes) -> bytes:
+    """Remplace les chaînes en ligne écrites par openpyxl par une table de chaînes partagées (comme Excel)."""
+    strings = []
+
+    def partager(match):
+        strings.append(match.group(2))
+        return f'{match.group(1)} t="s"><v>{len(strings) - 1}</v></c>'
+
+    source, buffer = zipfile.ZipFile(io.BytesIO(content)), io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name in source.namelist():
+            data = source.read(name).decode("utf-8")
+            if name.startswith("xl/worksheets/"):
+                data = re.sub(r'(<c r="[A-Z]+\d+"(?: s="\d+")?) t="inlineStr"><is>(.*?)</is></c>', partager, data)
+            elif name == "[Content_Types].xml":
+                data = data.replace("</Types>", (
+                    '<Override PartName="/xl/sharedStrings.xml" ContentType="application/'
+                    'vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/></Types>'))
+            elif name == "xl/_rels/workbook.xml.rels":
+                data = data.replace("</Relationships>", (
+                    '<Relationship Id="rIdSharedStrings" Target="sharedStrings.xml" Type="http://schemas.'
+                    'openxmlformats.org/officeDocument/2006/relationships/sharedStrings"/></Relationships>'))
+            archive.writestr(name, data)
+        archive.writestr("xl/sharedStrings.xml", (
+            '<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+            + "".join(f"<si>{string}</si>" for string in strings) + "</sst>"))
+    return buffer.getvalue()
+
+
+def lecture_openpyxl(content: bytes, sheet_name: str, cells) -> dict:
+    workbook = openpyxl.load_workbook(io.BytesIO(content), data_only=True)
+    sheet = workbook[sheet_name]
+    return {(row, col): sheet.cell(row=row, column=col).value for row, col in cells}
+
+
+def comparer(content: bytes):
+    cells = {(row, col) for row in range(1, 42) for col in range(1, 15)}
+    attendu = lecture_openpyxl(content, "Fiche", cells)
+    with XlsxReader(content) as reader:
+        lu = reader.read_cells("Fiche", cells)
+    for cell in cells:
+        assert lu[cell] == attendu[cell] and type(lu[cell]) is type(attendu[cell]), \
+            (cell, lu[cell], attendu[cell])
+
+
+def test_lecture_comme_openpyxl():
+    """read_cells type les cellules comme openpyxl (dates, durées, booléens, chaînes partagées)."""
+    comparer(generer_classeur())
+
+
+def test_dates_iso_8601():
+    """Les cellules t="d" (dates ISO 8601) sont lues en datetime."""
+    comparer(generer_classeur(iso_dates=True))
+
+
+def test_calendrier_1904():
+    """Un classeur au calendrier 1904 donne les mêmes dates qu'openpyxl."""
+    comparer(generer_classeur(epoch=CALENDAR_MAC_1904))
+
+
+def test_parcours_des_cellules():
+    """iter_cells donne les cellules non vides avec leur formule, les mêmes valeurs que read_cells."""
+    content = generer_classeur()
+    with XlsxReader(content) as reader:
+        cellules = {(cell.row, cell.column): cell for cell in reader.iter_cells("Fiche")}
+        lues = reader.read_cells("Fiche", cellules)
+
+    assert cellules[(13, 13)].formula == "=B2*2"
+    assert cellules[split_cell_ref("K11")].value == lues[split_cell_ref("K11")]
+    assert cellules[split_cell_ref("A1")].value == "texte"
+    assert cellules[split_cell_ref("F6")].value is True
+    assert all(cell.formula is None for key, cell in cellules.items() if key != (13, 13))
+
+    with XlsxReader(content) as reader:
+        assert [cell.row for cell in reader.iter_cells("Fiche", columns=[1], max_row=10)] == [1]
+
+
+def test_onglets_et_erreurs():
+    """Onglets lus dans l'ordre du classeur; onglet absent ou fichier non xlsx refusés."""
+    with XlsxReader(generer_classeur()) as reader:
+        assert reader.sheetnames == ["Fiche", "Autre"]
+        assert reader.read_cells("Autre", [(2, 2)]) == {(2, 2): datetime.datetime(2020, 1, 1)}
+        try:
+            reader.read_cells("Absent", [(1, 1)])
+            assert False, "onglet absent accepté"
+        except KeyError:
+            pass
+    try:
+        XlsxReader(b"pas un classeur")
+        assert False, "fichier invalide accepté"
+    except ValueError:
+        pass
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("TEST DU LECTEUR XLSX")
+    print("=" * 60)
+    for test in (test_lecture_comme_openpyxl, test_dates_iso_8601, test_calendrier_1904,
+                 test_parcours_des_cellules, test_onglets_et_erreurs):
+        test()
+        print(f"✅ {test.__doc__}")
+    print("=" * 60)
+    print("✅ TOUS LES TESTS ONT RÉUSSI")